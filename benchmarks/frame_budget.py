@@ -0,0 +1,422 @@
+"""
+Benchmark de extremo a extremo del presupuesto de frame: maneja GameManager y
+GameScreen sin ventana (driver dummy de SDL) con entrada guionizada, igual que
+el bucle de main.py (handle_event -> update(dt) -> render), y cronometra
+update y render de cada frame.
+
+Fases del guion (--scenario all las encadena en este orden):
+- walk     paseo largo en línea recta hacia el este cruzando --chunks chunks
+           (con la vecindad 3x3 son cientos de chunks generados y desalojados).
+- zigzag   ida y vuelta sobre una frontera de chunk, --crossings veces.
+- idle     --idle segundos sin entrada.
+- chests   busca y abre --chests cofres; a los mimics se les paga.
+
+La ruta la planifica un BFS sobre los chunks ya residentes (fuera del
+cronómetro y sin generar nada); el jugador la sigue pulsando teclas, así que
+las paredes y los cofres bloquean como en el juego. Si no hay camino hacia
+delante se teletransporta al siguiente claro y se cuenta en el informe.
+El ladrón y las trampas se desactivan (sus ventanas modales pararían el
+guion) salvo con --events; el autoguardado va desactivado para no tocar data/.
+
+Informe por fase: frames, p50/p95/p99/máximo del frame completo, p99 de
+update y de render, frames por encima del presupuesto (1000/--fps ms),
+chunks generados y crecimiento de memoria (RSS y pico de Python con
+--tracemalloc, que ralentiza los frames).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/frame_budget.py --chunks 100
+    python benchmarks/frame_budget.py --scenario walk --chunks 300 --prefetch-workers 0 --csv frames.csv
+"""
+import argparse
+import collections
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+import pygame  # noqa: E402
+
+WIDTH, HEIGHT = 1000, 700
+CHUNK_SIZE = 21
+TILE = 32
+DIRECTION_KEYS = {(1, 0): pygame.K_d, (-1, 0): pygame.K_a, (0, 1): pygame.K_s, (0, -1): pygame.K_w}
+PHASES = ("walk", "zigzag", "idle", "chests")
+
+
+def percentile(sorted_values, q):
+    """Percentil con interpolación lineal."""
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def rss_bytes():
+    """Memoria residente actual del proceso (Linux); None si no se puede leer."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ScriptedSession:
+    """Una partida sin ventana conducida por entrada guionizada, con el tiempo de cada frame."""
+
+    def __init__(self, seed, fps, prefetch_workers, events):
+        from controllers import GameManager, HUDController, MimicDecisionController
+        from controllers.screens import GameScreen
+
+        pygame.init()
+        # GameScreen carga sprites y audio con rutas relativas a src/
+        os.chdir(SRC_DIR)
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        font = pygame.font.SysFont(None, 24)
+        random.seed(seed)
+        self.mimic = MimicDecisionController(None, screen, font, WIDTH, HEIGHT)
+        self.game = GameManager(CHUNK_SIZE, TILE, mimic_controller=self.mimic, seed=seed, autosave=False,
+                                prefetch_workers=prefetch_workers)
+        hud = HUDController(screen, font, WIDTH, HEIGHT, (255, 255, 255))
+        with contextlib.redirect_stdout(io.StringIO()):  # avisos del audio
+            self.screen = GameScreen(screen, self.game, hud, self.mimic, self._change_screen)
+        if not events:
+            self.screen.sim.THIEF_MAX_CHANCE = 0.0
+            self.screen.sim.TRAP_MAX_CHANCE = 0.0
+        # Gemas de sobra para poder abrir cualquier cofre
+        for poder in (5, 10, 15, 20, 30, 50):
+            self.game.player.inventory.insert(poder, 500)
+
+        self.dt = 1.0 / fps
+        self.game_map = self.game.game_map
+        self.phase = None
+        self.frames = []  # (fase, update s, render s)
+        self.teleports = collections.Counter()
+        self.held = None
+        self.ended = None
+
+    def _change_screen(self, name, **kwargs):
+        if name in ("game_over", "win", "quit"):
+            self.ended = name
+
+    # ====================
+    # Frames y entrada
+    # ====================
+    def frame(self):
+        start = time.perf_counter()
+        self.screen.update(self.dt)
+        middle = time.perf_counter()
+        self.screen.render()
+        end = time.perf_counter()
+        self.frames.append((self.phase, middle - start, end - middle))
+
+    def key(self, key, down=True):
+        self.screen.handle_event(pygame.event.Event(pygame.KEYDOWN if down else pygame.KEYUP, key=key))
+
+    def hold(self, direction):
+        """Mantiene pulsada la tecla de `direction` (o ninguna con None)."""
+        if direction == self.held:
+            return
+        if self.held is not None:
+            self.key(DIRECTION_KEYS[self.held], down=False)
+        if direction is not None:
+            self.key(DIRECTION_KEYS[direction])
+        self.held = direction
+
+    @property
+    def position(self):
+        return self.game.player.x, self.game.player.y
+
+    def step_to(self, target):
+        """Camina a la casilla vecina `target`. False si no llega (bloqueado)."""
+        x, y = self.position
+        self.hold((target[0] - x, target[1] - y))
+        limit = int(4 / (self.game.movement_ctrl.speed * self.dt)) + 1
+        for _ in range(limit):
+            self.frame()
+            if self.position == target:
+                return True
+            if self.position != (x, y):
+                return False
+        return False
+
+    # ====================
+    # Planificación (fuera del cronómetro)
+    # ====================
+    def passable(self, x, y):
+        """Transitable según los chunks residentes; lo no generado cuenta como pared."""
+        from resources.tile_data import TILE_TREE
+        size = CHUNK_SIZE
+        chunk_x, chunk_y = x // size, y // size
+        chunk = self.game_map.chunks.get((chunk_x, chunk_y))
+        if chunk is None or chunk.tiles[(y % size) * size + (x % size)] == TILE_TREE:
+            return False
+        chest = self.game_map.chest_manager.get_chest(chunk_x, chunk_y, x % size, y % size)
+        return chest is None or chest.is_opened()
+
+    def plan(self, score, radius=2 * CHUNK_SIZE):
+        """BFS desde el jugador; devuelve el camino a la casilla alcanzable de mayor `score`."""
+        start = self.position
+        parents = {start: None}
+        queue = collections.deque([start])
+        best, best_score = start, score(*start)
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in DIRECTION_KEYS:
+                nxt = (x + dx, y + dy)
+                if nxt in parents or abs(nxt[0] - start[0]) > radius or abs(nxt[1] - start[1]) > radius:
+                    continue
+                if not self.passable(*nxt):
+                    continue
+                parents[nxt] = (x, y)
+                queue.append(nxt)
+                value = score(*nxt)
+                if value > best_score:
+                    best, best_score = nxt, value
+        path = []
+        while best != start:
+            path.append(best)
+            best = parents[best]
+        return path[::-1]
+
+    def follow(self, path, limit=CHUNK_SIZE):
+        """Recorre como mucho `limit` casillas del camino. False si se queda bloqueado."""
+        for target in path[:limit]:
+            if self.ended or not self.step_to(target):
+                return False
+        return True
+
+    def teleport(self, x, y):
+        """Salta a la casilla libre más cercana a (x, y) (genera chunks fuera del cronómetro)."""
+        from resources.tile_data import TILE_TREE
+        self.hold(None)
+        for radius in range(CHUNK_SIZE):
+            for dx in range(-radius, radius + 1):
+                for dy in (-radius, radius) if abs(dx) != radius else range(-radius, radius + 1):
+                    tx, ty = x + dx, y + dy
+                    if self.game_map.get_tile_code(tx, ty) != TILE_TREE and self.game_map.get_chest(tx, ty) is None:
+                        player, movement = self.game.player, self.game.movement_ctrl
+                        player.x, player.y = tx, ty
+                        movement.pos_x, movement.pos_y = float(tx), float(ty)
+                        chunk_x, chunk_y = self.game_map.get_chunk_key(tx, ty)
+                        for cx in (chunk_x - 1, chunk_x, chunk_x + 1):
+                            for cy in (chunk_y - 1, chunk_y, chunk_y + 1):
+                                self.game_map.ensure_chunk(cx, cy)
+                        self.game_map.set_focus(chunk_x, chunk_y)
+                        self.teleports[self.phase] += 1
+                        return
+        raise RuntimeError(f"No hay casillas libres cerca de ({x}, {y})")
+
+    def go_to(self, gx, gy, attempts=20):
+        """Camina hasta (gx, gy) o lo más cerca posible. True si llega."""
+        for _ in range(attempts):
+            if self.position == (gx, gy):
+                return True
+            path = self.plan(lambda x, y: -abs(x - gx) - abs(y - gy))
+            if not path:
+                return False
+            self.follow(path)
+        return self.position == (gx, gy)
+
+    # ====================
+    # Fases
+    # ====================
+    def walk(self, chunks):
+        """Hacia el este `chunks` chunks, sin alejarse de la fila de partida."""
+        start_x, row = self.position
+        goal_x = start_x + chunks * CHUNK_SIZE
+        while self.position[0] < goal_x and not self.ended:
+            before = self.position[0]
+            path = self.plan(lambda x, y: 4 * x - abs(y - row))
+            if not path or path[-1][0] <= before or not self.follow(path):
+                if self.position[0] <= before:
+                    # Callejón sin salida hacia el este: salto al chunk siguiente
+                    self.teleport(before + CHUNK_SIZE, row)
+        self.hold(None)
+
+    def zigzag(self, crossings):
+        """Cruza una y otra vez la frontera vertical de chunk más cercana al este."""
+        x, y = self.position
+        border = (x // CHUNK_SIZE + 1) * CHUNK_SIZE
+        sides = (border + 2, border - 3)
+        for i in range(crossings):
+            if self.ended:
+                break
+            if not self.go_to(sides[i % 2], y):
+                # Sin paso en esta fila: se prueba con la del jugador
+                y = self.position[1]
+                if not self.go_to(sides[i % 2], y):
+                    self.teleport(sides[i % 2], y)
+        self.hold(None)
+
+    def idle(self, seconds):
+        self.hold(None)
+        for _ in range(int(seconds / self.dt)):
+            self.frame()
+
+    def open_chests(self, count, search_chunks=40):
+        """Abre `count` cofres; si no hay ninguno alcanzable cerca, avanza un chunk al este."""
+        opened = searched = 0
+        while opened < count and searched < search_chunks and not self.ended:
+            px, py = self.position
+            nearby = self.game_map.query_region(px - CHUNK_SIZE, py - CHUNK_SIZE, px + CHUNK_SIZE, py + CHUNK_SIZE,
+                                                kinds=("chests",))
+            targets = sorted(((abs(x - px) + abs(y - py), x, y) for x, y, chest in nearby["chests"]
+                              if not chest.is_opened()))
+            for _, cx, cy in targets:
+                # Junto al cofre: cualquier vecina alcanzable sirve
+                path = self.plan(lambda x, y: -(abs(x - cx) + abs(y - cy)))
+                if path and abs(path[-1][0] - cx) + abs(path[-1][1] - cy) == 1 and self.follow(path, len(path)):
+                    self.hold(None)
+                    if self.open_adjacent_chest():
+                        opened += 1
+                        break
+            else:
+                searched += 1
+                self.walk(1)
+        return opened
+
+    def open_adjacent_chest(self):
+        self.frame()  # update() detecta el cofre al alcance
+        chest = self.screen.current_chest_in_range
+        if chest is None:
+            return False
+        self.key(pygame.K_e)
+        self.key(pygame.K_e, down=False)
+        if self.mimic.active:
+            # Medio segundo de "reacción" y se paga
+            for _ in range(int(0.5 / self.dt)):
+                self.frame()
+            self.key(pygame.K_p)
+            self.key(pygame.K_p, down=False)
+        self.frame()
+        return chest.is_opened()
+
+    def run_phase(self, name, action):
+        self.phase = name
+        generated = len(self.game_map.generated_chunks)
+        rss = rss_bytes()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            python_before = tracemalloc.get_traced_memory()[0]
+        action()
+        info = {"generated": len(self.game_map.generated_chunks) - generated,
+                "resident": len(self.game_map.chunks)}
+        if rss is not None:
+            info["rss_growth"] = rss_bytes() - rss
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            info["python_growth"] = current - python_before
+            info["python_peak"] = peak - python_before
+        return info
+
+
+# ====================
+# Informe
+# ====================
+def summarize(frames, budget):
+    totals = sorted(update + render for _, update, render in frames)
+    updates = sorted(update for _, update, _ in frames)
+    renders = sorted(render for _, _, render in frames)
+    return {
+        "frames": len(frames),
+        "p50": percentile(totals, 50) * 1000,
+        "p95": percentile(totals, 95) * 1000,
+        "p99": percentile(totals, 99) * 1000,
+        "max": totals[-1] * 1000,
+        "update_p99": percentile(updates, 99) * 1000,
+        "render_p99": percentile(renders, 99) * 1000,
+        "over_budget": sum(1 for total in totals if total * 1000 > budget),
+    }
+
+
+def _megabytes(value):
+    return f"{value / 2 ** 20:+.1f}" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=("all",) + PHASES, default="all")
+    parser.add_argument("--chunks", type=int, default=100, help="chunks a cruzar en el paseo")
+    parser.add_argument("--crossings", type=int, default=40, help="cruces de frontera en el zig-zag")
+    parser.add_argument("--idle", type=float, default=10.0, help="segundos sin entrada")
+    parser.add_argument("--chests", type=int, default=10, help="cofres a abrir")
+    parser.add_argument("--fps", type=int, default=120, help="frames por segundo simulados (main.py usa 120)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--prefetch-workers", type=int, default=1)
+    parser.add_argument("--events", action="store_true", help="mantiene el ladrón y las trampas")
+    parser.add_argument("--tracemalloc", action="store_true", help="mide también la memoria de Python")
+    parser.add_argument("--csv", help="vuelca fase, update_ms y render_ms de cada frame")
+    args = parser.parse_args()
+    # ScriptedSession cambia el cwd a src/: la ruta del CSV se resuelve antes
+    if args.csv:
+        args.csv = os.path.abspath(args.csv)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    session = ScriptedSession(args.seed, args.fps, args.prefetch_workers, args.events)
+    actions = {
+        "walk": lambda: session.walk(args.chunks),
+        "zigzag": lambda: session.zigzag(args.crossings),
+        "idle": lambda: session.idle(args.idle),
+        "chests": lambda: session.open_chests(args.chests),
+    }
+    phases = PHASES if args.scenario == "all" else (args.scenario,)
+    rss_start = rss_bytes()
+    memory = {}
+    try:
+        for name in phases:
+            memory[name] = session.run_phase(name, actions[name])
+            if session.ended:
+                print(f"La partida terminó ({session.ended}) durante la fase {name}")
+                break
+    finally:
+        session.hold(None)
+        session.game.close()
+
+    budget = 1000 / args.fps
+    print(f"presupuesto {budget:.2f} ms/frame ({args.fps} fps), semilla {args.seed}, "
+          f"{args.prefetch_workers} hilo(s) de pre-generación")
+    print(f"{'fase':<8} {'frames':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8} "
+          f"{'upd p99':>8} {'rnd p99':>8} {'>budget':>8} {'chunks':>7} {'saltos':>7} {'RSS MB':>7}"
+          + (f" {'py MB':>7} {'pico':>7}" if args.tracemalloc else ""))
+    rows = [(name, [f for f in session.frames if f[0] == name]) for name in memory]
+    rows.append(("total", session.frames))
+    for name, frames in rows:
+        if not frames:
+            continue
+        stats = summarize(frames, budget)
+        info = memory.get(name, {})
+        if name == "total":
+            info = {"generated": len(session.game_map.generated_chunks),
+                    "rss_growth": rss_bytes() - rss_start if rss_start is not None else None}
+        jumps = sum(session.teleports.values()) if name == "total" else session.teleports[name]
+        line = (f"{name:<8} {stats['frames']:>7} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f} "
+                f"{stats['max']:>8.2f} {stats['update_p99']:>8.2f} {stats['render_p99']:>8.2f} "
+                f"{stats['over_budget']:>8} {info.get('generated', 0):>7} {jumps:>7} "
+                f"{_megabytes(info.get('rss_growth')):>7}")
+        if args.tracemalloc and "python_growth" in info:
+            line += f" {_megabytes(info['python_growth']):>7} {_megabytes(info['python_peak']):>7}"
+        print(line)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "phase", "update_ms", "render_ms"])
+            for index, (phase, update, render) in enumerate(session.frames):
+                writer.writerow([index, phase, f"{update * 1000:.4f}", f"{render * 1000:.4f}"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Benchmark del inventario: compara el BST original (Inventory) con el AVL
+(AVLInventory) insertando, buscando y borrando N poderes distintos, y
+consultando total_value() y random_node() (lo que hace GameScreen en cada paso).
+
+Dos órdenes de llegada:
+- random: poderes barajados (el BST queda con altura ~O(log n)).
+- ascending: poderes crecientes, como al cargar un guardado en orden
+  (el BST degenera en lista y su recursión desborda la pila).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/inventory_tree.py --size 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+
+def height(inventory):
+    """Altura del árbol sin recursión."""
+    best = 0
+    stack = [(inventory.root, 1)] if inventory.root else []
+    while stack:
+        node, depth = stack.pop()
+        best = max(best, depth)
+        for child in (node.left, node.right):
+            if child:
+                stack.append((child, depth + 1))
+    return best
+
+
+def run(inventory_class, powers, lookups, queries):
+    inventory = inventory_class()
+    timings = {}
+    try:
+        start = time.perf_counter()
+        for power in powers:
+            inventory.insert(power, 1)
+        timings["insert"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for power in lookups:
+            inventory.search(power)
+        timings["search"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for power in lookups:
+            inventory.successor(power)
+        timings["successor"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(queries):
+            inventory.total_value()
+            inventory.random_node()
+        timings["value+random"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for power in powers[::2]:
+            inventory.delete(power, 1)
+        timings["delete"] = time.perf_counter() - start
+    except RecursionError:
+        return None, height(inventory)
+    return timings, height(inventory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="poderes distintos a insertar")
+    parser.add_argument("--lookups", type=int, default=100_000, help="búsquedas y sucesores a medir")
+    parser.add_argument("--queries", type=int, default=100, help="llamadas a total_value() + random_node()")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    from core.inventory import Inventory
+    from core.avl_inventory import AVLInventory
+
+    rng = random.Random(args.seed)
+    ascending = list(range(args.size))
+    shuffled = ascending[:]
+    rng.shuffle(shuffled)
+    lookups = [rng.randrange(args.size) for _ in range(args.lookups)]
+
+    print(f"{'orden':<10} {'árbol':<14} {'altura':>7} {'insert':>9} {'search':>9} {'successor':>10} "
+          f"{'value+random':>13} {'delete':>9}")
+    for order, powers in (("random", shuffled), ("ascending", ascending)):
+        for inventory_class in (Inventory, AVLInventory):
+            timings, tree_height = run(inventory_class, powers, lookups, args.queries)
+            name = inventory_class.__name__
+            if timings is None:
+                print(f"{order:<10} {name:<14} {tree_height:>7}  RecursionError")
+                continue
+            print(f"{order:<10} {name:<14} {tree_height:>7} "
+                  f"{timings['insert']:>8.3f}s {timings['search']:>8.3f}s "
+                  f"{timings['successor']:>9.3f}s {timings['value+random']:>12.3f}s {timings['delete']:>8.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Benchmark de memoria: recorre una línea recta larga por el mundo simulando,
+en cada paso, lo que hacen PlayerMovementController.move y GameScreen._render_map
+(asegurar la vecindad 3x3, desalojar chunks lejanos y pedir el sprite y la gema
+de cada tile visible). Mide con tracemalloc la memoria viva cada N pasos y
+falla si crece más de lo tolerado tras el calentamiento.
+
+El viewport tiene ~31 tiles de ancho, así que renderizarlo cada 10 pasos sigue
+pasando por todos los tiles del recorrido con una fracción del coste.
+Lo único que crece con la distancia son los conjuntos de claves de chunks
+visitados (generated_chunks y los desalojados), del orden de cientos de bytes por chunk.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/memory_walk.py --steps 6000 --every 600
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pygame  # noqa: E402
+
+
+def walk(steps, every, render_every, seed, chunk_size, tiles_x, tiles_y):
+    from core.map import Map
+
+    game_map = Map(chunk_size, seed=seed)
+    samples = []
+    tracemalloc.start()
+    y = chunk_size // 2
+    for x in range(steps):
+        chunk_x, chunk_y = game_map.get_chunk_key(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                game_map.ensure_chunk(chunk_x + dx, chunk_y + dy)
+        game_map.set_focus(chunk_x, chunk_y)
+
+        if x % render_every:
+            continue
+        start_x, start_y = x - tiles_x // 2, y - tiles_y // 2
+        for sy in range(tiles_y + 1):
+            for sx in range(tiles_x + 1):
+                game_map.get_sprite(start_x + sx, start_y + sy)
+                game_map.get_gem(start_x + sx, start_y + sy)
+
+        if x % every == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append((x, current, len(game_map.chunks)))
+    tracemalloc.stop()
+    game_map.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=6000, help="tiles recorridos")
+    parser.add_argument("--every", type=int, default=600, help="pasos entre muestras (múltiplo de --render-every)")
+    parser.add_argument("--render-every", type=int, default=10, help="pasos entre renders del viewport")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--chunk-size", type=int, default=21)
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=700)
+    parser.add_argument("--tile", type=int, default=32)
+    parser.add_argument("--max-growth-kb", type=float, default=256.0,
+                        help="crecimiento máximo tolerado tras la primera muestra posterior al calentamiento")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((args.width, args.height))
+    samples = walk(args.steps, args.every, args.render_every, args.seed, args.chunk_size,
+                   args.width // args.tile, args.height // args.tile)
+    pygame.quit()
+
+    print(f"{'paso':>8} {'memoria (KB)':>14} {'chunks en RAM':>14}")
+    for step, current, resident in samples:
+        print(f"{step:>8} {current / 1024:>14.1f} {resident:>14}")
+
+    # La primera muestra incluye el arranque; se compara desde la segunda
+    baseline = samples[1][1] if len(samples) > 2 else samples[0][1]
+    growth_kb = (max(current for _, current, _ in samples[1:]) - baseline) / 1024
+    print(f"crecimiento tras calentamiento: {growth_kb:.1f} KB (máximo {args.max_growth_kb:.1f} KB)")
+    return 0 if growth_kb <= args.max_growth_kb else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
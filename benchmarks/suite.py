@@ -0,0 +1,488 @@
+"""
+Suite de micro-benchmarks de los caminos calientes del mundo, el inventario
+y el render. Cada escenario usa una semilla fija, así que mide siempre el
+mismo trabajo:
+- chunk.*      ChunkGenerator.generate_chunk (laberinto y claro, con cada motor).
+- map.*        Map.ensure_chunk con gemas, cofres y portales, y las consultas
+               get_sprite / get_tile / get_gem sobre una zona generada.
+- inventory.*  insert, delete, search e inorder del BST (Inventory) y del AVL
+               (AVLInventory) a varios tamaños.
+- save.*       InventoryManager.save (diario y compactación) y load, en un
+               directorio temporal.
+- render.*     GameScreen._render_map con el driver de vídeo dummy de SDL:
+               sin cambios, desplazándose una casilla y repintando entero.
+
+Cada muestra cronometra una llamada (con el recolector de basura parado, como
+timeit) que hace `unidades` operaciones. Se informa de operaciones por segundo
+(según la mediana) y de los percentiles del tiempo por operación.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/suite.py                          # todos
+    python benchmarks/suite.py -k inventory -k save     # solo los que contienen esos textos
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json --max-regression 0.10 \\
+        --allow render.=0.25
+Con --compare sale con código 1 si algún benchmark pierde más de lo tolerado
+en operaciones por segundo respecto a la línea base.
+"""
+import argparse
+import contextlib
+import datetime
+import fnmatch
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+CHUNK_SIZE = 21
+TILE = 32
+PERCENTILES = (50, 90, 99)
+
+# ====================
+# Registro de benchmarks
+# ====================
+# nombre -> función(seed) que prepara el escenario y devuelve (op, unidades, reset):
+# op() es lo que se cronometra, hace `unidades` operaciones; reset() (o None)
+# se ejecuta antes de cada muestra fuera del cronómetro.
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _pygame_display(width=1, height=1):
+    """Los sprites necesitan una ventana (convert()); con el driver dummy no se ve nada."""
+    import pygame
+    pygame.init()
+    if pygame.display.get_surface() is None or pygame.display.get_surface().get_size() != (width, height):
+        pygame.display.set_mode((width, height))
+    return pygame
+
+
+# --------------------
+# Generación de chunks
+# --------------------
+def _chunk_benchmark(chunk_type, use_numpy):
+    def setup(seed):
+        from generators import ChunkGenerator
+        generator = ChunkGenerator(CHUNK_SIZE, use_numpy=use_numpy)
+        seeds = [seed * 1000 + i for i in range(20)]
+
+        def op():
+            for chunk_seed in seeds:
+                generator.generate_chunk(chunk_type, random.Random(chunk_seed))
+        return op, len(seeds), None
+    return setup
+
+
+def _register_chunk_benchmarks():
+    from factories.array_maze_carver import NUMPY_AVAILABLE
+    engines = [("python", False)] + ([("array", True)] if NUMPY_AVAILABLE else [])
+    for chunk_type in ("maze", "clearing"):
+        for engine, use_numpy in engines:
+            benchmark(f"chunk.generate[{chunk_type},{engine}]")(_chunk_benchmark(chunk_type, use_numpy))
+
+
+# --------------------
+# Mapa
+# --------------------
+@benchmark("map.ensure_chunk[4x4]")
+def _map_ensure_chunk(seed):
+    from core.map import Map
+    _pygame_display()
+    game_map = Map(CHUNK_SIZE, tile_size=TILE, seed=seed)
+    calls = [0]
+
+    def op():
+        # Cada llamada genera un bloque 4x4 que el mapa no ha visto nunca
+        base_x = calls[0] * 4
+        calls[0] += 1
+        for chunk_x in range(base_x, base_x + 4):
+            for chunk_y in range(4):
+                game_map.ensure_chunk(chunk_x, chunk_y)
+    return op, 16, None
+
+
+def _map_lookup_benchmark(method):
+    def setup(seed):
+        from core.map import Map
+        _pygame_display()
+        game_map = Map(CHUNK_SIZE, tile_size=TILE, seed=seed)
+        size = 3 * CHUNK_SIZE
+        for chunk_x in range(3):
+            for chunk_y in range(3):
+                game_map.ensure_chunk(chunk_x, chunk_y)
+        lookup = getattr(game_map, method)
+        cells = [(x, y) for y in range(size) for x in range(size)]
+        for x, y in cells:
+            lookup(x, y)  # los sprites se crean y cachean en la primera consulta
+
+        def op():
+            for x, y in cells:
+                lookup(x, y)
+        return op, len(cells), None
+    return setup
+
+
+for _method in ("get_sprite", "get_tile", "get_gem"):
+    benchmark(f"map.{_method}")(_map_lookup_benchmark(_method))
+
+
+# --------------------
+# Inventario
+# --------------------
+INVENTORY_SIZES = (100, 10_000)
+
+
+def _inventory_class(kind):
+    if kind == "avl":
+        from core.avl_inventory import AVLInventory
+        return AVLInventory
+    from core.inventory import Inventory
+    return Inventory
+
+
+def _inventory_benchmark(kind, operation, size):
+    def setup(seed):
+        inventory_class = _inventory_class(kind)
+        rng = random.Random(seed)
+        powers = list(range(1, size + 1))
+        rng.shuffle(powers)  # en orden creciente el BST degenera en lista
+        state = {}
+
+        def build():
+            inventory = inventory_class()
+            for power in powers:
+                inventory.insert(power, 1)
+            return inventory
+
+        if operation == "insert":
+            def reset():
+                state["inventory"] = inventory_class()
+
+            def op():
+                insert = state["inventory"].insert
+                for power in powers:
+                    insert(power, 1)
+            return op, size, reset
+
+        if operation == "delete":
+            def reset():
+                state["inventory"] = build()
+
+            def op():
+                delete = state["inventory"].delete
+                for power in powers:
+                    delete(power, 1)
+            return op, size, reset
+
+        inventory = build()
+        if operation == "search":
+            lookups = [rng.randint(1, size + size // 10) for _ in range(10_000)]  # ~9% fallan
+
+            def op():
+                search = inventory.search
+                for power in lookups:
+                    search(power)
+            return op, len(lookups), None
+
+        # inorder: una operación es un recorrido completo
+        return inventory.inorder, 1, None
+    return setup
+
+
+for _kind in ("bst", "avl"):
+    for _operation in ("insert", "delete", "search", "inorder"):
+        for _size in INVENTORY_SIZES:
+            benchmark(f"inventory.{_operation}[{_kind},n={_size}]")(_inventory_benchmark(_kind, _operation, _size))
+
+
+# --------------------
+# Guardado del inventario
+# --------------------
+SAVE_SIZE = 1000
+_temp_dirs = []
+
+
+def _inventory_manager(seed):
+    from core.avl_inventory import AVLInventory
+    from core.managers.inventory_manager import InventoryManager
+    directory = tempfile.mkdtemp(prefix="gem_rush_bench_")
+    _temp_dirs.append(directory)
+    # Con una ruta absoluta InventoryManager no escribe en data/
+    manager = InventoryManager(AVLInventory(), os.path.join(directory, "save_inventory.txt"))
+    rng = random.Random(seed)
+    for power in rng.sample(range(1, 100 * SAVE_SIZE), SAVE_SIZE):
+        manager.inventory.insert(power, rng.randint(1, 50))
+    manager.save()
+    return manager, rng
+
+
+@benchmark("save.journal[10 changes]")
+def _save_journal(seed):
+    manager, rng = _inventory_manager(seed)
+    powers = [node.poder for node in manager.inventory.inorder()]
+    # Sin compactar: se mide solo el diario
+    manager.compact_min_records = 1 << 30
+
+    def op():
+        for power in rng.sample(powers, 10):
+            manager.inventory.insert(power, 1)
+        manager.save()
+    return op, 1, None
+
+
+@benchmark(f"save.compact[n={SAVE_SIZE}]")
+def _save_compact(seed):
+    manager, _ = _inventory_manager(seed)
+    return manager.compact, 1, None
+
+
+@benchmark(f"save.load[n={SAVE_SIZE}]")
+def _save_load(seed):
+    manager, rng = _inventory_manager(seed)
+    powers = [node.poder for node in manager.inventory.inorder()]
+    manager.compact_min_records = 1 << 30
+    for _ in range(20):
+        for power in rng.sample(powers, 10):
+            manager.inventory.insert(power, 1)
+        manager.save()  # 200 registros en el diario que load() tiene que aplicar
+    return manager.load, 1, None
+
+
+# --------------------
+# Render
+# --------------------
+SCREEN_SIZE = (1000, 700)
+
+
+def _game_screen(seed):
+    pygame = _pygame_display(*SCREEN_SIZE)
+    from controllers import GameManager, HUDController, MimicDecisionController
+    from controllers.screens import GameScreen
+    # GameScreen carga sprites y audio con rutas relativas a src/
+    os.chdir(SRC_DIR)
+    screen = pygame.display.get_surface()
+    font = pygame.font.SysFont(None, 24)
+    mimic = MimicDecisionController(None, screen, font, *SCREEN_SIZE)
+    game = GameManager(CHUNK_SIZE, TILE, mimic_controller=mimic, seed=seed, autosave=False, prefetch_workers=0)
+    hud = HUDController(screen, font, *SCREEN_SIZE, (255, 255, 255))
+    with contextlib.redirect_stdout(io.StringIO()):  # avisos del audio
+        game_screen = GameScreen(screen, game, hud, mimic, lambda *args, **kwargs: None)
+    game_screen._render_map()
+    return game_screen
+
+
+@benchmark("render.map[static]")
+def _render_static(seed):
+    game_screen = _game_screen(seed)
+    return game_screen._render_map, 1, None
+
+
+@benchmark("render.map[scroll]")
+def _render_scroll(seed):
+    game_screen = _game_screen(seed)
+    player = game_screen.game.player
+    start_x = player.x
+    frames = [0]
+
+    def op():
+        # Va y vuelve 40 casillas: desplazamiento de una casilla por frame sin salir de la zona
+        frames[0] += 1
+        step = frames[0] % 80
+        player.x = start_x + (step if step < 40 else 80 - step)
+        game_screen._render_map()
+
+    # Una vuelta completa fuera del cronómetro: los chunks del recorrido ya existen
+    for _ in range(80):
+        op()
+    return op, 1, None
+
+
+@benchmark("render.map[full]")
+def _render_full(seed):
+    game_screen = _game_screen(seed)
+
+    def op():
+        game_screen.viewport.invalidate()
+        game_screen._render_map()
+    return op, 1, None
+
+
+# ====================
+# Medición
+# ====================
+def percentile(sorted_values, q):
+    """Percentil con interpolación lineal."""
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def measure(setup, seed, samples, warmup):
+    random.seed(seed)
+    op, units, reset = setup(seed)
+    for _ in range(warmup):
+        if reset:
+            reset()
+        op()
+
+    per_op = []
+    for _ in range(samples):
+        if reset:
+            reset()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            op()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        per_op.append(elapsed / units)
+
+    per_op.sort()
+    median = percentile(per_op, 50)
+    result = {"ops_per_sec": 1 / median if median else float("inf"), "units": units, "samples": samples}
+    for q in PERCENTILES:
+        result[f"p{q}_us"] = percentile(per_op, q) * 1e6
+    return result
+
+
+def environment():
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy_version,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+# ====================
+# Línea base
+# ====================
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, seed, previous=None):
+    """Guarda los resultados; los benchmarks no ejecutados conservan su línea base anterior."""
+    merged = dict(previous["results"]) if previous else {}
+    merged.update(results)
+    data = {"environment": environment(), "seed": seed, "results": merged}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def allowed_regression(name, default, overrides):
+    """Umbral de un benchmark: el del patrón más largo de --allow que lo contenga, o el global."""
+    best = None
+    for pattern, value in overrides:
+        if pattern in name or fnmatch.fnmatchcase(name, pattern):
+            if best is None or len(pattern) > len(best[0]):
+                best = (pattern, value)
+    return default if best is None else best[1]
+
+
+def _parse_allow(text):
+    pattern, _, value = text.rpartition("=")
+    if not pattern:
+        raise argparse.ArgumentTypeError(f"se esperaba PATRÓN=FRACCIÓN: {text}")
+    return pattern, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="ejecuta solo los benchmarks cuyo nombre contiene el texto (o casa con el patrón)")
+    parser.add_argument("--list", action="store_true", help="lista los benchmarks y sale")
+    parser.add_argument("--samples", type=int, default=25, help="muestras cronometradas por benchmark")
+    parser.add_argument("--warmup", type=int, default=3, help="llamadas de calentamiento sin cronometrar")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--save", metavar="JSON", help="guarda los resultados como línea base")
+    parser.add_argument("--compare", metavar="JSON", help="compara con una línea base")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="pérdida máxima de ops/s tolerada (0.10 = 10%%)")
+    parser.add_argument("--allow", type=_parse_allow, action="append", default=[], metavar="PATRÓN=FRACCIÓN",
+                        help="umbral propio para los benchmarks que casan con el patrón")
+    args = parser.parse_args(argv)
+    # Los benchmarks de pantalla cambian el cwd a src/: las rutas se resuelven antes
+    for option in ("save", "compare"):
+        if getattr(args, option):
+            setattr(args, option, os.path.abspath(getattr(args, option)))
+
+    _register_chunk_benchmarks()
+    names = sorted(name for name in BENCHMARKS
+                   if not args.filters or any(f in name or fnmatch.fnmatchcase(name, f) for f in args.filters))
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    baseline_results = baseline["results"] if baseline else {}
+
+    header = f"{'benchmark':<36} {'ops/s':>12} " + " ".join(f"{'p' + str(q) + ' µs':>10}" for q in PERCENTILES)
+    print(header + ("   vs base" if baseline else ""))
+    results = {}
+    failures = []
+    try:
+        for name in names:
+            result = measure(BENCHMARKS[name], args.seed, args.samples, args.warmup)
+            results[name] = result
+            line = f"{name:<36} {result['ops_per_sec']:>12,.0f} " + \
+                " ".join(f"{result[f'p{q}_us']:>10.2f}" for q in PERCENTILES)
+            reference = baseline_results.get(name)
+            if reference:
+                change = result["ops_per_sec"] / reference["ops_per_sec"] - 1
+                limit = allowed_regression(name, args.max_regression, args.allow)
+                status = ""
+                if change < -limit:
+                    status = f"  REGRESIÓN (máx. -{limit:.0%})"
+                    failures.append(name)
+                line += f"   {change:>+7.1%}{status}"
+            elif baseline:
+                line += "   (nuevo)"
+            print(line, flush=True)
+    finally:
+        for directory in _temp_dirs:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if args.save:
+        previous = load_baseline(args.save) if os.path.exists(args.save) else None
+        save_baseline(args.save, results, args.seed, previous)
+        print(f"Línea base guardada en {args.save}")
+    if failures:
+        print(f"{len(failures)} benchmark(s) por encima del umbral: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from controllers.player_interaction_controller import PlayerInteractionControlle
 from controllers.player_movement_controller import PlayerMovementController
 from controllers.chest_controller import ChestController
 from controllers.game_manager import GameManager
+from controllers.game_simulation import GameSimulation, SimulationPolicy, RandomWalkPolicy, SeekerPolicy
 from controllers.mimic_decision_controller import MimicDecisionController
 from controllers.hud_controller import HUDController
 from controllers.portal_controller import PortalController
@@ -14,6 +15,10 @@ __all__ = [
     "PlayerInteractionController",
     "ChestController",
     "GameManager",
+    "GameSimulation",
+    "SimulationPolicy",
+    "RandomWalkPolicy",
+    "SeekerPolicy",
     "MimicDecisionController",
     "HUDController",
     "PortalController",
@@ -3,7 +3,18 @@ import random
 from core import Player
 from core.interfaces import IChest
 
+
+def loot_gains(contents: List[Any]) -> dict:
+    """Convierte el loot [(poder, nombre, cantidad)] en {poder: cantidad} para Inventory.apply."""
+    gains = {}
+    for poder, name, cantidad in contents:
+        gains[poder] = gains.get(poder, 0) + cantidad
+    return gains
+
+
 class ChestController:
+    MIMIC_FIGHT_DEATH_CHANCE = 0.9
+
     def __init__(self, player: Player, chest: IChest, mimic_controller=None):
         self.player = player
         self.chest = chest
@@ -20,12 +31,9 @@ class ChestController:
         # --------------------------
         # Pago normal del cofre
         # --------------------------
-        if not self.chest.can_open(self.player.inventory, mimic_phase=False):
+        if not self.player.inventory.apply(costs=self.chest.get_open_cost()):
             return {"success": False, "message": "Not enough gems to open", "items": []}
 
-        for poder, cantidad in self.chest.get_open_cost().items():
-            self.player.inventory.delete(poder, cantidad)
-
         # --------------------------
         # Si es Mimic
         # --------------------------
@@ -44,28 +52,22 @@ class ChestController:
 
             # Jugador decide pelear
             if fight:
-                if random.random() < 0.9:  # 90% de morir
+                if random.random() < self.MIMIC_FIGHT_DEATH_CHANCE:
                     self.player.die()
                     self.chest.mark_opened()
                     return {"success": False, "message": "You fought the mimic and were devoured!", "items": []}
                 else:
                     contents = self.chest.get_contents()
-                    for poder, name, cantidad in contents:
-                        self.player.inventory.insert(poder, cantidad)
+                    self.player.inventory.apply(gains=loot_gains(contents))
                     self.chest.mark_opened()
                     return {"success": True, "message": f"You fought the mimic and obtained {len(contents)} gem types!", "items": contents}
 
-            # Jugador decide pagar
-            if not self.chest.can_open(self.player.inventory, mimic_phase=True):
+            # Jugador decide pagar: coste del mimic y loot en una sola operación
+            contents = self.chest.get_contents()
+            if not self.player.inventory.apply(costs=self.chest.get_mimic_cost(), gains=loot_gains(contents)):
                 self.player.die()
                 self.chest.mark_opened()
                 return {"success": False, "message": "Mimic attacked! You died.", "items": []}
-
-            for poder, cantidad in self.chest.get_mimic_cost().items():
-                self.player.inventory.delete(poder, cantidad)
-            contents = self.chest.get_contents()
-            for poder, name, cantidad in contents:
-                self.player.inventory.insert(poder, cantidad)
             self.chest.mark_opened()
             return {"success": True, "message": f"You paid {len(contents)} gem types from the mimic and survived!", "items": contents}
 
@@ -73,8 +75,7 @@ class ChestController:
         # Cofre normal
         # --------------------------
         contents = self.chest.get_contents()
-        for poder, name, cantidad in contents:
-            self.player.inventory.insert(poder, cantidad)
+        self.player.inventory.apply(gains=loot_gains(contents))
         self.chest.mark_opened()
         return {"success": True, "message": f"Obtained {len(contents)} gem types", "items": contents}
 
@@ -1,41 +1,74 @@
+import os
 from controllers.chest_controller import ChestController
-from core.managers import InventoryManager
+from core.managers import AutosaveManager, InventoryManager
+from core.managers.inventory_manager import DATA_DIR
+from core.world_file import WorldFile
 from controllers.portal_controller import PortalController
 
 class GameManager:
-    def __init__(self, chunk_size, tile_size, hud=None, mimic_controller=None):
+    WORLD_FILENAME = "save_world.bin"
+
+    def __init__(self, chunk_size, tile_size, hud=None, mimic_controller=None, seed=None, autosave_options=None,
+                 autosave=True, prefetch_workers=1):
         self.chunk_size = chunk_size
         self.tile_size = tile_size
+        self.seed = seed  # None = mundo nuevo aleatorio en cada partida
+        self.world_path = os.path.join(DATA_DIR, self.WORLD_FILENAME)
+        self.autosave_options = autosave_options or {}  # interval, debounce, triggers
+        self.autosave_enabled = autosave  # False en simulaciones: no se escribe nada en disco
+        self.prefetch_workers = prefetch_workers
+        self.autosave = None
+        self.save_error = None  # error de un autoguardado ya detenido, pendiente de mostrar
         self.hud = hud
         self.mimic_controller = mimic_controller
         self.paused = False
         self.pause_screen = None
         self.reset_game()
 
-    def reset_game(self):
+    def reset_game(self, world_file: WorldFile = None):
+        """Empieza una partida nueva, o retoma el mundo de `world_file` si se indica."""
         from core.map import Map
         from core.player import Player
-        from core.inventory import Inventory
+        from core.avl_inventory import AVLInventory
         from core.managers.gem_manager import GemManager
         from core.managers.portal_manager import PortalManager
         from controllers.player_movement_controller import PlayerMovementController
         from controllers.player_interaction_controller import PlayerInteractionController
         from core.portal import Portal
+        from resources.loot_tables import LOOT_TABLES
+
+        # Las tablas de loot editadas en disco se aplican desde la partida siguiente
+        LOOT_TABLES.reload()
 
         # ----------------------------
         # Mapa
         # ----------------------------
-        self.game_map = Map(self.chunk_size, path_width_range=(1, 2), tile_size=self.tile_size)
+        # El autoguardado anterior termina antes de cerrar el mapa que está leyendo
+        self._stop_autosave()
+        if getattr(self, "game_map", None):
+            self.game_map.close()
+        self.game_map = Map(self.chunk_size, path_width_range=(1, 2), tile_size=self.tile_size, seed=self.seed,
+                            prefetch_workers=self.prefetch_workers, world_file=world_file)
+        if world_file is not None:
+            start_x, start_y = world_file.player_position
+        else:
+            start_x = start_y = self.chunk_size // 2
+        start_cx, start_cy = self.game_map.get_chunk_key(start_x, start_y)
         for cx in (-1, 0, 1):
             for cy in (-1, 0, 1):
-                self.game_map.ensure_chunk(cx, cy)
+                self.game_map.ensure_chunk(start_cx + cx, start_cy + cy)
 
         # ----------------------------
         # Jugador e inventario
         # ----------------------------
-        self.player_inventory = Inventory()
-        self.player = Player(self.chunk_size // 2, self.chunk_size // 2, self.player_inventory)
+        self.player_inventory = AVLInventory()
+        self.player = Player(start_x, start_y, self.player_inventory)
+        if self.mimic_controller:
+            self.mimic_controller.player = self.player
         self.inventory_manager = InventoryManager(self.player_inventory)
+        if self.autosave_enabled:
+            self.autosave = AutosaveManager(self.inventory_manager, self.game_map, self.player, self.world_path,
+                                            **self.autosave_options)
 
         # ----------------------------
         # Controladores
@@ -52,7 +85,7 @@ class GameManager:
         # ----------------------------
         # Aseguramos que haya un portal inicial
         # ----------------------------
-        chunk = self.game_map.chunks[0][0]
+        chunk = self.game_map.get_chunk(0, 0)
         self.portal_manager.try_spawn_portal(0, 0, chunk)
 
         # Obtenemos el portal desde PortalManager
@@ -81,13 +114,30 @@ class GameManager:
     # ----------------------------
     def open_chest(self, chest, fight: bool = None):
         controller = ChestController(self.player, chest, mimic_controller=self.mimic_controller)
-        return controller.try_open(fight=fight)
+        result = controller.try_open(fight=fight)
+        if chest.is_opened():
+            self._world_changed("chest")
+        return result
 
     # ----------------------------
     # Portal
     # ----------------------------
-    def try_activate_portal(self) -> dict:
-        return self.portal_ctrl.try_activate()
+    def try_activate_portal(self, portal=None) -> dict:
+        """Intenta activar `portal` (el que está al alcance) o, si no se indica, el portal actual."""
+        if portal is not None and portal is not self.portal:
+            self.portal = portal
+            self.portal_ctrl = PortalController(self.player, portal)
+        result = self.portal_ctrl.try_activate()
+        if result.get("success"):
+            self._world_changed("portal")
+        return result
+
+    def _world_changed(self, event: str):
+        """Marca los chunks junto al jugador (donde está el cofre o portal) y avisa al autoguardado."""
+        x, y = self.player.x, self.player.y
+        self.game_map.mark_region_dirty(x - 1, y - 1, x + 1, y + 1)
+        if self.autosave:
+            self.autosave.notify(event)
 
     # ----------------------------
     # Pausa
@@ -109,7 +159,47 @@ class GameManager:
 
     def load_inventory(self):
         self.inventory_manager.load()
+
+    # ----------------------------
+    # Partida guardada (mundo + inventario)
+    # ----------------------------
+    def save_game(self):
+        """Encarga al autoguardado el inventario y el mundo; no bloquea el frame."""
+        if self.autosave:
+            self.autosave.save_now()
+
+    def continue_game(self):
+        """
+        Retoma la partida guardada: el mundo se abre sin decodificar ningún chunk
+        (se leen al visitarlos) y después se carga el inventario.
+        """
+        if self.autosave:
+            self.save_error = self.autosave.flush() or self.save_error
+        if os.path.exists(self.world_path):
+            self.reset_game(world_file=WorldFile(self.world_path))
+        self.load_inventory()
         
+    def close(self):
+        """Termina el autoguardado pendiente y libera el mapa (al salir del juego)."""
+        self._stop_autosave()
+        error = self.take_save_error()
+        if error:
+            print(f"Error al guardar la partida: {error}")
+        self.game_map.close()
+
+    def take_save_error(self):
+        """Devuelve y olvida el último error de guardado sin mostrar (None si no hay)."""
+        error, self.save_error = self.save_error, None
+        if error is None and self.autosave:
+            error = self.autosave.take_error()
+        return error
+
+    def _stop_autosave(self):
+        """Detiene el autoguardado; su último error queda para take_save_error()."""
+        if self.autosave:
+            self.save_error = self.autosave.shutdown() or self.save_error
+            self.autosave = None
+
     def has_saved_inventory(self) -> bool:
         return self.inventory_manager.has_saved_inventory()
     
@@ -0,0 +1,246 @@
+import random
+from typing import List, Optional, Tuple
+from controllers.mimic_decision_controller import MimicDecisionController
+from controllers.thief_event_controller import ThiefEventController
+
+
+class SimulationPolicy:
+    """
+    Decide por el jugador en una simulación sin pantalla.
+    Por defecto se queda quieto y paga al ladrón y al mimic, que es lo que
+    ocurre en el juego cuando el jugador deja correr el tiempo de decisión.
+    """
+
+    def next_action(self, sim: "GameSimulation") -> Tuple[int, int, bool]:
+        """(dx, dy, interactuar) para el siguiente paso."""
+        return 0, 0, False
+
+    def thief_choice(self, sim: "GameSimulation", thief: ThiefEventController) -> str:
+        return "pay"
+
+    def mimic_choice(self, sim: "GameSimulation", chest) -> str:
+        return "pay"
+
+
+class RandomWalkPolicy(SimulationPolicy):
+    """Camina al azar e intenta interactuar con todo lo que tenga al lado."""
+    DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+    def __init__(self, rng: random.Random = None, fight_probability: float = 0.0):
+        self.rng = rng or random
+        self.fight_probability = fight_probability
+
+    def next_action(self, sim):
+        dx, dy = self.rng.choice(self.DIRECTIONS)
+        return dx, dy, True
+
+    def thief_choice(self, sim, thief):
+        return "fight" if self.rng.random() < self.fight_probability else "pay"
+
+    def mimic_choice(self, sim, chest):
+        return "fight" if self.rng.random() < self.fight_probability else "pay"
+
+
+class SeekerPolicy(RandomWalkPolicy):
+    """
+    Bot guiado: va hacia la gema, el cofre asequible o el portal activable más
+    cercano dentro de `radius` casillas e interactúa al llegar; si no ve nada
+    o el camino está bloqueado, da un paso al azar.
+    """
+
+    def __init__(self, rng: random.Random = None, fight_probability: float = 0.0, radius: int = 8):
+        super().__init__(rng, fight_probability)
+        self.radius = radius
+
+    def next_action(self, sim):
+        player = sim.game.player
+        inventory = player.inventory
+        px, py, r = player.x, player.y, self.radius
+        nearby = sim.game.game_map.query_region(px - r, py - r, px + r, py + r)
+        targets = [(x, y) for x, y, _ in nearby["gems"]]
+        targets += [(x, y) for x, y, chest in nearby["chests"] if not chest.is_opened() and chest.can_open(inventory)]
+        targets += [(x, y) for x, y, portal in nearby["portals"]
+                    if not portal.is_activated() and portal.can_activate(inventory)]
+
+        # Solo interactúa si puede pagar: no reintenta cada paso un cofre o portal inasequible
+        chest = sim.chest_in_range()
+        if chest is not None:
+            interact = chest.can_open(inventory)
+        else:
+            portal = sim.portal_in_range()
+            interact = portal is not None and portal.can_activate(inventory)
+        if not targets:
+            return super().next_action(sim)[:2] + (interact,)
+
+        tx, ty = min(targets, key=lambda target: abs(target[0] - px) + abs(target[1] - py))
+        dx, dy = (tx > px) - (tx < px), (ty > py) - (ty < py)
+        game_map = sim.game.game_map
+        # Primero el eje con más distancia; si está bloqueado, el otro
+        steps = [(dx, 0), (0, dy)] if abs(tx - px) >= abs(ty - py) else [(0, dy), (dx, 0)]
+        for step_x, step_y in steps:
+            if (step_x or step_y) and not game_map.is_blocked(px + step_x, py + step_y):
+                return step_x, step_y, interact
+        return super().next_action(sim)[:2] + (interact,)
+
+
+class GameSimulation:
+    """
+    Reglas de un paso de juego sin pantalla ni audio, sobre un GameManager:
+    - Movimiento y recogida de gemas, cofres y portales al alcance,
+      probabilidad de ladrón y de trampa al cambiar de casilla.
+    - GameScreen usa estos mismos métodos y solo añade la interfaz (mensajes,
+      ventanas de decisión); step() los encadena resolviendo las decisiones
+      con una SimulationPolicy, para bots, tests y simulaciones de balance.
+    - outcome pasa a "win" al activar un portal o "death" al morir
+      (death_cause: "thief" o "mimic").
+    """
+    # Probabilidad por paso = min(valor del inventario × factor, máximo)
+    THIEF_FACTOR = 0.00005
+    THIEF_MAX_CHANCE = 0.05
+    TRAP_FACTOR = 0.00002
+    TRAP_MAX_CHANCE = 0.03
+
+    def __init__(self, game, policy: SimulationPolicy = None, rng: random.Random = None):
+        self.game = game
+        self.policy = policy or SimulationPolicy()
+        self.rng = rng or random
+        self.steps = 0
+        self.outcome: Optional[str] = None
+        self.death_cause: Optional[str] = None
+        self.last_position = (game.player.x, game.player.y)
+        if game.mimic_controller is None:
+            # La decisión del mimic se resuelve con la política, pero ChestController
+            # necesita un controlador donde anotar que la decisión empezó
+            game.mimic_controller = MimicDecisionController(game.player, None, None, 0, 0)
+
+    @classmethod
+    def create(cls, chunk_size: int = 21, seed: int = None, policy: SimulationPolicy = None,
+               rng: random.Random = None) -> "GameSimulation":
+        """Partida nueva sin pantalla, sin autoguardado y sin hilos de pre-generación."""
+        from controllers.game_manager import GameManager
+        game = GameManager(chunk_size, 32, seed=seed, autosave=False, prefetch_workers=0)
+        return cls(game, policy, rng)
+
+    # ====================
+    # Reglas (compartidas con GameScreen)
+    # ====================
+    def move(self, dx: int, dy: int, dt: float = None) -> Optional[int]:
+        """
+        Mueve al jugador y recoge la gema de la casilla. `dt` por defecto avanza
+        exactamente una casilla. Devuelve el valor de la gema recogida o None.
+        """
+        game = self.game
+        if dt is None:
+            dt = 1.0 / game.movement_ctrl.speed
+        game.movement_ctrl.move(dx, dy, dt)
+        return game.interaction_ctrl.collect_gem()
+
+    def roll_thief(self) -> bool:
+        """True si aparece el ladrón en este paso."""
+        chance = min(self.game.get_inventory_total_value() * self.THIEF_FACTOR, self.THIEF_MAX_CHANCE)
+        return self.rng.random() < chance
+
+    def check_trap(self) -> Optional[dict]:
+        """Tira la trampa; si salta, quita gemas de un tipo al azar y devuelve {"gem", "qty"}."""
+        inventory = self.game.player.inventory
+        if not inventory.root:
+            return None
+        chance = min(self.game.get_inventory_total_value() * self.TRAP_FACTOR, self.TRAP_MAX_CHANCE)
+        if self.rng.random() >= chance:
+            return None
+        node = inventory.random_node(self.rng)
+        qty = self.rng.randint(1, node.cantidad)
+        poder = node.poder
+        inventory.apply(costs={poder: qty})
+        return {"gem": poder, "qty": qty}
+
+    def chest_in_range(self):
+        """Primer cofre cerrado en las 8 casillas vecinas (o la propia), o None."""
+        px, py = self.game.player.x, self.game.player.y
+        nearby = self.game.game_map.query_region(px - 1, py - 1, px + 1, py + 1, kinds=("chests",))
+        for _, _, chest in sorted(nearby["chests"], key=lambda entry: entry[:2]):
+            if not chest.is_opened():
+                return chest
+        return None
+
+    def portal_in_range(self):
+        """Primer portal sin activar en las 8 casillas vecinas (o la propia), o None."""
+        px, py = self.game.player.x, self.game.player.y
+        nearby = self.game.game_map.query_region(px - 1, py - 1, px + 1, py + 1, kinds=("portals",))
+        for _, _, portal in sorted(nearby["portals"], key=lambda entry: entry[:2]):
+            if not portal.is_activated():
+                return portal
+        return None
+
+    # ====================
+    # Paso completo (sin interfaz)
+    # ====================
+    def step(self, dx: int = 0, dy: int = 0, interact: bool = False) -> List[dict]:
+        """Avanza un paso y devuelve los eventos ocurridos como dicts con "type"."""
+        if self.outcome:
+            return []
+        self.steps += 1
+        events = []
+        game = self.game
+        player = game.player
+
+        if dx or dy:
+            gem_value = self.move(dx, dy)
+            if gem_value:
+                events.append({"type": "gem", "value": gem_value})
+
+        position = (player.x, player.y)
+        if position != self.last_position:
+            self.last_position = position
+            if self.roll_thief():
+                events.append(self._resolve_thief())
+            trap = self.check_trap()
+            if trap:
+                events.append(dict(trap, type="trap"))
+
+        if interact and player.get_state():
+            chest = self.chest_in_range()
+            portal = None if chest else self.portal_in_range()
+            if chest:
+                events.append(self._open_chest(chest))
+            elif portal:
+                result = game.try_activate_portal(portal)
+                events.append(dict(result, type="portal"))
+                if result.get("success"):
+                    self.outcome = "win"
+
+        if not player.get_state() and self.outcome is None:
+            self.outcome = "death"
+        return events
+
+    def run(self, max_steps: int) -> Optional[str]:
+        """Juega hasta ganar, morir o agotar `max_steps` pasos con la política. Devuelve outcome."""
+        while self.outcome is None and self.steps < max_steps:
+            self.step(*self.policy.next_action(self))
+        return self.outcome
+
+    def _resolve_thief(self) -> dict:
+        thief = ThiefEventController(self.game.player, None, None, 0, 0)
+        thief.start_event()
+        thief.choice = self.policy.thief_choice(self, thief)
+        result = thief.resolve_choice()
+        thief.active = False
+        if result.get("result") == "killed":
+            # Igual que GameScreen: morir ante el ladrón acaba la partida
+            self.game.player.die()
+            self.death_cause = "thief"
+        return dict(result, type="thief")
+
+    def _open_chest(self, chest) -> dict:
+        game = self.game
+        result = game.open_chest(chest)
+        # Solo hay encuentro con el mimic si se pagó la apertura (no con "Not enough gems")
+        mimic = result.get("success") is None
+        if mimic:
+            # Mimic: la política decide en lugar de la ventana de decisión
+            game.mimic_controller.active = False
+            fight = self.policy.mimic_choice(self, chest) == "fight"
+            result = game.open_chest(chest, fight=fight)
+            if not game.player.get_state():
+                self.death_cause = "mimic"
+        return dict(result, type="chest", mimic=mimic)
@@ -21,25 +21,31 @@ class HUDController:
             msg["timer"] -= dt
         self.floating_messages = [m for m in self.floating_messages if m["timer"] > 0]
 
+    # Los métodos draw_* devuelven los rectángulos dibujados (para actualizar solo esas zonas)
     def draw_floating_messages(self):
+        rects = []
         y_offset = 50
         for msg in self.floating_messages:
             text_surface = self.font.render(msg["text"], True, self.color_text)
             text_x = self.width // 2 - text_surface.get_width() // 2
-            self.screen.blit(text_surface, (text_x, y_offset))
+            rects.append(self.screen.blit(text_surface, (text_x, y_offset)))
             y_offset += 25
+        return rects
 
     def draw_chest_cost(self, current_cost_text):
         if current_cost_text:
             text_surface = self.font.render(f"Chest cost: {current_cost_text}", True, self.color_text)
             text_x = self.width // 2 - text_surface.get_width() // 2
-            self.screen.blit(text_surface, (text_x, 30))
+            return [self.screen.blit(text_surface, (text_x, 30))]
+        return []
 
     def draw_inventory(self, inventory, inventory_open, inventory_formatter):
+        rects = []
         if inventory_open:
             summary = inventory_formatter.summary(inventory)
             for i, line in enumerate(summary.split("\n")):
-                self.screen.blit(self.font.render(line, True, self.color_text), (self.width-300, 50 + i*20))
+                rects.append(self.screen.blit(self.font.render(line, True, self.color_text), (self.width-300, 50 + i*20)))
+        return rects
 
     def clear_messages(self):
         self.floating_messages.clear()
@@ -12,11 +12,12 @@ class PlayerInteractionController:
 
     def collect_gem(self):
         if not self.player.get_state():
-            return
+            return None
 
         gem_value = self.game_map.collect_gem(self.player.x, self.player.y)
         if gem_value is not None:
             self.player.inventory.insert(gem_value, 1)
+        return gem_value
 
     def interact_with_chest(self) -> List[Any]:
         """
@@ -26,20 +27,18 @@ class PlayerInteractionController:
         if not self.player.get_state():
             return []
 
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = self.player.x + dx, self.player.y + dy
-                ichest = self.game_map.get_chest(nx, ny)
-                if ichest:
-                    controller = ChestController(self.player, ichest)
-                    result = controller.try_open()
+        px, py = self.player.x, self.player.y
+        nearby = self.game_map.query_region(px - 1, py - 1, px + 1, py + 1, kinds=("chests",))
+        for _, _, ichest in sorted(nearby["chests"], key=lambda entry: entry[:2]):
+            controller = ChestController(self.player, ichest)
+            result = controller.try_open()
 
-                    if result["success"]:
-                        print(f"Chest opened! {result['message']}")
-                    else:
-                        print(f"Cannot open chest: {result['message']}")
+            if result["success"]:
+                print(f"Chest opened! {result['message']}")
+            else:
+                print(f"Cannot open chest: {result['message']}")
 
-                    return result["items"]
+            return result["items"]
         return []
 
     def interact_with_portal(self) -> dict:
@@ -41,3 +41,9 @@ class PlayerMovementController:
         for dx_chunk in [-1, 0, 1]:
             for dy_chunk in [-1, 0, 1]:
                 self.game_map.ensure_chunk(chunk_x + dx_chunk, chunk_y + dy_chunk)
+
+        # desalojar chunks lejanos del working set
+        self.game_map.set_focus(chunk_x, chunk_y)
+
+        # pre-generar en segundo plano los chunks hacia donde se mueve
+        self.game_map.prefetch_ahead(new_x, new_y, dx * self.speed, dy * self.speed)
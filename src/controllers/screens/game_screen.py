@@ -1,9 +1,14 @@
 import pygame
 import random
 import os
-from resources.gem_data import GEM_NAMES
+from core.frame_profiler import PROFILER
+from resources.gem_registry import GEM_REGISTRY
 from views.inventory_formatter import InventoryFormatter
+from views.profiler_overlay import ProfilerOverlay
+from views.terrain_renderer import TerrainRenderer
+from views.viewport import Viewport
 from controllers import GameManager, HUDController, MimicDecisionController
+from controllers.game_simulation import GameSimulation
 from controllers.screens.pause_screen import PauseScreen
 from controllers.thief_event_controller import ThiefEventController
 from audio_manager import AudioManager
@@ -11,6 +16,7 @@ from audio_manager import AudioManager
 # Definir rutas absolutas a las texturas
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
 TEXTURE_DIR = os.path.join(BASE_DIR, "textures")
+PROFILE_CSV = os.path.join(BASE_DIR, "data", "frame_profile.csv")
 
 class GameScreen:
     screen: pygame.Surface
@@ -25,6 +31,8 @@ class GameScreen:
         self.hud = hud
         self.mimic_controller = mimic_controller
         self.change_screen_callback = change_screen_callback
+        # Reglas del juego sin interfaz (las mismas que usan las simulaciones)
+        self.sim = GameSimulation(game)
         self.TILE = game.tile_size
         self.WIDTH, self.HEIGHT = screen.get_size()
         # Audio
@@ -44,6 +52,11 @@ class GameScreen:
         self.COLOR_BG = (0, 0, 0)
         self.COLOR_TEXT = (255, 255, 255)
         self.font = pygame.font.SysFont(None, 24)
+        self.viewport = Viewport(TerrainRenderer(game.game_map, self.TILE), self.WIDTH, self.HEIGHT, self.TILE)
+        self.overlay_rects = []
+        # Tiempos por fase: F3 muestra u oculta el panel, F4 exporta a CSV
+        self.profiler_overlay = ProfilerOverlay(pygame.font.SysFont("monospace", 14))
+        self._watch_caches()
 
         # --- SISTEMA DE SPRITES DEL JUGADOR ---
         self.player_direction = "down"
@@ -153,10 +166,9 @@ class GameScreen:
             sprite = None
 
         if sprite:
-            self.screen.blit(sprite, (player_screen_x, player_screen_y))
-        else:
-            pygame.draw.rect(self.screen, self.COLOR_PLAYER,
-                             (player_screen_x, player_screen_y, self.TILE, self.TILE))
+            return self.screen.blit(sprite, (player_screen_x, player_screen_y))
+        return pygame.draw.rect(self.screen, self.COLOR_PLAYER,
+                                (player_screen_x, player_screen_y, self.TILE, self.TILE))
 
     # -----------------------
     # EVENTOS
@@ -182,6 +194,8 @@ class GameScreen:
     def _handle_keydown(self, key):
         if key == pygame.K_ESCAPE:
             self.is_paused = True
+            if self.game.autosave:
+                self.game.autosave.notify("pause")
         elif not self.thief_controller.active:
             if key == pygame.K_w: self.move_directions["up"] = 1
             elif key == pygame.K_s: self.move_directions["down"] = 1
@@ -189,6 +203,11 @@ class GameScreen:
             elif key == pygame.K_d: self.move_directions["right"] = 1
         if key == pygame.K_TAB:
             self.inventory_open = not self.inventory_open
+        elif key == pygame.K_F3:
+            self._toggle_profiler()
+        elif key == pygame.K_F4 and PROFILER.enabled:
+            rows = PROFILER.export_csv(PROFILE_CSV)
+            self.hud.add_message(f"Frame profile: {rows} frames -> {PROFILE_CSV}", duration_seconds=3.0)
         elif key == pygame.K_e:
             self._interact()
 
@@ -212,9 +231,7 @@ class GameScreen:
             return
 
         if self.current_portal_in_range:
-            portal = self.current_portal_in_range
-            self.game.portal = portal
-            result = self.game.try_activate_portal()
+            result = self.game.try_activate_portal(self.current_portal_in_range)
             message = result.get("message", "Portal activated!" if result.get("success") else "Cannot activate portal")
             self.hud.add_message(message, duration_seconds=3.0)
             if result.get("success"):
@@ -224,6 +241,11 @@ class GameScreen:
     # UPDATE
     # -----------------------
     def update(self, dt: float):
+        if self.game.autosave:
+            self.game.autosave.update()
+        save_error = self.game.take_save_error()
+        if save_error:
+            self.hud.add_message(f"Autosave failed: {save_error}", duration_seconds=3.0)
         if self.is_paused:
             self.pause_screen.update(dt)
             return
@@ -241,7 +263,8 @@ class GameScreen:
                 self.prev_player_pos = current_pos
                 self._check_random_events()
 
-            self._update_player_movement(dt)
+            with PROFILER.timer("movement"):
+                self._update_player_movement(dt)
             self._update_chest_in_range()
             self._update_portal_in_range()
             self._update_mimic()
@@ -276,10 +299,7 @@ class GameScreen:
             self.hud.add_message(message, duration_seconds=3.0)
 
     def _check_random_events(self):
-        total = self.game.get_inventory_total_value()
-        k_thief = 0.00005
-        chance_thief = min(total * k_thief, 0.05)
-        if random.random() < chance_thief:
+        if self.sim.roll_thief():
             self.thief_controller.start_event(duration_frames=600)
             self.move_directions = {k:0 for k in self.move_directions}
 
@@ -289,58 +309,30 @@ class GameScreen:
         dx = self.move_directions["right"] - self.move_directions["left"]
         dy = self.move_directions["down"] - self.move_directions["up"]
         if dx != 0 or dy != 0:
-            self.game.movement_ctrl.move(dx, dy, dt)
-            gem_value = self.game.interaction_ctrl.collect_gem()
+            gem_value = self.sim.move(dx, dy, dt)
             if gem_value:
-                self.hud.add_message(f"Collected {GEM_NAMES.get(gem_value, f'Gem {gem_value}')}!", duration_seconds=2.0)
+                self.hud.add_message(f"Collected {GEM_REGISTRY.name(gem_value)}!", duration_seconds=2.0)
 
     def _check_trap(self):
-        inv = self.game.player.inventory
-        if not inv.root:
-            return
-        total_value = self.game.get_inventory_total_value()
-        k_trap = 0.00002
-        chance = min(total_value * k_trap, 0.03)
-        if random.random() < chance:
-            nodes = inv.inorder()
-            if nodes:
-                gem_node = random.choice(nodes)
-                qty = random.randint(1, gem_node.getCantidad())
-                inv.delete(gem_node.poder, qty)
-                self.hud.add_message(
-                    f"You fell into a trap and lost {qty} of {GEM_NAMES.get(gem_node.poder, gem_node.poder)}!",
-                    duration_seconds=3.0
-                )
+        trap = self.sim.check_trap()
+        if trap:
+            self.hud.add_message(
+                f"You fell into a trap and lost {trap['qty']} of {GEM_REGISTRY.name(trap['gem'])}!",
+                duration_seconds=3.0
+            )
 
     def _update_chest_in_range(self):
-        self.current_chest_in_range = None
+        self.current_chest_in_range = chest = self.sim.chest_in_range()
         self.current_cost_text = ""
-        px, py = self.game.player.x, self.game.player.y
-        for dx in [-1,0,1]:
-            for dy in [-1,0,1]:
-                nx, ny = px+dx, py+dy
-                chest = self.game.game_map.get_chest(nx, ny)
-                if chest and not chest.is_opened():
-                    self.current_chest_in_range = chest
-                    cost = chest.get_open_cost()
-                    if cost:
-                        self.current_cost_text = ", ".join(f"{c}x {GEM_NAMES.get(g,g)}" for g,c in cost.items())
-                    return
+        if chest and chest.get_open_cost():
+            self.current_cost_text = ", ".join(f"{c}x {GEM_REGISTRY.name(g)}" for g, c in chest.get_open_cost().items())
 
     def _update_portal_in_range(self):
-        self.current_portal_in_range = None
+        self.current_portal_in_range = portal = self.sim.portal_in_range()
         self.current_portal_cost_text = ""
-        px, py = self.game.player.x, self.game.player.y
-        for dx in [-1,0,1]:
-            for dy in [-1,0,1]:
-                nx, ny = px+dx, py+dy
-                portal, pos = self.game.game_map.get_portal(nx, ny)
-                if portal and pos == (nx, ny) and not portal.is_activated():
-                    self.current_portal_in_range = portal
-                    cost = portal.get_activation_cost()
-                    if cost:
-                        self.current_portal_cost_text = ", ".join(f"{c}x {GEM_NAMES.get(g, g)}" for g, c in cost.items())
-                    return
+        if portal and portal.get_activation_cost():
+            self.current_portal_cost_text = ", ".join(
+                f"{c}x {GEM_REGISTRY.name(g)}" for g, c in portal.get_activation_cost().items())
 
     def _update_mimic(self):
         if self.player_dead_by_thief:
@@ -358,43 +350,82 @@ class GameScreen:
     # RENDER GENERAL
     # -----------------------
     def render(self):
+        # Con pausa u overlays modales se compone el frame entero
+        if self.is_paused or self.thief_controller.active or self.mimic_controller.active:
+            self._render_full_frame()
+        else:
+            self._render_dirty_frame()
+
+    def _render_full_frame(self):
         self.screen.fill(self.COLOR_BG)
         self.screen.blit(
             self.font.render("TAB: Inventory | E: Interact | ESC: Pause", True, self.COLOR_TEXT),
             (10, 10)
         )
 
-        self._render_map()
+        with PROFILER.timer("render_map"):
+            self._render_map()
+        self.screen.blit(self.viewport.surface, (0, 0))
         self._render_player()
-        self._render_hud()
+        with PROFILER.timer("hud"):
+            self._render_hud()
         self.thief_controller.draw()
 
         if self.is_paused:
             self.pause_screen.render()
 
-        pygame.display.flip()
+        with PROFILER.timer("flip"):
+            pygame.display.flip()
+        # El siguiente frame incremental debe repintar toda la pantalla
+        self.viewport.invalidate()
+
+    def _render_dirty_frame(self):
+        # Restaurar desde la capa del mundo lo que cambió y lo que tapaban los overlays del frame anterior
+        with PROFILER.timer("render_map"):
+            restored = self._render_map() + self.overlay_rects
+            for rect in restored:
+                self.screen.blit(self.viewport.surface, rect, rect)
+
+        with PROFILER.timer("hud"):
+            self.overlay_rects = [self._render_player()] + self._render_hud()
+        with PROFILER.timer("flip"):
+            pygame.display.update(restored + self.overlay_rects)
 
     def _render_map(self):
+        """Pone al día la capa del mundo y devuelve los rectángulos que cambiaron."""
         tiles_x, tiles_y = self.WIDTH//self.TILE, self.HEIGHT//self.TILE
         start_x = self.game.player.x - tiles_x//2
         start_y = self.game.player.y - tiles_y//2
 
-        for sy in range(tiles_y+1):
-            for sx in range(tiles_x+1):
-                mx, my = start_x+sx, start_y+sy
-                sprite = self.game.game_map.get_sprite(mx, my)
-                self.screen.blit(sprite, (sx*self.TILE, sy*self.TILE))
-
-                gem_value = self.game.game_map.get_gem(mx, my)
-                if gem_value is not None:
-                    color = self.game.gem_manager.get_gem_color(gem_value)
-                    pygame.draw.circle(self.screen, color,
-                                       (sx*self.TILE+self.TILE//2, sy*self.TILE+self.TILE//2), self.TILE//4)
+        # El mapa se recrea al reiniciar la partida
+        if self.viewport.game_map is not self.game.game_map:
+            self.viewport = Viewport(TerrainRenderer(self.game.game_map, self.TILE), self.WIDTH, self.HEIGHT, self.TILE)
+            self._watch_caches()
+        return self.viewport.update(start_x, start_y)
 
     def _render_hud(self):
-        self.hud.draw_floating_messages()
-        self.hud.draw_chest_cost(self.current_cost_text)
+        rects = self.hud.draw_floating_messages()
+        rects += self.hud.draw_chest_cost(self.current_cost_text)
         if self.current_portal_cost_text:
-            self.hud.draw_chest_cost(self.current_portal_cost_text)
-        self.hud.draw_inventory(self.game.player.inventory, self.inventory_open, InventoryFormatter)
+            rects += self.hud.draw_chest_cost(self.current_portal_cost_text)
+        rects += self.hud.draw_inventory(self.game.player.inventory, self.inventory_open, InventoryFormatter)
         self.mimic_controller.draw()
+        rects += self.profiler_overlay.draw(self.screen, PROFILER)
+        return rects
+
+    # -----------------------
+    # PERFILADO
+    # -----------------------
+    def _toggle_profiler(self):
+        # La primera vez activa la medición; después solo muestra u oculta el panel
+        if not PROFILER.enabled:
+            PROFILER.enabled = True
+            self.profiler_overlay.visible = False
+        self.profiler_overlay.toggle()
+
+    def _watch_caches(self):
+        """Cachés observadas por el perfilador: residencia de chunks y tiles horneados del terreno."""
+        residency = self.game.game_map.residency
+        renderer = self.viewport.renderer
+        PROFILER.watch("chunks", lambda: (residency.hits, residency.misses + residency.generated))
+        PROFILER.watch("terreno", lambda: (renderer.hits, renderer.bakes))
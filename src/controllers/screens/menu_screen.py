@@ -89,7 +89,7 @@ class MenuScreen(ScreenBase):
         elif option == "Continue":
             if self.game_manager.has_saved_inventory():
                 try:
-                    self.game_manager.load_inventory()
+                    self.game_manager.continue_game()
                     self.change_screen_callback("game")
                 except Exception:
                     self.show_error("Could not load inventory.")
@@ -103,6 +103,10 @@ class MenuScreen(ScreenBase):
         self.error_timer = pygame.time.get_ticks()
 
     def update(self, dt=0):
+        # El guardado de "Quit" en la pausa termina en segundo plano
+        save_error = self.game_manager.take_save_error()
+        if save_error:
+            self.show_error(f"Could not save game: {save_error}")
         if self.current_y < self.target_y:
             self.current_y = min(self.current_y + self.animation_speed, self.target_y)
         elif self.current_y > self.target_y:
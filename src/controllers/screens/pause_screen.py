@@ -50,8 +50,8 @@ class PauseScreen(ScreenBase):
         if option == "Resume":
             self.game_screen.is_paused = False
         elif option == "Quit":
-            # Guardamos inventario antes de salir
-            self.game_manager.save_inventory()
+            # Guardamos inventario y mundo antes de salir
+            self.game_manager.save_game()
             self.change_screen_callback("menu")
 
     def update(self, dt=0):
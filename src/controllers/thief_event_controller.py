@@ -1,8 +1,10 @@
 import pygame
 import random
-from resources.gem_data import GEM_NAMES
+from resources.gem_registry import GEM_REGISTRY
 
 class ThiefEventController:
+    FIGHT_DEATH_CHANCE = 0.5
+
     def __init__(self, player, screen, font, width, height):
         self.player = player
         self.screen = screen
@@ -34,10 +36,10 @@ class ThiefEventController:
         self.timer = duration_frames
         self.duration = duration_frames
 
-        # Elegir gema aleatoria de GEM_NAMES
-        self.gem_name = random.choice(list(GEM_NAMES.keys()))
+        # Elegir gema aleatoria del registro de tipos de gema
+        self.gem_name = random.choice(GEM_REGISTRY.powers())
         self.gem_qty = random.randint(1, 3)  # Cantidad pedida aleatoria
-        self.gem_display_name = GEM_NAMES[self.gem_name]
+        self.gem_display_name = GEM_REGISTRY.name(self.gem_name)
 
         # Posicionar botones
         self.fight_rect.topleft = (self.width//2 - self.btn_w - self.spacing//2, self.height//2 - self.btn_h//2)
@@ -91,7 +93,7 @@ class ThiefEventController:
             if node:
                 # Caso 1: tiene la gema pedida
                 removed_qty = min(self.gem_qty, node.getCantidad())
-                inv.delete(node.poder, removed_qty)
+                inv.apply(costs={node.poder: removed_qty})
                 return {"choice": "pay", "gem": node.poder, "name": self.gem_display_name, "qty": removed_qty}
 
             else:
@@ -99,23 +101,23 @@ class ThiefEventController:
                 pred_node = inv.predecessor(self.gem_name)
                 if pred_node:
                     removed_qty = random.randint(1, pred_node.getCantidad())  # cantidad aleatoria
-                    inv.delete(pred_node.poder, removed_qty)
+                    inv.apply(costs={pred_node.poder: removed_qty})
                     return {"choice": "pay", "gem": pred_node.poder,
-                            "name": GEM_NAMES.get(pred_node.poder, str(pred_node.poder)), "qty": removed_qty}
+                            "name": GEM_REGISTRY.name(pred_node.poder), "qty": removed_qty}
                 else:
                     # Usar la gema mínima
                     min_node = inv.min_value()
                     if min_node:
                         removed_qty = random.randint(1, min_node.getCantidad())  # cantidad aleatoria
-                        inv.delete(min_node.poder, removed_qty)
+                        inv.apply(costs={min_node.poder: removed_qty})
                         return {"choice": "pay", "gem": min_node.poder,
-                                "name": GEM_NAMES.get(min_node.poder, str(min_node.poder)), "qty": removed_qty}
+                                "name": GEM_REGISTRY.name(min_node.poder), "qty": removed_qty}
                     else:
                         # Inventario vacío → se considera pelea
                         self.choice = "fight"
 
         if self.choice == "fight":
-            if random.random() < 0.5:  # 50% chance de morir
+            if random.random() < self.FIGHT_DEATH_CHANCE:
                 self.player.alive = False
                 return {"choice": "fight", "result": "killed"}
             return {"choice": "fight", "result": "won"}
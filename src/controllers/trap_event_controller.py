@@ -1,5 +1,5 @@
 import random
-from resources.gem_data import GEM_NAMES
+from resources.gem_registry import GEM_REGISTRY
 
 class TrapEventController:
     def __init__(self, player):
@@ -12,24 +12,23 @@ class TrapEventController:
     # Activar trampa
     # ====================
     def trigger_trap(self):
-        inv_nodes = self.player.inventory.inorder()
-        if not inv_nodes:
+        # Elegir nodo aleatorio del inventario
+        lost_node = self.player.inventory.random_node()
+        if lost_node is None:
             # Inventario vacío → nada que perder
             return None
 
-        # Elegir nodo aleatorio del inventario
-        lost_node = random.choice(inv_nodes)
         # Cantidad aleatoria entre 1 y la que tiene
         self.gem_lost_qty = random.randint(1, lost_node.getCantidad())
         self.gem_lost_name = lost_node.poder
 
         # Eliminar la gema del inventario
-        self.player.inventory.delete(lost_node.poder, self.gem_lost_qty)
+        self.player.inventory.apply(costs={lost_node.poder: self.gem_lost_qty})
 
         # Marcar evento como activo temporalmente si quieres mostrar mensaje
         self.active = True
         return {"gem": self.gem_lost_name,
-                "name": GEM_NAMES.get(self.gem_lost_name, str(self.gem_lost_name)),
+                "name": GEM_REGISTRY.name(self.gem_lost_name),
                 "qty": self.gem_lost_qty}
 
     # ====================
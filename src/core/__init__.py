@@ -1,5 +1,6 @@
 from core.player import Player
 from core.chest import Chest
 from core.portal import Portal
+from core.chunk import Chunk
 
-__all__ = ["Player", "Chest", "Portal"]
\ No newline at end of file
+__all__ = ["Player", "Chest", "Portal", "Chunk"]
\ No newline at end of file
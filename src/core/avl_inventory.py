@@ -0,0 +1,329 @@
+import random
+from core.binary_node import Node
+from core.inventory import Inventory
+from typing import Optional, List, Tuple
+
+class AVLInventory(Inventory):
+    """
+    Inventario sobre un árbol AVL (misma interfaz que Inventory):
+    - La altura se mantiene en O(log n) aunque las gemas lleguen ordenadas
+      (p. ej. al cargar un guardado con poderes ascendentes).
+    - insert y delete recorren el árbol una sola vez, sin recursión, y
+      rebalancean subiendo por el camino guardado.
+    - Cada nodo guarda agregados de su subárbol (nodos, cantidad total y
+      poder × cantidad), lo que da total_value() en O(1) y rank/select,
+      sumas por rango de poder y selección aleatoria en O(log n).
+    - successor, predecessor, min_value y max_value se heredan de Inventory.
+    """
+
+    # -------------------
+    # Implementación de IInventory
+    # -------------------
+    def insert(self, poder: int, cantidad: int = 1) -> None:
+        self._record_change(poder, cantidad)
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if poder == node.poder:
+                node.cantidad += cantidad
+                self._rebalance_path(path)
+                return
+            node = node.left if poder < node.poder else node.right
+
+        new_node = Node(poder)
+        new_node.cantidad = cantidad
+        self._update(new_node)
+        if not path:
+            self.root = new_node
+            return
+        parent = path[-1]
+        if poder < parent.poder:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+
+    def search(self, poder: int) -> Optional[Node]:
+        node = self.root
+        while node:
+            if poder == node.poder:
+                return node
+            node = node.left if poder < node.poder else node.right
+        return None
+
+    def delete(self, poder: int, cantidad: int = 1) -> None:
+        path = []
+        node = self.root
+        while node and node.poder != poder:
+            path.append(node)
+            node = node.left if poder < node.poder else node.right
+        if node is None:
+            return
+        self._record_change(poder, -min(cantidad, node.cantidad))
+
+        # Reducir cantidad si es mayor a la que se desea eliminar
+        if node.cantidad > cantidad:
+            node.cantidad -= cantidad
+            self._rebalance_path(path + [node])
+            return
+
+        if node.left and node.right:
+            # Copiar el sucesor en el nodo y quitar el sucesor, que no tiene hijo izquierdo
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            node.poder = successor.poder
+            node.cantidad = successor.cantidad
+            node = successor
+
+        child = node.left or node.right
+        if not path:
+            self.root = child
+            return
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        self._rebalance_path(path)
+
+    def _locate(self, poder: int) -> Tuple[Optional[Node], List[Node]]:
+        """Nodo del poder (o None) y sus ancestros desde la raíz."""
+        path = []
+        node = self.root
+        while node and node.poder != poder:
+            path.append(node)
+            node = node.left if poder < node.poder else node.right
+        return node, path
+
+    def _adjust(self, node: Node, path: List[Node], delta: int) -> None:
+        """Suma `delta` a la cantidad del nodo y refresca los agregados hasta la raíz (sin rotar)."""
+        node.cantidad += delta
+        self._update(node)
+        for ancestor in reversed(path):
+            self._update(ancestor)
+
+    def load_sorted(self, records: List[Tuple[int, int]]) -> None:
+        """
+        Reemplaza el contenido por `records` [(poder, cantidad)] en orden creciente
+        de poder, construyendo directamente un árbol perfectamente balanceado en O(n).
+        """
+        self.clear()
+        nodes = []
+        for poder, cantidad in records:
+            node = Node(poder)
+            node.cantidad = cantidad
+            nodes.append(node)
+
+        # Cada rango [low, high) cuelga su punto medio del padre; se enlaza sin
+        # recursión y después se calculan los agregados de abajo arriba.
+        order = []
+        stack = [(0, len(nodes), None, False)]
+        while stack:
+            low, high, parent, is_left = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            node = nodes[middle]
+            if parent is None:
+                self.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            order.append(node)
+            stack.append((low, middle, node, True))
+            stack.append((middle + 1, high, node, False))
+        for node in reversed(order):
+            self._update(node)
+
+    # -------------------
+    # Balanceo
+    # -------------------
+    @staticmethod
+    def _height(node: Optional[Node]) -> int:
+        return node.height if node else 0
+
+    @staticmethod
+    def _update(node: Node) -> None:
+        """Recalcula la altura y los agregados del nodo a partir de sus hijos."""
+        left, right = node.left, node.right
+        height, size, count, value = 0, 1, node.cantidad, node.poder * node.cantidad
+        if left:
+            height, size, count, value = left.height, size + left.size, count + left.total_count, value + left.total_value
+        if right:
+            height = max(height, right.height)
+            size, count, value = size + right.size, count + right.total_count, value + right.total_value
+        node.height, node.size, node.total_count, node.total_value = height + 1, size, count, value
+
+    def _rotate_right(self, node: Node) -> Node:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node: Node) -> Node:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node: Node) -> Node:
+        """Devuelve la nueva raíz del subárbol tras corregir su factor de balance."""
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _rebalance_path(self, path: List[Node]) -> None:
+        """
+        Rebalancea de abajo arriba los nodos del camino y reengancha cada subárbol a su padre.
+        Se recorre el camino completo porque los agregados cambian hasta la raíz.
+        """
+        update = self._update
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            left, right = node.left, node.right
+            left_height = left.height if left else 0
+            right_height = right.height if right else 0
+            if -1 <= left_height - right_height <= 1:
+                # Caso habitual: solo hay que refrescar altura y agregados
+                update(node)
+                continue
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
+
+    # -------------------
+    # Agregados
+    # -------------------
+    def __len__(self) -> int:
+        """Número de poderes distintos."""
+        return self.root.size if self.root else 0
+
+    def total_count(self) -> int:
+        """Número total de gemas (suma de cantidades)."""
+        return self.root.total_count if self.root else 0
+
+    def total_value(self) -> int:
+        """Suma de poder × cantidad de todo el inventario."""
+        return self.root.total_value if self.root else 0
+
+    def rank(self, poder: int) -> int:
+        """Número de poderes distintos menores que `poder`."""
+        rank = 0
+        node = self.root
+        while node:
+            if poder <= node.poder:
+                node = node.left
+            else:
+                rank += 1 + (node.left.size if node.left else 0)
+                node = node.right
+        return rank
+
+    def select(self, index: int) -> Optional[Node]:
+        """Devuelve el nodo en la posición `index` (0 = menor poder), o None si no existe."""
+        node = self.root
+        while node:
+            left_size = node.left.size if node.left else 0
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+        return None
+
+    def _sum_below(self, poder: int) -> Tuple[int, int]:
+        """(cantidad, valor) acumulados de los nodos con poder < `poder`."""
+        count = value = 0
+        node = self.root
+        while node:
+            if poder <= node.poder:
+                node = node.left
+            else:
+                left = node.left
+                count += node.cantidad + (left.total_count if left else 0)
+                value += node.poder * node.cantidad + (left.total_value if left else 0)
+                node = node.right
+        return count, value
+
+    def range_sum(self, low: int, high: int) -> Tuple[int, int]:
+        """(cantidad, valor) de las gemas con poder en [low, high]."""
+        if high < low:
+            return 0, 0
+        count_high, value_high = self._sum_below(high + 1)
+        count_low, value_low = self._sum_below(low)
+        return count_high - count_low, value_high - value_low
+
+    def random_node(self, rng: random.Random = None, weighted: bool = False) -> Optional[Node]:
+        """
+        Elige un nodo al azar sin construir listas:
+        uniforme entre poderes distintos, o ponderado por cantidad si `weighted`.
+        """
+        rng = rng or random
+        if not self.root:
+            return None
+        if not weighted:
+            return self.select(rng.randrange(self.root.size))
+
+        target = rng.randrange(self.root.total_count)
+        node = self.root
+        while True:
+            left = node.left
+            left_count = left.total_count if left else 0
+            if target < left_count:
+                node = left
+            elif target < left_count + node.cantidad:
+                return node
+            else:
+                target -= left_count + node.cantidad
+                node = node.right
+
+    # -------------------
+    # Recorridos
+    # -------------------
+    def inorder(self) -> List[Node]:
+        elements = []
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            elements.append(node)
+            node = node.right
+        return elements
+
+    def preorder(self) -> List[str]:
+        result = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            result.append(f"{node.poder};{node.cantidad}")
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+        return result
@@ -1,12 +1,26 @@
-from resources.gem_data import GEM_NAMES
+from resources.gem_registry import GEM_REGISTRY
 
 class Node:
+    """
+    Nodo compacto del inventario: sin __dict__ y sin copia del nombre.
+    El nombre se resuelve en el registro compartido de tipos de gema.
+    """
+    __slots__ = ("poder", "cantidad", "left", "right", "height", "size", "total_count", "total_value")
+
     def __init__(self, poder):
         self.poder = poder
-        self.nombre = GEM_NAMES.get(poder, f"Gema {poder}")
         self.cantidad = 1  # cantidad de gemas de este poder
         self.left = None
         self.right = None
+        # Agregados del subárbol (los mantiene AVLInventory)
+        self.height = 1
+        self.size = 1                  # nodos del subárbol
+        self.total_count = 1           # suma de cantidades
+        self.total_value = poder       # suma de poder × cantidad
+
+    @property
+    def nombre(self):
+        return GEM_REGISTRY.name(self.poder)
 
     # Getters y setters para hijos
     def getLeft(self):
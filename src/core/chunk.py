@@ -0,0 +1,89 @@
+from typing import Iterator, Tuple
+from resources.tile_data import TILE_TREE, TILE_TUPLES
+
+class Chunk:
+    """
+    Chunk cuadrado del mapa almacenado como un buffer de bytes.
+    Cada celda guarda el código entero de su tile (ver resources.tile_data),
+    de modo que un chunk de 21x21 ocupa 441 bytes. Un segundo buffer del mismo
+    tamaño guarda la variante visual de cada celda (solo se usa en los árboles).
+    """
+    __slots__ = ("size", "tiles", "variants")
+
+    def __init__(self, size: int, fill: int = TILE_TREE, tiles: bytes = None, variants: bytes = None):
+        self.size = size
+        if tiles is not None:
+            if len(tiles) != size * size:
+                raise ValueError(f"Se esperaban {size * size} bytes, se recibieron {len(tiles)}")
+            self.tiles = bytearray(tiles)
+        else:
+            self.tiles = bytearray([fill]) * (size * size)
+        self.variants = bytes(variants) if variants is not None else bytes(size * size)
+        if len(self.variants) != size * size:
+            raise ValueError(f"Se esperaban {size * size} variantes, se recibieron {len(self.variants)}")
+
+    # -------------------------
+    # Lectura
+    # -------------------------
+    def get(self, x: int, y: int) -> int:
+        """Devuelve el código del tile en la posición local (x, y)."""
+        return self.tiles[y * self.size + x]
+
+    def get_tile(self, x: int, y: int) -> Tuple:
+        """Devuelve el tile en formato tupla, p. ej. ("GRASS",) o ("TREE", variante)."""
+        index = y * self.size + x
+        code = self.tiles[index]
+        if code == TILE_TREE:
+            return ("TREE", self.variants[index])
+        return TILE_TUPLES[code]
+
+    def get_variant(self, x: int, y: int) -> int:
+        """Devuelve la variante visual de la celda (p. ej. el sprite de árbol)."""
+        return self.variants[y * self.size + x]
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def count(self, code: int) -> int:
+        """Cuenta las celdas de un tipo dado."""
+        return self.tiles.count(code)
+
+    def is_uniform(self, code: int) -> bool:
+        """True si todas las celdas son del tipo dado."""
+        return self.tiles.count(code) == len(self.tiles)
+
+    def positions(self, code: int) -> Iterator[Tuple[int, int]]:
+        """Itera las posiciones locales (x, y) con el código dado, en orden de filas."""
+        tiles, size = self.tiles, self.size
+        index = tiles.find(code)
+        while index != -1:
+            yield index % size, index // size
+            index = tiles.find(code, index + 1)
+
+    # -------------------------
+    # Escritura
+    # -------------------------
+    def set(self, x: int, y: int, code: int) -> None:
+        self.tiles[y * self.size + x] = code
+
+    def fill(self, code: int) -> None:
+        self.tiles[:] = bytearray([code]) * len(self.tiles)
+
+    def set_variants(self, variants: bytes) -> None:
+        if len(variants) != len(self.tiles):
+            raise ValueError(f"Se esperaban {len(self.tiles)} variantes, se recibieron {len(variants)}")
+        self.variants = bytes(variants)
+
+    # -------------------------
+    # Serialización
+    # -------------------------
+    def to_bytes(self) -> bytes:
+        """Tiles seguidos de variantes (2 * size * size bytes)."""
+        return bytes(self.tiles) + self.variants
+
+    @classmethod
+    def from_bytes(cls, size: int, data: bytes) -> "Chunk":
+        area = size * size
+        if len(data) == area:
+            return cls(size, tiles=data)
+        return cls(size, tiles=data[:area], variants=data[area:])
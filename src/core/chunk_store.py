@@ -0,0 +1,64 @@
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Optional
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CHUNK_CACHE_DIR = os.path.join(DATA_DIR, "chunk_cache")
+
+class ChunkStore:
+    """
+    Almacén en disco para chunks desalojados de memoria.
+    Cada chunk se guarda en su propio archivo; el contenido es el estado
+    completo del chunk (tiles, gemas, cofres y portal) serializado con pickle.
+    Cada almacén usa su propio subdirectorio de sesión dentro de `root`, así
+    que varios mapas a la vez (p. ej. un benchmark junto a la partida) no se
+    pisan los chunks; close() lo elimina.
+    """
+
+    def __init__(self, root: str = CHUNK_CACHE_DIR):
+        os.makedirs(root, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="session_", dir=root)
+
+    def _path(self, chunk_x: int, chunk_y: int) -> str:
+        return os.path.join(self.directory, f"chunk_{chunk_x}_{chunk_y}.bin")
+
+    def save(self, chunk_x: int, chunk_y: int, state: Any) -> None:
+        """Escribe el estado del chunk (escritura a temporal + rename)."""
+        path = self._path(chunk_x, chunk_y)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, chunk_x: int, chunk_y: int) -> Optional[Any]:
+        """Lee y elimina el estado del chunk; None si no está en disco."""
+        path = self._path(chunk_x, chunk_y)
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        os.remove(path)
+        return state
+
+    def peek(self, chunk_x: int, chunk_y: int) -> Optional[Any]:
+        """Lee el estado del chunk sin eliminarlo; None si no está en disco."""
+        try:
+            with open(self._path(chunk_x, chunk_y), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def contains(self, chunk_x: int, chunk_y: int) -> bool:
+        return os.path.exists(self._path(chunk_x, chunk_y))
+
+    def clear(self) -> None:
+        """Vacía el directorio de esta sesión (los de otros almacenes no se tocan)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,194 @@
+import collections
+import contextlib
+import csv
+import time
+from array import array
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class RollingHistogram:
+    """Últimos `size` valores en un buffer circular, con percentiles bajo demanda."""
+
+    def __init__(self, size: int = 600):
+        self.values = array("d", bytes(8 * size))
+        self.size = size
+        self.count = 0
+        self.index = 0
+
+    def add(self, value: float) -> None:
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def last(self) -> float:
+        return self.values[self.index - 1] if self.count else 0.0
+
+    def window(self) -> List[float]:
+        return sorted(self.values[:self.count])
+
+    def percentile(self, q: float, window: List[float] = None) -> float:
+        window = window if window is not None else self.window()
+        if not window:
+            return 0.0
+        return window[min(len(window) - 1, int(len(window) * q / 100))]
+
+    def summary(self) -> Dict[str, float]:
+        window = self.window()
+        return {
+            "last": self.last(),
+            "p50": self.percentile(50, window),
+            "p95": self.percentile(95, window),
+            "p99": self.percentile(99, window),
+            "max": window[-1] if window else 0.0,
+        }
+
+
+class _Timer:
+    """Cronómetro reutilizable de un nombre; admite anidarse consigo mismo."""
+    __slots__ = ("profiler", "name", "starts")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.starts: List[float] = []
+
+    def __enter__(self):
+        self.starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.starts.pop()
+        timings = self.profiler.timings
+        timings[self.name] = timings.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """
+    Instrumentación por frame, desactivada por defecto:
+    - timer(nombre) es un context manager que suma el tiempo de esa fase en el
+      frame actual; desactivado devuelve un nullcontext compartido (sin medir nada).
+    - count(nombre) suma a un contador del frame (chunks construidos, cargados o
+      pre-generados, horneados de terreno...); counter_totals() los suma en la ventana.
+    - watch(nombre, fuente) registra una caché: fuente() da (aciertos, fallos)
+      acumulados y se calcula la tasa de acierto en la ventana de frames.
+    - begin_frame()/end_frame() delimitan el frame: cada fase guarda su tiempo
+      (0 si no se ejecutó) en un RollingHistogram de `history` frames.
+    - export_csv() vuelca los frames de la ventana, una fila por frame.
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 1200, budget_ms: float = 1000 / 120):
+        self.enabled = enabled
+        self.history = history
+        self.budget_ms = budget_ms
+        self.reset()
+
+    def reset(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, RollingHistogram] = {}
+        self.frames: Deque[Tuple[int, float, Dict[str, float], Dict[str, int]]] = collections.deque(maxlen=self.history)
+        self.frame_index = 0
+        self.spikes = 0
+        self._timers: Dict[str, _Timer] = {}
+        self._watches: Dict[str, Tuple[Callable[[], Tuple[int, int]], Tuple[int, int]]] = {}
+        self._watch_windows: Dict[str, Deque[Tuple[int, int]]] = {}
+        self._frame_start: Optional[float] = None
+
+    # ====================
+    # Instrumentación
+    # ====================
+    def timer(self, name: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _Timer(self, name)
+        return timer
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def watch(self, name: str, source: Callable[[], Tuple[int, int]]) -> None:
+        """Registra (o sustituye, p. ej. al recrear el mapa) una caché observada."""
+        self._watches[name] = (source, source())
+        self._watch_windows[name] = collections.deque(maxlen=self.history)
+
+    def watched(self) -> List[str]:
+        return sorted(self._watch_windows)
+
+    def hit_rate(self, name: str) -> Optional[float]:
+        """Tasa de acierto de la caché en la ventana; None si no hubo consultas."""
+        window = self._watch_windows.get(name)
+        if not window:
+            return None
+        hits = sum(h for h, _ in window)
+        total = hits + sum(m for _, m in window)
+        return hits / total if total else None
+
+    # ====================
+    # Frames
+    # ====================
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self.timings = {}
+            self.counters = {}
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if not self.enabled or self._frame_start is None:
+            return
+        total = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        self._histogram("frame").add(total * 1000)
+        for name in self._timers:
+            self._histogram(name).add(self.timings.get(name, 0.0) * 1000)
+        for name, (source, previous) in self._watches.items():
+            current = source()
+            self._watches[name] = (source, current)
+            self._watch_windows[name].append((current[0] - previous[0], current[1] - previous[1]))
+        if total * 1000 > self.budget_ms:
+            self.spikes += 1
+        self.frames.append((self.frame_index, total, self.timings, self.counters))
+        self.frame_index += 1
+
+    def _histogram(self, name: str) -> RollingHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.history)
+        return histogram
+
+    def counter_totals(self) -> Dict[str, int]:
+        """Suma de cada contador en los frames de la ventana."""
+        totals: Dict[str, int] = {}
+        for _, _, _, counters in self.frames:
+            for name, amount in counters.items():
+                totals[name] = totals.get(name, 0) + amount
+        return totals
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{fase: {last, p50, p95, p99, max}} en ms, con "frame" el frame completo."""
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    # ====================
+    # Exportación
+    # ====================
+    def export_csv(self, path: str) -> int:
+        """Escribe los frames de la ventana (tiempos en ms). Devuelve las filas escritas."""
+        timer_names = sorted(self._timers)
+        counter_names = sorted({name for _, _, _, counters in self.frames for name in counters})
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in timer_names] + counter_names)
+            for index, total, timings, counters in self.frames:
+                writer.writerow([index, f"{total * 1000:.4f}"]
+                                + [f"{timings.get(name, 0.0) * 1000:.4f}" for name in timer_names]
+                                + [counters.get(name, 0) for name in counter_names])
+        return len(self.frames)
+
+
+# Instancia compartida por el bucle principal, las pantallas y el mapa
+PROFILER = FrameProfiler()
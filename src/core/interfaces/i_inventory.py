@@ -1,5 +1,5 @@
 # src/core/interfaces/i_inventory.py
-from typing import Protocol, Optional, List
+from typing import Protocol, Optional, List, Dict, Tuple
 from core.binary_node import Node
 
 
@@ -21,9 +21,33 @@ class IInventory(Protocol):
         """Elimina una cantidad de gemas del inventario; elimina el nodo si llega a cero."""
         ...
 
+    def apply(self, costs: Dict[int, int] = None, gains: Dict[int, int] = None) -> bool:
+        """Quita `costs` y añade `gains` ({poder: cantidad}) de forma atómica; False si faltan gemas."""
+        ...
+
+    def take_changes(self) -> Dict[int, int]:
+        """Devuelve el cambio neto {poder: delta} desde la última llamada y lo reinicia."""
+        ...
+
+    def clear(self) -> None:
+        """Vacía el inventario."""
+        ...
+
+    def load_sorted(self, records: List[Tuple[int, int]]) -> None:
+        """Reemplaza el contenido por [(poder, cantidad)] en orden creciente de poder."""
+        ...
+
     def inorder(self) -> List[Node]:
         """Devuelve los nodos en orden ascendente según poder."""
         ...
         
     def preorder(self) -> List[Node]:
+        ...
+
+    def total_value(self) -> int:
+        """Devuelve la suma de poder × cantidad de todas las gemas."""
+        ...
+
+    def random_node(self, rng=None, weighted: bool = False) -> Optional[Node]:
+        """Devuelve un nodo al azar (uniforme, o ponderado por cantidad) o None si está vacío."""
         ...
\ No newline at end of file
@@ -19,6 +19,11 @@ class IMap(ABC):
         """Recoge la gema en la posición (x, y) si existe, y la elimina del mapa."""
         pass
 
+    @abstractmethod
+    def query_region(self, x0: int, y0: int, x1: int, y1: int, kinds=("gems", "chests", "portals")) -> dict:
+        """Devuelve las gemas, cofres y portales dentro del rectángulo [x0, x1] x [y0, y1]."""
+        pass
+
     @abstractmethod
     def interact_with_chest(self, player) -> dict | None:
         """Interactúa con un cofre en la posición del jugador, devolviendo el resultado."""
@@ -1,34 +1,40 @@
+import random
 from core.binary_node import Node
 from core.interfaces.i_inventory import IInventory
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
 class Inventory(IInventory):
-    """BST que almacena gemas por su poder (clave)."""
+    """
+    BST que almacena gemas por su poder (clave).
+    Internamente se accede a los atributos del nodo directamente; los
+    getters/setters de Node quedan para el código externo.
+    Lleva además el cambio neto por poder desde el último take_changes(),
+    que InventoryManager usa para guardar solo lo que cambió.
+    """
 
     def __init__(self):
         self.root: Optional[Node] = None
+        self.changes: Dict[int, int] = {}
 
     # -------------------
     # Implementación de IInventory
     # -------------------
     def insert(self, poder: int, cantidad: int = 1) -> None:
-        node = self.search(poder)
-        if node:
-            node.setCantidad(node.getCantidad() + cantidad)
-        else:
-            self.root = self._insert_recursive(self.root, poder, cantidad)
+        self._record_change(poder, cantidad)
+        # _insert_recursive ya suma la cantidad si el poder existe: un solo recorrido
+        self.root = self._insert_recursive(self.root, poder, cantidad)
 
     def _insert_recursive(self, current, poder, cantidad):
         if current is None:
             new_node = Node(poder)
-            new_node.setCantidad(cantidad)
+            new_node.cantidad = cantidad
             return new_node
         if poder < current.poder:
-            current.setLeft(self._insert_recursive(current.getLeft(), poder, cantidad))
+            current.left = self._insert_recursive(current.left, poder, cantidad)
         elif poder > current.poder:
-            current.setRight(self._insert_recursive(current.getRight(), poder, cantidad))
+            current.right = self._insert_recursive(current.right, poder, cantidad)
         else:
-            current.setCantidad(current.getCantidad() + cantidad)
+            current.cantidad += cantidad
         return current
 
     def search(self, poder: int) -> Optional[Node]:
@@ -40,47 +46,139 @@ class Inventory(IInventory):
         if node.poder == poder:
             return node
         elif poder < node.poder:
-            return self._search_recursive(node.getLeft(), poder)
+            return self._search_recursive(node.left, poder)
         else:
-            return self._search_recursive(node.getRight(), poder)
+            return self._search_recursive(node.right, poder)
 
     def delete(self, poder: int, cantidad: int = 1) -> None:
+        node = self.search(poder)
+        if node:
+            self._record_change(poder, -min(cantidad, node.cantidad))
         self.root = self._delete_recursive(self.root, poder, cantidad)
 
     def _delete_recursive(self, node, poder, cantidad):
         if node is None:
             return None
         if poder < node.poder:
-            node.setLeft(self._delete_recursive(node.getLeft(), poder, cantidad))
+            node.left = self._delete_recursive(node.left, poder, cantidad)
         elif poder > node.poder:
-            node.setRight(self._delete_recursive(node.getRight(), poder, cantidad))
+            node.right = self._delete_recursive(node.right, poder, cantidad)
         else:
             # Reducir cantidad si es mayor a la que se desea eliminar
             if node.cantidad > cantidad:
-                node.setCantidad(node.cantidad - cantidad)
+                node.cantidad -= cantidad
                 return node
             # Si no hay hijo izquierdo
-            if node.getLeft() is None:
-                return node.getRight()
+            if node.left is None:
+                return node.right
             # Si no hay hijo derecho
-            if node.getRight() is None:
-                return node.getLeft()
+            if node.right is None:
+                return node.left
             # Encontrar sucesor y reemplazar
-            successor = self._min_value_node(node.getRight())
+            successor = self._min_value_node(node.right)
             node.poder = successor.poder
-            node.nombre = getattr(successor, "nombre", None)
             node.cantidad = successor.cantidad
-            node.setRight(self._delete_recursive(node.getRight(), successor.poder, successor.cantidad))
+            node.right = self._delete_recursive(node.right, successor.poder, successor.cantidad)
         return node
 
+    def apply(self, costs: Dict[int, int] = None, gains: Dict[int, int] = None) -> bool:
+        """
+        Aplica un cambio de inventario completo de forma atómica:
+        - Una sola búsqueda por poder: comprueba que haya gemas suficientes para
+          todos los costes y guarda el nodo encontrado (y su camino en el AVL).
+        - El cambio neto por poder (costes y ganancias del mismo poder se compensan)
+          se suma directamente en esos nodos; solo crear un poder nuevo o eliminar
+          uno que llega a cero vuelve a recorrer el árbol (insert / delete).
+        - Si algo falla a mitad, deshace lo aplicado y relanza el error.
+        Devuelve False (sin tocar nada) si faltan gemas.
+        """
+        costs = costs or {}
+        gains = gains or {}
+        changes = {}
+        for poder, cantidad in costs.items():
+            changes[poder] = changes.get(poder, 0) - cantidad
+        for poder, cantidad in gains.items():
+            changes[poder] = changes.get(poder, 0) + cantidad
+
+        in_place, structural = [], []
+        for poder in sorted(changes):
+            node, path = self._locate(poder)
+            cost = costs.get(poder, 0)
+            if cost > 0 and (node is None or node.cantidad < cost):
+                return False
+            delta = changes[poder]
+            if not delta:
+                continue
+            if node is not None and node.cantidad + delta > 0:
+                in_place.append((node, path, delta))
+            else:
+                structural.append((poder, delta))
+
+        # Primero los cambios en sitio: los caminos valen mientras no cambie la forma del árbol
+        applied = []
+        try:
+            for node, path, delta in in_place:
+                self._record_change(node.poder, delta)
+                self._adjust(node, path, delta)
+                applied.append((node.poder, delta))
+            for poder, delta in structural:
+                if delta > 0:
+                    self.insert(poder, delta)
+                else:
+                    self.delete(poder, -delta)
+                applied.append((poder, delta))
+        except Exception:
+            for poder, delta in reversed(applied):
+                if delta > 0:
+                    self.delete(poder, delta)
+                else:
+                    self.insert(poder, -delta)
+            raise
+        return True
+
+    def _locate(self, poder: int) -> Tuple[Optional[Node], Optional[List[Node]]]:
+        """Nodo del poder (o None) y el camino que necesita _adjust; el BST no lo usa."""
+        return self.search(poder), None
+
+    def _adjust(self, node: Node, path: Optional[List[Node]], delta: int) -> None:
+        """Suma `delta` a la cantidad de un nodo que sigue en el árbol (sin cambiar su forma)."""
+        node.cantidad += delta
+
+    # -------------------
+    # Cambios y carga
+    # -------------------
+    def _record_change(self, poder: int, delta: int) -> None:
+        delta += self.changes.get(poder, 0)
+        if delta:
+            self.changes[poder] = delta
+        else:
+            self.changes.pop(poder, None)
+
+    def take_changes(self) -> Dict[int, int]:
+        """Devuelve {poder: delta} desde la última llamada y empieza a contar de cero."""
+        changes, self.changes = self.changes, {}
+        return changes
+
+    def clear(self) -> None:
+        """Vacía el inventario y olvida los cambios pendientes."""
+        self.root = None
+        self.changes = {}
+
+    def load_sorted(self, records: List[Tuple[int, int]]) -> None:
+        """Reemplaza el contenido por `records` [(poder, cantidad)] sin registrar cambios."""
+        self.clear()
+        for poder, cantidad in records:
+            self.insert(poder, cantidad)
+        self.changes = {}
+
     # -------------------
     # Método auxiliar
     # -------------------
     def _min_value_node(self, node):
         """Devuelve el nodo con menor poder en el subárbol dado."""
         current = node
-        while current.getLeft():
-            current = current.getLeft()
+        while current.left:
+            current = current.left
         return current
 
     # -------------------
@@ -93,9 +191,9 @@ class Inventory(IInventory):
 
     def _inorder_recursive(self, node, elements: List[Node]):
         if node:
-            self._inorder_recursive(node.getLeft(), elements)
+            self._inorder_recursive(node.left, elements)
             elements.append(node)
-            self._inorder_recursive(node.getRight(), elements)
+            self._inorder_recursive(node.right, elements)
 
     def preorder(self) -> List[str]:
         result = []
@@ -104,9 +202,9 @@ class Inventory(IInventory):
 
     def _preorder_recursive(self, node, result: List[str]):
         if node:
-            result.append(f"{node.poder};{node.getCantidad()}")
-            self._preorder_recursive(node.getLeft(), result)
-            self._preorder_recursive(node.getRight(), result)
+            result.append(f"{node.poder};{node.cantidad}")
+            self._preorder_recursive(node.left, result)
+            self._preorder_recursive(node.right, result)
 
     # -------------------
     # Métodos adicionales
@@ -115,16 +213,16 @@ class Inventory(IInventory):
         current = self.root
         if not current:
             return None
-        while current.getRight():
-            current = current.getRight()
+        while current.right:
+            current = current.right
         return current
 
     def min_value(self) -> Optional[Node]:
         current = self.root
         if not current:
             return None
-        while current.getLeft():
-            current = current.getLeft()
+        while current.left:
+            current = current.left
         return current
 
     def successor(self, poder: int) -> Optional[Node]:
@@ -133,18 +231,36 @@ class Inventory(IInventory):
         while node:
             if poder < node.poder:
                 succ = node
-                node = node.getLeft()
+                node = node.left
             else:
-                node = node.getRight()
+                node = node.right
         return succ
 
+    def __len__(self) -> int:
+        """Número de poderes distintos (recorre todo el árbol)."""
+        return len(self.inorder())
+
+    def total_value(self) -> int:
+        """Suma de poder × cantidad (recorre todo el árbol)."""
+        return sum(node.poder * node.cantidad for node in self.inorder())
+
+    def random_node(self, rng: random.Random = None, weighted: bool = False) -> Optional[Node]:
+        """Nodo al azar, uniforme o ponderado por cantidad (construye la lista inorder)."""
+        rng = rng or random
+        nodes = self.inorder()
+        if not nodes:
+            return None
+        if weighted:
+            return rng.choices(nodes, weights=[node.cantidad for node in nodes])[0]
+        return rng.choice(nodes)
+
     def predecessor(self, poder: int) -> Optional[Node]:
         pred = None
         node = self.root
         while node:
             if poder > node.poder:
                 pred = node
-                node = node.getRight()
+                node = node.right
             else:
-                node = node.getLeft()
+                node = node.left
         return pred
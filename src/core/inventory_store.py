@@ -0,0 +1,214 @@
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ====================
+# Formato binario (little-endian)
+# ====================
+# Instantánea (.bin):
+#   cabecera  magic "GRINV" | versión u8 | generación u64 | registros u32
+#   registros poder i64 | cantidad i64   (orden creciente de poder)
+#   cola      crc32 u32 de cabecera + registros
+# Diario (.journal):
+#   cabecera  magic "GRJNL" | versión u8 | generación u64
+#   registros poder i64 | delta i64 | crc32 u32 del propio registro
+SNAPSHOT_MAGIC = b"GRINV"
+JOURNAL_MAGIC = b"GRJNL"
+FORMAT_VERSION = 1
+
+_SNAPSHOT_HEADER = struct.Struct("<5sBQI")
+_JOURNAL_HEADER = struct.Struct("<5sBQ")
+_RECORD = struct.Struct("<qq")
+_JOURNAL_RECORD = struct.Struct("<qqI")
+_CRC = struct.Struct("<I")
+
+Record = Tuple[int, int]
+
+
+class InventoryStore:
+    """
+    Persistencia binaria del inventario: una instantánea más un diario de cambios.
+    - La instantánea guarda (poder, cantidad) en registros de ancho fijo con crc32
+      y se escribe en un temporal que luego sustituye al archivo (os.replace).
+    - El diario solo recibe los cambios netos desde el último guardado, así que
+      guardar cuesta O(cambios) y no O(inventario).
+    - Ambos llevan un número de generación: un diario de otra generación (p. ej.
+      si el proceso murió entre escribir la instantánea y vaciar el diario) se ignora.
+    - Un registro del diario cortado o con crc incorrecto marca el final válido:
+      lo que viene detrás se descarta y se trunca en la siguiente escritura.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: str, legacy_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.legacy_path = legacy_path
+        self.generation = 0
+        self.journal_records = 0
+        self.journal_end = 0
+
+    # ====================
+    # Lectura
+    # ====================
+    def load(self) -> Dict[int, int]:
+        """
+        Devuelve {poder: cantidad} aplicando el diario sobre la instantánea.
+        Si solo existe el guardado de texto antiguo, lo importa a binario.
+        """
+        if not os.path.exists(self.snapshot_path):
+            if self.legacy_path and os.path.exists(self.legacy_path):
+                return self.import_legacy()
+            self.generation = 0
+            self._reset_journal_state()
+            return {}
+
+        self.generation, records = self._read_snapshot()
+        inventory = dict(records)
+        for poder, delta in self._read_journal():
+            cantidad = inventory.get(poder, 0) + delta
+            if cantidad > 0:
+                inventory[poder] = cantidad
+            else:
+                inventory.pop(poder, None)
+        return inventory
+
+    def _read_snapshot(self) -> Tuple[int, List[Record]]:
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+        if len(data) < _SNAPSHOT_HEADER.size + _CRC.size:
+            raise ValueError("Instantánea de inventario truncada")
+        magic, version, generation, count = _SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Formato de inventario desconocido")
+        end = _SNAPSHOT_HEADER.size + count * _RECORD.size
+        if len(data) != end + _CRC.size or _CRC.unpack_from(data, end)[0] != zlib.crc32(data[:end]):
+            raise ValueError("Instantánea de inventario corrupta")
+        records = list(_RECORD.iter_unpack(data[_SNAPSHOT_HEADER.size:end]))
+        return generation, records
+
+    def _read_journal(self) -> List[Record]:
+        """Registros válidos del diario de la generación actual."""
+        self._reset_journal_state()
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        if len(data) < _JOURNAL_HEADER.size:
+            return []
+        magic, version, generation = _JOURNAL_HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC or version != FORMAT_VERSION or generation != self.generation:
+            return []
+
+        records = []
+        offset = _JOURNAL_HEADER.size
+        while offset + _JOURNAL_RECORD.size <= len(data):
+            poder, delta, crc = _JOURNAL_RECORD.unpack_from(data, offset)
+            if crc != zlib.crc32(data[offset:offset + _RECORD.size]):
+                break
+            records.append((poder, delta))
+            offset += _JOURNAL_RECORD.size
+        self.journal_records = len(records)
+        self.journal_end = offset
+        return records
+
+    def _disk_generation(self) -> int:
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                header = f.read(_SNAPSHOT_HEADER.size)
+        except FileNotFoundError:
+            return 0
+        if len(header) < _SNAPSHOT_HEADER.size:
+            return 0
+        return _SNAPSHOT_HEADER.unpack(header)[2]
+
+    def has_snapshot(self) -> bool:
+        return os.path.exists(self.snapshot_path)
+
+    def has_data(self) -> bool:
+        """True si hay algo guardado con contenido (solo lee cabeceras)."""
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                header = f.read(_SNAPSHOT_HEADER.size)
+        except FileNotFoundError:
+            return bool(self.legacy_path) and os.path.exists(self.legacy_path) \
+                and os.path.getsize(self.legacy_path) > 0
+        if len(header) == _SNAPSHOT_HEADER.size and _SNAPSHOT_HEADER.unpack(header)[3] > 0:
+            return True
+        # Instantánea vacía: puede haber gemas en el diario
+        return os.path.exists(self.journal_path) and \
+            os.path.getsize(self.journal_path) >= _JOURNAL_HEADER.size + _JOURNAL_RECORD.size
+
+    # ====================
+    # Escritura
+    # ====================
+    def append(self, changes: Dict[int, int]) -> None:
+        """Añade al diario los cambios netos {poder: delta}; O(cambios)."""
+        changes = {poder: delta for poder, delta in changes.items() if delta}
+        if not changes:
+            return
+        if self.journal_end == 0:
+            self._write_journal_header()
+
+        payload = bytearray()
+        for poder in sorted(changes):
+            record = _RECORD.pack(poder, changes[poder])
+            payload += record + _CRC.pack(zlib.crc32(record))
+        with open(self.journal_path, "r+b") as f:
+            # Lo que hubiera tras el último registro válido (escritura cortada) se pisa
+            f.seek(self.journal_end)
+            f.write(payload)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_end += len(payload)
+        self.journal_records += len(changes)
+
+    def compact(self, records: Iterable[Record]) -> None:
+        """
+        Escribe una instantánea nueva con `records` (poder creciente) y vacía el diario.
+        La generación sube antes de vaciar el diario: si el proceso muere entre
+        medias, el diario viejo queda huérfano y load() lo ignora.
+        """
+        records = list(records)
+        # La generación en disco puede ser mayor si este almacén no leyó el guardado
+        generation = max(self.generation, self._disk_generation()) + 1
+        data = bytearray(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, generation, len(records)))
+        for poder, cantidad in records:
+            data += _RECORD.pack(poder, cantidad)
+        data += _CRC.pack(zlib.crc32(data))
+        self._write_atomic(self.snapshot_path, bytes(data))
+        self.generation = generation
+        self._write_journal_header()
+
+    def import_legacy(self) -> Dict[int, int]:
+        """Lee el guardado de texto (poder;cantidad por línea) y lo pasa a binario."""
+        inventory: Dict[int, int] = {}
+        with open(self.legacy_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    power_str, qty_str = line.split(";")
+                    poder = int(power_str)
+                    inventory[poder] = inventory.get(poder, 0) + int(qty_str)
+        self.compact(sorted(inventory.items()))
+        return inventory
+
+    def _write_journal_header(self) -> None:
+        self._write_atomic(self.journal_path, _JOURNAL_HEADER.pack(JOURNAL_MAGIC, FORMAT_VERSION, self.generation))
+        self.journal_records = 0
+        self.journal_end = _JOURNAL_HEADER.size
+
+    def _reset_journal_state(self) -> None:
+        self.journal_records = 0
+        self.journal_end = 0
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Escritura a temporal + fsync + rename: el archivo nunca queda a medias."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
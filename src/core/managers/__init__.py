@@ -1,6 +1,8 @@
+from core.managers.autosave_manager import AutosaveManager
 from core.managers.chest_manager import ChestManager
+from core.managers.chunk_residency_manager import ChunkResidencyManager
 from core.managers.gem_manager import GemManager
 from core.managers.inventory_manager import InventoryManager
 from core.managers.portal_manager import PortalManager
 
-__all__ = ["ChestManager", "GemManager", "InventoryManager", "PortalManager"]
\ No newline at end of file
+__all__ = ["AutosaveManager", "ChestManager", "ChunkResidencyManager", "GemManager", "InventoryManager", "PortalManager"]
\ No newline at end of file
@@ -0,0 +1,159 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from core.world_file import WorldWriter
+
+class AutosaveManager:
+    """
+    Autoguardado en segundo plano de inventario y mundo:
+    - En el hilo principal solo se toma una instantánea de lo que cambió
+      (take_changes del inventario y take_dirty_records del mapa): O(cambios).
+    - Un hilo escritor serializa, escribe y hace fsync; el frame nunca espera.
+      El mundo se guarda con WorldWriter: solo se añaden al diario los registros
+      de los chunks que cambiaron, y de vez en cuando se compacta.
+    - Las peticiones se agrupan: si llegan varias mientras se escribe, se
+      fusionan en una sola escritura (los deltas de inventario se suman y los
+      registros de chunk más recientes sustituyen a los anteriores).
+    - Disparadores: cada `interval` segundos y, con `debounce` segundos de
+      margen, tras los eventos de `triggers` (cofre abierto, portal activado, pausa).
+    - flush() espera a que termine lo pendiente; shutdown() además para el hilo.
+    """
+
+    def __init__(self, inventory_manager, game_map, player, world_path: str,
+                 interval: float = 60.0, debounce: float = 1.0, triggers: Iterable[str] = ("chest", "portal", "pause"),
+                 clock: Callable[[], float] = time.monotonic):
+        self.inventory_manager = inventory_manager
+        self.game_map = game_map
+        self.player = player
+        self.world_path = world_path
+        self.interval = interval
+        self.debounce = debounce
+        self.triggers = set(triggers)
+        self.clock = clock
+
+        self.next_periodic = clock() + interval
+        self.due: Optional[float] = None
+        # Partida nueva: el primer guardado sustituye al mundo guardado anterior
+        self.world_writer = WorldWriter(world_path, game_map.chunk_size, game_map.seed,
+                                        fresh=game_map.world_file is None)
+
+        # Estado compartido con el hilo escritor
+        self._condition = threading.Condition()
+        self._pending: Optional[dict] = None
+        self._writing = False
+        self._stopping = False
+        # Registros de un guardado fallido, pendientes de reintentar; solo los toca el hilo escritor
+        self._unsaved: Dict[Tuple[int, int], bytes] = {}
+
+        # Contadores
+        self.requests = 0
+        self.saves = 0
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+        self._unreported: Optional[Exception] = None  # lo recoge take_error()
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    # ====================
+    # Disparadores (hilo principal)
+    # ====================
+    def notify(self, event: str) -> None:
+        """Avisa de un evento de juego; los de `triggers` programan un guardado."""
+        if event in self.triggers:
+            due = self.clock() + self.debounce
+            self.due = due if self.due is None else min(self.due, due)
+
+    def update(self) -> None:
+        """Llamar una vez por frame: lanza el guardado si toca."""
+        now = self.clock()
+        if now >= self.next_periodic or (self.due is not None and now >= self.due):
+            self.save_now()
+
+    def save_now(self) -> None:
+        """Toma la instantánea de cambios y la encarga al hilo escritor sin esperar."""
+        self.due = None
+        self.next_periodic = self.clock() + self.interval
+        snapshot = {
+            "inventory": self.inventory_manager.inventory.take_changes(),
+            "world": self.game_map.take_dirty_records(),
+            "player": (self.player.x, self.player.y),
+        }
+        with self._condition:
+            pending = self._pending
+            if pending is None:
+                self._pending = snapshot
+            else:
+                changes = pending["inventory"]
+                for poder, delta in snapshot["inventory"].items():
+                    changes[poder] = changes.get(poder, 0) + delta
+                pending["world"].update(snapshot["world"])
+                pending["player"] = snapshot["player"]
+            self.requests += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> Optional[Exception]:
+        """
+        Espera a que se escriba todo lo pendiente y devuelve el error de escritura
+        aún no comunicado (None si todo se guardó). TimeoutError si vence el timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout):
+                raise TimeoutError("El autoguardado no terminó a tiempo")
+        return self.take_error()
+
+    def shutdown(self) -> Optional[Exception]:
+        """Escribe lo pendiente, detiene el hilo escritor y devuelve el error no comunicado."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join()
+        return self.take_error()
+
+    def take_error(self) -> Optional[Exception]:
+        """Devuelve y olvida el último error de escritura que aún no se ha comunicado."""
+        with self._condition:
+            error, self._unreported = self._unreported, None
+        return error
+
+    # ====================
+    # Hilo escritor
+    # ====================
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._stopping)
+                if self._pending is None:
+                    return
+                snapshot, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._write(snapshot)
+                self.saves += 1
+            except Exception as error:
+                # El inventario recompacta en el siguiente guardado; los registros del
+                # mundo que no se escribieron se reintentan con el siguiente
+                self.errors += 1
+                self.last_error = error
+                with self._condition:
+                    self._unreported = error
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, snapshot: dict) -> None:
+        records, self._unsaved = self._unsaved, {}
+        records.update(snapshot["world"])
+        try:
+            self.inventory_manager.write_changes(snapshot["inventory"])
+        finally:
+            try:
+                self.world_writer.write(records, snapshot["player"])
+            except Exception:
+                self._unsaved = records
+                raise
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "saves": self.saves, "errors": self.errors,
+                "compactions": self.world_writer.compactions}
@@ -1,8 +1,12 @@
 import random
-from collections import defaultdict
 from factories import ChestFactory
+from core.chunk import Chunk
 from core.interfaces.i_chest import IChest
-from typing import List, Optional, Tuple
+from resources.tile_data import TILE_CLEAR
+from typing import Dict, Iterator, Optional, Tuple
+from generators.placement import bernoulli_positions
+
+ChestChunk = Dict[Tuple[int, int], IChest]
 
 class ChestManager:
     """
@@ -10,28 +14,49 @@ class ChestManager:
     - Los cofres solo se generan en tiles CLEAR.
     - Evita superposición con otros cofres.
     - Usa ChestFactory para generar cofres (devuelve IChest).
+    - Índice disperso: cada chunk guarda un dict {(local_x, local_y): cofre}.
     """
+    CHEST_PROBABILITY = 0.005  # probabilidad de cofre por casilla de claro
 
-    def __init__(self, chunk_size: int, chest_probability: float = 0.005, drop_prob: float = 0.5):
+    def __init__(self, chunk_size: int, chest_probability: float = None, loot_table: str = "chest"):
         self.chunk_size = chunk_size
-        self.chests: defaultdict[int, defaultdict[int, List[List[Optional[IChest]]]]] = \
-            defaultdict(lambda: defaultdict(lambda: None))
-        self.chest_probability = chest_probability
-        self.chest_factory = ChestFactory(drop_prob)
+        self.chests: Dict[Tuple[int, int], ChestChunk] = {}
+        self.chest_probability = self.CHEST_PROBABILITY if chest_probability is None else chest_probability
+        self.chest_factory = ChestFactory(loot_table)
 
-    def place_chests_in_chunk(self, chunk_x: int, chunk_y: int, chunk: List[List[Tuple]]):
+    def place_chests_in_chunk(self, chunk_x: int, chunk_y: int, chunk: Chunk, rng: random.Random = None):
         """Genera cofres dentro de un chunk dado, solo en tiles CLEAR."""
-        # Inicializamos la matriz de cofres
-        self.chests[chunk_y][chunk_x] = [[None for _ in range(self.chunk_size)] for _ in range(self.chunk_size)]
+        self.chests[(chunk_x, chunk_y)] = self.generate_chests(chunk, rng)
 
-        for y in range(self.chunk_size):
-            for x in range(self.chunk_size):
-                if chunk[y][x][0] == "CLEAR" and random.random() < self.chest_probability:
-                    self.chests[chunk_y][chunk_x][y][x] = self.chest_factory.create_chest()
+    def generate_chests(self, chunk: Chunk, rng: random.Random = None) -> ChestChunk:
+        """Genera los cofres de un chunk sin registrarlos (seguro desde otros hilos)."""
+        rng = rng or random
+        return {
+            position: self.chest_factory.create_chest(rng=rng)
+            for position in bernoulli_positions(chunk, TILE_CLEAR, self.chest_probability, rng)
+        }
 
     def get_chest(self, chunk_x: int, chunk_y: int, local_x: int, local_y: int) -> Optional[IChest]:
         """Devuelve el cofre en una posición local dentro del chunk, o None."""
-        chest_chunk = self.chests.get(chunk_y, {}).get(chunk_x)
-        if chest_chunk:
-            return chest_chunk[local_y][local_x]
-        return None
\ No newline at end of file
+        chest_chunk = self.chests.get((chunk_x, chunk_y))
+        return chest_chunk.get((local_x, local_y)) if chest_chunk else None
+
+    def iter_chunk(self, chunk_x: int, chunk_y: int) -> Iterator[Tuple[int, int, IChest]]:
+        """Itera (local_x, local_y, cofre) de los cofres de un chunk."""
+        chest_chunk = self.chests.get((chunk_x, chunk_y))
+        if not chest_chunk:
+            return
+        for (local_x, local_y), chest in chest_chunk.items():
+            yield local_x, local_y, chest
+
+    # -------------------------
+    # Residencia de chunks
+    # -------------------------
+    def pop_chunk(self, chunk_x: int, chunk_y: int) -> Optional[ChestChunk]:
+        """Quita y devuelve los cofres de un chunk (para desalojarlo de memoria)."""
+        return self.chests.pop((chunk_x, chunk_y), None)
+
+    def restore_chunk(self, chunk_x: int, chunk_y: int, chest_chunk: Optional[ChestChunk]):
+        """Reinstala los cofres de un chunk previamente desalojado."""
+        if chest_chunk is not None:
+            self.chests[(chunk_x, chunk_y)] = chest_chunk
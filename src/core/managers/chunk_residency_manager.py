@@ -0,0 +1,126 @@
+from typing import Optional
+from core.chunk import Chunk
+from core.chunk_store import ChunkStore
+
+class ChunkResidencyManager:
+    """
+    Mantiene en memoria solo los chunks cercanos al jugador:
+    - El working set es el cuadrado de `radius` chunks alrededor del foco.
+    - Por defecto desalojar un chunk solo vuelca su estado al delta log del mapa:
+      al volver a pedirlo se regenera desde la semilla del mundo.
+    - Con un ChunkStore, los chunks lejanos (tiles + gemas + cofres + portal) se escriben
+      además a disco; el delta del chunk se vuelca al delta log en ambos casos.
+    - Un chunk desalojado se recarga de forma transparente al volver a pedirlo.
+    - Lleva contadores de hits/misses/desalojos para dimensionar la ventana.
+    """
+
+    def __init__(self, game_map, radius: int = 3, store: Optional[ChunkStore] = None):
+        self.game_map = game_map
+        self.radius = radius
+        self.store = store
+        self.focus = None
+        self.evicted = set()
+
+        # Contadores
+        self.hits = 0          # chunk pedido y ya residente
+        self.misses = 0        # chunk pedido y recargado (disco o regeneración)
+        self.generated = 0     # chunk pedido por primera vez
+        self.evictions = 0     # chunks desalojados de memoria
+
+    # ====================
+    # Accesos
+    # ====================
+    def is_evicted(self, chunk_x: int, chunk_y: int) -> bool:
+        return (chunk_x, chunk_y) in self.evicted
+
+    def record_hit(self):
+        self.hits += 1
+
+    def record_generated(self):
+        self.generated += 1
+
+    # ====================
+    # Desalojo y recarga
+    # ====================
+    def set_focus(self, chunk_x: int, chunk_y: int) -> None:
+        """Actualiza el centro del working set y desaloja los chunks fuera de la ventana."""
+        if self.focus == (chunk_x, chunk_y):
+            return
+        self.focus = (chunk_x, chunk_y)
+        far = [
+            key for key in self.game_map.chunks
+            if max(abs(key[0] - chunk_x), abs(key[1] - chunk_y)) > self.radius
+        ]
+        for key in far:
+            self.evict(*key)
+
+    def evict(self, chunk_x: int, chunk_y: int) -> None:
+        game_map = self.game_map
+        chunk = game_map.chunks.pop((chunk_x, chunk_y), None)
+        if chunk is None:
+            return
+        self.evicted.add((chunk_x, chunk_y))
+        self.evictions += 1
+        # El delta log queda completo también con ChunkStore: lo usan el guardado
+        # del mundo (take_dirty_records) y la recarga si falta el archivo del chunk
+        game_map.capture_chunk_delta(chunk_x, chunk_y)
+
+        if self.store is None:
+            # Mundo determinista: basta con conservar el delta del chunk
+            game_map.gem_manager.pop_chunk(chunk_x, chunk_y)
+            game_map.chest_manager.pop_chunk(chunk_x, chunk_y)
+            game_map.portal_manager.pop_chunk(chunk_x, chunk_y)
+            return
+
+        state = {
+            "tiles": chunk.to_bytes(),
+            "gems": game_map.gem_manager.pop_chunk(chunk_x, chunk_y),
+            "chests": game_map.chest_manager.pop_chunk(chunk_x, chunk_y),
+            "portal": game_map.portal_manager.pop_chunk(chunk_x, chunk_y),
+        }
+        self.store.save(chunk_x, chunk_y, state)
+
+    def adopt(self, chunk_x: int, chunk_y: int) -> bool:
+        """
+        Deja de tratar como desalojado un chunk que el prefetcher ya regeneró (solo
+        sin ChunkStore). True si estaba desalojado; el mapa lo instala con su delta.
+        """
+        key = (chunk_x, chunk_y)
+        if self.store is not None or key not in self.evicted:
+            return False
+        self.evicted.discard(key)
+        return True
+
+    def reload(self, chunk_x: int, chunk_y: int) -> Optional[Chunk]:
+        """Recupera un chunk desalojado y lo reinstala en el mapa y sus managers."""
+        key = (chunk_x, chunk_y)
+        if key not in self.evicted:
+            return None
+        self.evicted.discard(key)
+        game_map = self.game_map
+
+        if self.store is None:
+            self.misses += 1
+            return game_map.generate_chunk(chunk_x, chunk_y)
+
+        state = self.store.load(chunk_x, chunk_y)
+        self.misses += 1
+        if state is None:
+            # Sin archivo en disco se regenera con el delta log: cofres y portal siguen como estaban
+            return game_map.generate_chunk(chunk_x, chunk_y)
+        return game_map.restore_chunk_state(chunk_x, chunk_y, state)
+
+    # ====================
+    # Estadísticas
+    # ====================
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "resident": len(self.game_map.chunks),
+            "evicted": len(self.evicted),
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 1.0,
+        }
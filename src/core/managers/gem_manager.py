@@ -1,37 +1,65 @@
 import random
-from collections import defaultdict
+from typing import Dict, Tuple
+from core.chunk import Chunk
+from generators.placement import bernoulli_positions
+from resources.gem_registry import GEM_REGISTRY, GemRegistry
+from resources.tile_data import TILE_GRASS
+
+GemChunk = Dict[Tuple[int, int], int]
 
 class GemManager:
-    def __init__(self, chunk_size, gem_values=None, gem_probability=0.005):
+    """
+    Gestiona las gemas del mapa con un índice disperso:
+    - Cada chunk guarda un dict {(local_x, local_y): valor} solo con las gemas que tiene.
+    - Los chunks se indexan por (chunk_x, chunk_y), como Map.chunks.
+    """
+    GEM_PROBABILITY = 0.005  # probabilidad de gema por casilla de hierba
+
+    def __init__(self, chunk_size, gem_values=None, gem_probability=None, registry: GemRegistry = GEM_REGISTRY):
         self.chunk_size = chunk_size
-        self.gems = defaultdict(lambda: defaultdict(lambda: None))
+        self.gems: Dict[Tuple[int, int], GemChunk] = {}
         self.gem_values = gem_values or [5, 10, 15, 20, 30]
-        self.gem_colors = {
-            5: (0, 255, 255),
-            10: (0, 255, 0),
-            15: (255, 255, 0),
-            20: (255, 165, 0),
-            30: (255, 0, 0)
-        }
-        self.gem_probability = gem_probability
+        self.registry = registry
+        self.gem_probability = self.GEM_PROBABILITY if gem_probability is None else gem_probability
 
-    def place_gems_in_chunk(self, chunk_x, chunk_y, chunk):
-        if self.gems[chunk_y][chunk_x] is not None:
+    def place_gems_in_chunk(self, chunk_x, chunk_y, chunk: Chunk, rng: random.Random = None):
+        if (chunk_x, chunk_y) in self.gems:
             return
-        self.gems[chunk_y][chunk_x] = [[None for _ in range(self.chunk_size)] for _ in range(self.chunk_size)]
-        for y in range(self.chunk_size):
-            for x in range(self.chunk_size):
-                if chunk[y][x][0] == "GRASS" and random.random() < self.gem_probability:
-                    self.gems[chunk_y][chunk_x][y][x] = random.choice(self.gem_values)
+        self.gems[(chunk_x, chunk_y)] = self.generate_gems(chunk, rng)
+
+    def generate_gems(self, chunk: Chunk, rng: random.Random = None) -> GemChunk:
+        """Genera las gemas de un chunk sin registrarlas (seguro desde otros hilos)."""
+        rng = rng or random
+        return {
+            position: rng.choice(self.gem_values)
+            for position in bernoulli_positions(chunk, TILE_GRASS, self.gem_probability, rng)
+        }
 
     def get_gem(self, chunk_x, chunk_y, local_x, local_y):
-        return self.gems.get(chunk_y, {}).get(chunk_x, [[None]*self.chunk_size]*self.chunk_size)[local_y][local_x]
+        gem_chunk = self.gems.get((chunk_x, chunk_y))
+        return gem_chunk.get((local_x, local_y)) if gem_chunk else None
+
+    def iter_chunk(self, chunk_x, chunk_y):
+        """Itera (local_x, local_y, valor) de las gemas de un chunk."""
+        gem_chunk = self.gems.get((chunk_x, chunk_y))
+        if not gem_chunk:
+            return
+        for (local_x, local_y), value in gem_chunk.items():
+            yield local_x, local_y, value
 
     def collect_gem(self, chunk_x, chunk_y, local_x, local_y):
-        gem = self.get_gem(chunk_x, chunk_y, local_x, local_y)
-        if gem is not None:
-            self.gems[chunk_y][chunk_x][local_y][local_x] = None
-        return gem
+        gem_chunk = self.gems.get((chunk_x, chunk_y))
+        return gem_chunk.pop((local_x, local_y), None) if gem_chunk else None
 
     def get_gem_color(self, value):
-        return self.gem_colors.get(value, (255, 255, 255))
+        return self.registry.color(value)
+
+    # Residencia de chunks
+    def pop_chunk(self, chunk_x, chunk_y):
+        """Quita y devuelve las gemas de un chunk (para desalojarlo de memoria)."""
+        return self.gems.pop((chunk_x, chunk_y), None)
+
+    def restore_chunk(self, chunk_x, chunk_y, gem_chunk):
+        """Reinstala las gemas de un chunk previamente desalojado."""
+        if gem_chunk is not None:
+            self.gems[(chunk_x, chunk_y)] = gem_chunk
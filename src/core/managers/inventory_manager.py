@@ -1,47 +1,78 @@
 import os
+from typing import Dict
 from core.interfaces.i_inventory import IInventory
+from core.inventory_store import InventoryStore
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
 class InventoryManager:
-    """Maneja la persistencia del inventario del jugador."""
+    """
+    Maneja la persistencia del inventario del jugador sobre InventoryStore:
+    - save() añade al diario solo los cambios desde el último guardado y compacta
+      en una instantánea nueva cuando el diario crece más que el inventario.
+    - `saved` refleja el inventario tal como quedó en el último take_changes(),
+      así que compactar no necesita recorrer el árbol y write_changes() puede
+      ejecutarse en otro hilo (AutosaveManager) con los cambios ya tomados.
+    - El primer guardado de un inventario que no salió de load() (partida nueva)
+      escribe la instantánea completa, pues el diario es relativo a lo guardado.
+    - `filename` es el guardado de texto antiguo: si no hay guardado binario se
+      importa al cargar (el archivo de texto no se toca).
+    """
 
-    def __init__(self, inventory: IInventory, filename: str = "save_inventory.txt"):
+    def __init__(self, inventory: IInventory, filename: str = "save_inventory.txt",
+                 compact_min_records: int = 64):
         self.inventory = inventory
         self.filename = os.path.join(DATA_DIR, filename)
+        base = os.path.splitext(self.filename)[0]
+        self.store = InventoryStore(base + ".bin", base + ".journal", legacy_path=self.filename)
+        self.compact_min_records = compact_min_records
+        self.saved: Dict[int, int] = {}
+        self.synced = False  # True si lo que hay en disco coincide con `saved` antes de los cambios
 
     def save(self):
-        """Guarda el inventario en archivo usando preorder (power;quantity)."""
-        preorder_list = self.inventory.preorder()
-        with open(self.filename, "w") as f:
-            for node_str in preorder_list:
-                f.write(node_str + "\n")
+        """Guarda los cambios pendientes (diario) o una instantánea completa si toca compactar."""
+        self.write_changes(self.inventory.take_changes())
+
+    def write_changes(self, changes: Dict[int, int]):
+        """Escribe en disco cambios ya tomados con take_changes() (no toca el árbol)."""
+        saved = self.saved
+        for poder, delta in changes.items():
+            cantidad = saved.get(poder, 0) + delta
+            if cantidad > 0:
+                saved[poder] = cantidad
+            else:
+                saved.pop(poder, None)
+
+        limit = max(self.compact_min_records, len(saved))
+        if self.synced and self.store.journal_records + len(changes) <= limit:
+            try:
+                self.store.append(changes)
+            except Exception:
+                # El diario puede haber quedado a medias: el siguiente guardado compacta
+                self.synced = False
+                raise
+        else:
+            self.compact()
+
+    def compact(self):
+        """Escribe todo el inventario guardado como instantánea y vacía el diario."""
+        self.synced = False
+        self.store.compact(sorted(self.saved.items()))
+        self.synced = True
 
     def load(self):
-        """Carga el inventario desde archivo. Reinicia el BST antes de cargar."""
-        if hasattr(self.inventory, "root"):
-            self.inventory.root = None  # Reiniciar árbol
-
-        try:
-            with open(self.filename, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        power_str, qty_str = line.split(";")
-                        self.inventory.insert(int(power_str), int(qty_str))
-        except FileNotFoundError:
-            # No existe archivo, inventario queda vacío
-            pass
-        
+        """Carga el inventario (instantánea + diario). Reinicia el árbol antes de cargar."""
+        self.saved = self.store.load()
+        self.inventory.load_sorted(sorted(self.saved.items()))
+        # Sin instantánea en disco no hay base sobre la que aplicar el diario
+        self.synced = self.store.has_snapshot()
+
     def total_value(self) -> int:
         """Devuelve el valor total del inventario: suma de (poder × cantidad) de cada gema."""
-        total = 0
-        for node in self.inventory.inorder():
-            total += node.poder * node.getCantidad()
-        return total
+        return self.inventory.total_value()
 
     def has_saved_inventory(self) -> bool:
-        """Devuelve True si hay un archivo de inventario guardado con contenido."""
-        return os.path.exists(self.filename) and os.path.getsize(self.filename) > 0
\ No newline at end of file
+        """Devuelve True si hay un inventario guardado con contenido."""
+        return self.store.has_data()
@@ -1,7 +1,10 @@
 import random
 from collections import defaultdict
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
+from core.chunk import Chunk
 from core.portal import Portal
+from generators.placement import pick_position
+from resources.tile_data import TILE_CLEAR
 
 class PortalManager:
     def __init__(self, chunk_size: int, portal_probability: float = 1.0):
@@ -10,20 +13,25 @@ class PortalManager:
         self.portals: defaultdict[int, defaultdict[int, Optional[Tuple[int,int,Portal]]]] = \
             defaultdict(lambda: defaultdict(lambda: None))
 
-    def place_portal_in_chunk(self, chunk_x: int, chunk_y: int, chunk: List[List[Tuple]]):
+    def place_portal_in_chunk(self, chunk_x: int, chunk_y: int, chunk: Chunk, rng: random.Random = None):
         if self.portals[chunk_y][chunk_x] is not None:
             return
-        if random.random() < self.portal_probability:
-            clear_positions = [
-                (x, y) for y in range(self.chunk_size) for x in range(self.chunk_size)
-                if chunk[y][x][0] == "CLEAR"
-            ]
-            if clear_positions:
-                x, y = random.choice(clear_positions)
-                self.portals[chunk_y][chunk_x] = (x, y, Portal())
-
-    def try_spawn_portal(self, chunk_x: int, chunk_y: int, chunk: List[List[Tuple]]):
-        self.place_portal_in_chunk(chunk_x, chunk_y, chunk)
+        portal_info = self.generate_portal(chunk, rng)
+        if portal_info:
+            self.portals[chunk_y][chunk_x] = portal_info
+
+    def generate_portal(self, chunk: Chunk, rng: random.Random = None) -> Optional[Tuple[int,int,Portal]]:
+        """Decide el portal de un chunk sin registrarlo (seguro desde otros hilos)."""
+        rng = rng or random
+        if rng.random() < self.portal_probability:
+            position = pick_position(chunk, TILE_CLEAR, rng)
+            if position:
+                x, y = position
+                return (x, y, Portal(rng))
+        return None
+
+    def try_spawn_portal(self, chunk_x: int, chunk_y: int, chunk: Chunk, rng: random.Random = None):
+        self.place_portal_in_chunk(chunk_x, chunk_y, chunk, rng)
 
     def get_portal(self, chunk_x: int, chunk_y: int) -> Optional[Portal]:
         p = self.portals.get(chunk_y, {}).get(chunk_x)
@@ -34,4 +42,19 @@ class PortalManager:
 
     def get_portal_position(self, chunk_x: int, chunk_y: int) -> Optional[Tuple[int,int]]:
         p = self.portals.get(chunk_y, {}).get(chunk_x)
-        return (p[0], p[1]) if p else None
\ No newline at end of file
+        return (p[0], p[1]) if p else None
+
+    def pop_chunk(self, chunk_x: int, chunk_y: int) -> Optional[Tuple[int,int,Portal]]:
+        """Quita y devuelve el portal de un chunk (para desalojarlo de memoria)."""
+        row = self.portals.get(chunk_y)
+        if row is None:
+            return None
+        portal_info = row.pop(chunk_x, None)
+        if not row:
+            del self.portals[chunk_y]
+        return portal_info
+
+    def restore_chunk(self, chunk_x: int, chunk_y: int, portal_info: Optional[Tuple[int,int,Portal]]):
+        """Reinstala el portal de un chunk previamente desalojado."""
+        if portal_info is not None:
+            self.portals[chunk_y][chunk_x] = portal_info
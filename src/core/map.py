@@ -1,29 +1,52 @@
-import random
-from collections import defaultdict
-from views.sprites import TileSpriteFactory, ChestSpriteFactory, PortalSpriteFactory
+from core.chunk import Chunk
+from core.frame_profiler import PROFILER
+from core.world_delta import WorldDeltaLog
+from core.world_file import WorldFile
 from core.managers.gem_manager import GemManager
 from core.managers.chest_manager import ChestManager
 from core.managers.portal_manager import PortalManager
+from core.managers.chunk_residency_manager import ChunkResidencyManager
 from generators import ChunkGenerator
+from generators.chunk_prefetcher import ChunkPrefetcher
+from generators.world_seed import chunk_rng, chunk_variants, new_world_seed, \
+    STREAM_TILES, STREAM_GEMS, STREAM_CHESTS, STREAM_PORTAL
+from resources.tile_data import TILE_TREE, TILE_CLEAR, TILE_NAMES
 
 class Map:
-    def __init__(self, chunk_size, path_width_range=(1, 2), num_tree_variants=4, tile_size=32):
+    def __init__(self, chunk_size, path_width_range=(1, 2), num_tree_variants=4, tile_size=32,
+                 residency_radius=3, chunk_store=None, seed=None, prefetch_workers=0, world_file=None):
         self.chunk_size = chunk_size if chunk_size % 2 == 1 else chunk_size + 1
-        self.chunks = defaultdict(lambda: defaultdict(lambda: None))
+        self.chunks: dict[tuple[int, int], Chunk] = {}
         self.generated_chunks = set()
         self.clear_chunks = set()
         self.clearing_probability = 0.2
         self.path_width_range = path_width_range
         self.num_tree_variants = num_tree_variants
         self.tile_size = tile_size
-        self.tree_variant_map = {}
 
         # ====================
-        # Factories de Sprites
+        # Semilla del mundo: cada chunk se deriva de (seed, chunk_x, chunk_y)
         # ====================
-        self.tile_sprite_factory = TileSpriteFactory(tile_size, num_tree_variants)
-        self.chest_sprite_factory = ChestSpriteFactory(tile_size)
-        self.portal_sprite_factory = PortalSpriteFactory(tile_size)
+        self.seed = seed if seed is not None else new_world_seed()
+        self.delta_log = WorldDeltaLog()
+
+        # ====================
+        # Partida guardada: sus chunks se decodifican al pedirlos por primera vez
+        # ====================
+        self.world_file = world_file
+        self.dirty_chunks = set()  # chunks nuevos o modificados desde el último autoguardado
+        if world_file is not None:
+            if world_file.chunk_size != self.chunk_size:
+                raise ValueError("El mundo guardado usa otro tamaño de chunk")
+            self.seed = world_file.seed
+
+        # ====================
+        # Factories de Sprites (se crean al dibujar por primera vez: el mapa
+        # funciona sin pantalla para simulaciones y tests)
+        # ====================
+        self._tile_sprite_factory = None
+        self._chest_sprite_factory = None
+        self._portal_sprite_factory = None
 
         # ====================
         # Managers
@@ -37,27 +60,57 @@ class Map:
         # ====================
         self.chunk_generator = ChunkGenerator(chunk_size, path_width_range)
 
+        # ====================
+        # Residencia de chunks (working set + caché en disco)
+        # ====================
+        self.residency = ChunkResidencyManager(self, residency_radius, chunk_store)
+
+        # ====================
+        # Pre-generación en segundo plano (opcional)
+        # ====================
+        self.prefetcher = None
+        if prefetch_workers > 0:
+            self.enable_prefetch(prefetch_workers)
+
     # ====================
-    # Constructores de celdas
+    # Factories de sprites (perezosas)
     # ====================
-    def make_tree(self):
-        return ("TREE", random.randint(0, self.num_tree_variants - 1))
+    @property
+    def tile_sprite_factory(self):
+        if self._tile_sprite_factory is None:
+            from views.sprites import TileSpriteFactory
+            self._tile_sprite_factory = TileSpriteFactory(self.tile_size, self.num_tree_variants)
+        return self._tile_sprite_factory
 
-    def make_grass(self):
-        return ("GRASS",)
+    @property
+    def chest_sprite_factory(self):
+        if self._chest_sprite_factory is None:
+            from views.sprites import ChestSpriteFactory
+            self._chest_sprite_factory = ChestSpriteFactory(self.tile_size)
+        return self._chest_sprite_factory
 
-    def make_clear(self):
-        return ("CLEAR",)
+    @property
+    def portal_sprite_factory(self):
+        if self._portal_sprite_factory is None:
+            from views.sprites import PortalSpriteFactory
+            self._portal_sprite_factory = PortalSpriteFactory(self.tile_size)
+        return self._portal_sprite_factory
 
     # ====================
     # Acceso a tiles y sprites
     # ====================
     def get_tile(self, x, y):
-        chunk_x, chunk_y = self.get_chunk_key(x, y)
-        self.ensure_chunk(chunk_x, chunk_y)
-        local_x, local_y = x % self.chunk_size, y % self.chunk_size
-        tile = self.chunks[chunk_y][chunk_x][local_y][local_x]
-        return tile if tile else ("TREE", 0)
+        size = self.chunk_size
+        return self.get_chunk(x // size, y // size).get_tile(x % size, y % size)
+
+    def get_tile_code(self, x, y) -> int:
+        """Devuelve el código entero del tile (ver resources.tile_data)."""
+        size = self.chunk_size
+        chunk_x, chunk_y = x // size, y // size
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.ensure_chunk(chunk_x, chunk_y)
+        return chunk.tiles[(y % size) * size + (x % size)]
 
     def get_sprite(self, x, y):
         # Cofres
@@ -72,29 +125,34 @@ class Map:
             return self.portal_sprite_factory.get_sprite(portal)
 
         # Tile normal
-        tile = self.get_tile(x, y)
-        if tile[0] == "TREE":
+        code = self.get_tile_code(x, y)
+        if code == TILE_TREE:
             variant = self.get_tree_variant(x, y)
             return self.tile_sprite_factory.get_sprite("TREE", variant)
-        elif tile[0] == "CLEAR":
-            return self.tile_sprite_factory.get_sprite("CLEAR")
-        return self.tile_sprite_factory.get_sprite("GRASS")
+        return self.tile_sprite_factory.get_sprite(TILE_NAMES[code])
 
     # ====================
     # Gemas y cofres
     # ====================
     def get_gem(self, x, y):
         chunk_x, chunk_y = self.get_chunk_key(x, y)
+        self._ensure_resident(chunk_x, chunk_y)
         local_x, local_y = x % self.chunk_size, y % self.chunk_size
         return self.gem_manager.get_gem(chunk_x, chunk_y, local_x, local_y)
 
     def collect_gem(self, x, y):
         chunk_x, chunk_y = self.get_chunk_key(x, y)
+        self._ensure_resident(chunk_x, chunk_y)
         local_x, local_y = x % self.chunk_size, y % self.chunk_size
-        return self.gem_manager.collect_gem(chunk_x, chunk_y, local_x, local_y)
+        gem = self.gem_manager.collect_gem(chunk_x, chunk_y, local_x, local_y)
+        if gem is not None:
+            self.delta_log.record_gem_collected(chunk_x, chunk_y, local_x, local_y)
+            self.dirty_chunks.add((chunk_x, chunk_y))
+        return gem
 
     def get_chest(self, x, y):
         chunk_x, chunk_y = self.get_chunk_key(x, y)
+        self._ensure_resident(chunk_x, chunk_y)
         local_x, local_y = x % self.chunk_size, y % self.chunk_size
         return self.chest_manager.get_chest(chunk_x, chunk_y, local_x, local_y)
 
@@ -104,11 +162,50 @@ class Map:
             return chest.interact(player)
         return None
 
+    # ====================
+    # Consultas por región
+    # ====================
+    def query_region(self, x0, y0, x1, y1, kinds=("gems", "chests", "portals")):
+        """
+        Devuelve las entidades dentro del rectángulo [x0, x1] x [y0, y1] (extremos incluidos)
+        como {"gems": [(x, y, valor)], "chests": [(x, y, cofre)], "portals": [(x, y, portal)]}
+        en coordenadas globales. Los chunks que cubren el rectángulo se resuelven una sola vez
+        y se recorren sus índices dispersos en lugar de consultar tile a tile.
+        """
+        size = self.chunk_size
+        result = {kind: [] for kind in kinds}
+        gems, chests, portals = result.get("gems"), result.get("chests"), result.get("portals")
+        first_cx, first_cy = self.get_chunk_key(x0, y0)
+        last_cx, last_cy = self.get_chunk_key(x1, y1)
+
+        for chunk_y in range(first_cy, last_cy + 1):
+            for chunk_x in range(first_cx, last_cx + 1):
+                self._ensure_resident(chunk_x, chunk_y)
+                base_x, base_y = chunk_x * size, chunk_y * size
+                if gems is not None:
+                    for local_x, local_y, value in self.gem_manager.iter_chunk(chunk_x, chunk_y):
+                        x, y = base_x + local_x, base_y + local_y
+                        if x0 <= x <= x1 and y0 <= y <= y1:
+                            gems.append((x, y, value))
+                if chests is not None:
+                    for local_x, local_y, chest in self.chest_manager.iter_chunk(chunk_x, chunk_y):
+                        x, y = base_x + local_x, base_y + local_y
+                        if x0 <= x <= x1 and y0 <= y <= y1:
+                            chests.append((x, y, chest))
+                if portals is not None:
+                    portal_info = self.portal_manager.get_portal_info(chunk_x, chunk_y)
+                    if portal_info:
+                        x, y = base_x + portal_info[0], base_y + portal_info[1]
+                        if x0 <= x <= x1 and y0 <= y <= y1:
+                            portals.append((x, y, portal_info[2]))
+        return result
+
     # ====================
     # Portales
     # ====================
     def get_portal(self, x, y):
         chunk_x, chunk_y = self.get_chunk_key(x, y)
+        self._ensure_resident(chunk_x, chunk_y)
         portal_info = self.portal_manager.get_portal_info(chunk_x, chunk_y)
         if portal_info:
             lx, ly, portal = portal_info
@@ -123,37 +220,272 @@ class Map:
     def get_chunk_key(self, x, y):
         return (x // self.chunk_size, y // self.chunk_size)
 
-    def ensure_chunk(self, chunk_x, chunk_y):
+    def get_chunk(self, chunk_x, chunk_y) -> Chunk:
+        """Devuelve el chunk (generándolo si hace falta)."""
+        return self.ensure_chunk(chunk_x, chunk_y)
+
+    def ensure_chunk(self, chunk_x, chunk_y) -> Chunk:
         key = (chunk_x, chunk_y)
-        if key not in self.generated_chunks:
-            # Generamos chunk
-            chunk = self.chunk_generator.generate_chunk()
-            self.chunks[chunk_y][chunk_x] = chunk
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.residency.record_hit()
+            return chunk
+        # Solo se cronometra el camino lento: los aciertos los cuenta la residencia
+        with PROFILER.timer("ensure_chunk"):
+            return self._load_chunk(chunk_x, chunk_y)
+
+    def _load_chunk(self, chunk_x, chunk_y) -> Chunk:
+        """Instala un chunk no residente: desalojado, guardado, pre-generado o nuevo."""
+        key = (chunk_x, chunk_y)
+        # Chunk desalojado: se recarga (o regenera) desde la caché de residencia
+        chunk = self.residency.reload(chunk_x, chunk_y)
+        if chunk is not None:
+            PROFILER.count("chunks_reloaded")
+            return chunk
+
+        # Chunk de la partida guardada: se decodifica ahora, la primera vez que se pide
+        if self.has_saved_chunk(chunk_x, chunk_y):
+            chunk = self.load_saved_chunk(chunk_x, chunk_y)
             self.generated_chunks.add(key)
+            self.residency.record_generated()
+            PROFILER.count("chunks_loaded")
+            return chunk
+
+        chunk = self.generate_chunk(chunk_x, chunk_y)
+        self.generated_chunks.add(key)
+        self.dirty_chunks.add(key)
+        self.residency.record_generated()
+        return chunk
+
+    def generate_chunk(self, chunk_x, chunk_y) -> Chunk:
+        """
+        Instala el chunk construido desde la semilla: el que dejaron listo los hilos
+        de pre-generación si lo hay, o generado ahora de forma síncrona.
+        """
+        payload = self.prefetcher.take(chunk_x, chunk_y) if self.prefetcher else None
+        if payload is None:
+            payload = self.build_chunk(chunk_x, chunk_y)
+            PROFILER.count("chunks_built")
+        return self.install_chunk(chunk_x, chunk_y, payload)
+
+    def build_chunk(self, chunk_x, chunk_y):
+        """
+        Construye el chunk y sus entidades a partir de la semilla del mundo,
+        sin modificar el mapa: puede ejecutarse fuera del hilo principal.
+        Devuelve (chunk, gemas, cofres, portal).
+        """
+        chunk = self.chunk_generator.generate_chunk(rng=chunk_rng(self.seed, chunk_x, chunk_y, STREAM_TILES))
+        return self._build_entities(chunk_x, chunk_y, chunk)
+
+    def build_chunks(self, keys):
+        """Versión por lotes de build_chunk: talla todos los tiles de una vez."""
+        rngs = [chunk_rng(self.seed, chunk_x, chunk_y, STREAM_TILES) for chunk_x, chunk_y in keys]
+        chunks = self.chunk_generator.generate_chunks(rngs)
+        return self._build_entities_many(keys, chunks)
+
+    def _build_entities(self, chunk_x, chunk_y, chunk):
+        return self._build_entities_many([(chunk_x, chunk_y)], [chunk])[0]
+
+    def _build_entities_many(self, keys, chunks):
+        """Variantes, gemas, cofres y portal de un lote de chunks, cada uno con sus streams."""
+        seed = self.seed
+        for (chunk_x, chunk_y), chunk in zip(keys, chunks):
+            chunk.set_variants(chunk_variants(seed, chunk_x, chunk_y, len(chunk.tiles), self.num_tree_variants))
+        # Cada chunk sortea con sus propios streams: el resultado no depende del lote
+        gems = [
+            self.gem_manager.generate_gems(chunk, chunk_rng(seed, chunk_x, chunk_y, STREAM_GEMS))
+            for (chunk_x, chunk_y), chunk in zip(keys, chunks)
+        ]
+        chests = [
+            self.chest_manager.generate_chests(chunk, chunk_rng(seed, chunk_x, chunk_y, STREAM_CHESTS))
+            for (chunk_x, chunk_y), chunk in zip(keys, chunks)
+        ]
+        portals = [
+            self.portal_manager.generate_portal(chunk, chunk_rng(seed, chunk_x, chunk_y, STREAM_PORTAL))
+            for (chunk_x, chunk_y), chunk in zip(keys, chunks)
+        ]
+        return list(zip(chunks, gems, chests, portals))
+
+    def needs_build(self, chunk_x, chunk_y) -> bool:
+        """
+        True si instalar el chunk pasa por build_chunk y por tanto puede pre-generarse:
+        chunk nuevo, guardado sin decodificar o desalojado sin caché en disco.
+        """
+        key = (chunk_x, chunk_y)
+        if key in self.chunks:
+            return False
+        if key in self.residency.evicted:
+            return self.residency.store is None
+        return key not in self.generated_chunks
+
+    def pregenerate(self, keys):
+        """Genera en lote (hilo principal) los chunks indicados que no estén instalados."""
+        missing = [key for key in dict.fromkeys(keys) if self.needs_build(*key)]
+        for (chunk_x, chunk_y), payload in zip(missing, self.build_chunks(missing)):
+            self.adopt_chunk(chunk_x, chunk_y, payload)
+
+    def install_chunk(self, chunk_x, chunk_y, payload) -> Chunk:
+        """
+        Registra en el mapa un chunk construido por build_chunk (solo hilo principal)
+        y le aplica los cambios guardados en el delta log.
+        """
+        chunk, gems, chests, portal_info = payload
+        self.chunks[(chunk_x, chunk_y)] = chunk
+
+        # Colocamos gemas, cofres y portales
+        self.gem_manager.restore_chunk(chunk_x, chunk_y, gems)
+        self.chest_manager.restore_chunk(chunk_x, chunk_y, chests)
+        self.portal_manager.restore_chunk(chunk_x, chunk_y, portal_info)
+
+        delta = self.delta_log.get(chunk_x, chunk_y)
+        if delta is not None:
+            self._apply_delta(chunk_x, chunk_y, delta)
+        return chunk
+
+    def _apply_delta(self, chunk_x, chunk_y, delta):
+        for local_x, local_y in delta.collected_gems:
+            self.gem_manager.collect_gem(chunk_x, chunk_y, local_x, local_y)
+        for local_x, local_y in delta.opened_chests:
+            chest = self.chest_manager.get_chest(chunk_x, chunk_y, local_x, local_y)
+            if chest:
+                chest.mark_opened()
+        if delta.portal_activated:
+            portal = self.portal_manager.get_portal(chunk_x, chunk_y)
+            if portal:
+                portal.mark_activated()
+
+    def capture_chunk_delta(self, chunk_x, chunk_y):
+        """
+        Vuelca al delta log el estado de cofres y portal del chunk
+        (las gemas recogidas se registran al momento en collect_gem).
+        """
+        for local_x, local_y, chest in self.chest_manager.iter_chunk(chunk_x, chunk_y):
+            if chest.is_opened():
+                self.delta_log.record_chest_opened(chunk_x, chunk_y, local_x, local_y)
+        portal = self.portal_manager.get_portal(chunk_x, chunk_y)
+        if portal and portal.is_activated():
+            self.delta_log.record_portal_activated(chunk_x, chunk_y)
+
+    def adopt_chunk(self, chunk_x, chunk_y, payload):
+        """
+        Instala un chunk pre-generado en segundo plano si todavía hace falta.
+        Si el chunk ya existía (desalojado o en la partida guardada), el payload
+        es su regeneración desde la semilla y se le aplica su delta al instalarlo.
+        """
+        key = (chunk_x, chunk_y)
+        if not self.needs_build(chunk_x, chunk_y):
+            return self.chunks.get(key)
+        if self.residency.adopt(chunk_x, chunk_y):
+            return self.install_chunk(chunk_x, chunk_y, payload)
+        if self.has_saved_chunk(chunk_x, chunk_y):
+            chunk = self.load_saved_chunk(chunk_x, chunk_y, payload)
+        else:
+            chunk = self.install_chunk(chunk_x, chunk_y, payload)
+            self.dirty_chunks.add(key)
+        self.generated_chunks.add(key)
+        self.residency.record_generated()
+        return chunk
+
+    def restore_chunk_state(self, chunk_x, chunk_y, state) -> Chunk:
+        """Reinstala un chunk completo (tiles, gemas, cofres y portal) desalojado a un ChunkStore."""
+        chunk = Chunk.from_bytes(self.chunk_size, state["tiles"])
+        self.chunks[(chunk_x, chunk_y)] = chunk
+        self.gem_manager.restore_chunk(chunk_x, chunk_y, state["gems"])
+        self.chest_manager.restore_chunk(chunk_x, chunk_y, state["chests"])
+        self.portal_manager.restore_chunk(chunk_x, chunk_y, state["portal"])
+        return chunk
+
+    def _ensure_resident(self, chunk_x, chunk_y):
+        """Recarga el chunk si fue desalojado (no genera chunks nuevos)."""
+        if (chunk_x, chunk_y) in self.residency.evicted:
+            self.residency.reload(chunk_x, chunk_y)
+
+    def set_focus(self, chunk_x, chunk_y):
+        """Centra el working set de chunks en memoria alrededor del chunk dado."""
+        self.residency.set_focus(chunk_x, chunk_y)
+
+    # ====================
+    # Partida guardada
+    # ====================
+    def has_saved_chunk(self, chunk_x, chunk_y) -> bool:
+        """True si el chunk está en la partida guardada y aún no se ha decodificado."""
+        return self.world_file is not None and self.world_file.contains(chunk_x, chunk_y)
+
+    def load_saved_chunk(self, chunk_x, chunk_y, payload=None) -> Chunk:
+        """Decodifica el chunk guardado; `payload` es su regeneración ya hecha por el prefetcher."""
+        delta = self.world_file.read(chunk_x, chunk_y)
+        if not delta.is_empty():
+            self.delta_log.restore(chunk_x, chunk_y, delta)
+        # El chunk sale igual de la semilla y install_chunk le aplica el delta
+        if payload is not None:
+            return self.install_chunk(chunk_x, chunk_y, payload)
+        return self.generate_chunk(chunk_x, chunk_y)
+
+    def mark_region_dirty(self, x0, y0, x1, y1) -> None:
+        """Marca para el autoguardado los chunks que cubren el rectángulo (p. ej. un cofre abierto)."""
+        first_cx, first_cy = self.get_chunk_key(x0, y0)
+        last_cx, last_cy = self.get_chunk_key(x1, y1)
+        for chunk_y in range(first_cy, last_cy + 1):
+            for chunk_x in range(first_cx, last_cx + 1):
+                self.dirty_chunks.add((chunk_x, chunk_y))
+
+    def take_dirty_records(self):
+        """
+        Registros de delta {clave: registro} de los chunks que cambiaron
+        desde la última llamada: cuesta O(cambios) y puede escribirse desde otro hilo.
+        Con la semilla, el delta basta para reconstruir el chunk.
+        """
+        dirty, self.dirty_chunks = self.dirty_chunks, set()
+        records = {}
+        for chunk_x, chunk_y in dirty:
+            if (chunk_x, chunk_y) in self.chunks:
+                self.capture_chunk_delta(chunk_x, chunk_y)
+            records[(chunk_x, chunk_y)] = WorldFile.encode(self.delta_log.get(chunk_x, chunk_y))
+        return records
+
+    # ====================
+    # Pre-generación
+    # ====================
+    def enable_prefetch(self, workers=1):
+        if self.prefetcher is None:
+            # No pedir más lejos de lo que la ventana de residencia conserva
+            self.prefetcher = ChunkPrefetcher(self, workers, max_lookahead=max(2, self.residency.radius))
+
+    def prefetch_ahead(self, x, y, vel_x, vel_y):
+        """Encarga los chunks hacia donde se mueve el jugador (tiles/s)."""
+        if self.prefetcher:
+            self.prefetcher.update(x, y, vel_x, vel_y)
 
-            # Colocamos gemas, cofres y portales
-            self.gem_manager.place_gems_in_chunk(chunk_x, chunk_y, chunk)
-            self.chest_manager.place_chests_in_chunk(chunk_x, chunk_y, chunk)
-            self.portal_manager.try_spawn_portal(chunk_x, chunk_y, chunk)
+    def close(self):
+        """Libera los hilos de pre-generación, la partida guardada abierta y la caché de chunks."""
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+            self.prefetcher = None
+        if self.world_file is not None:
+            self.world_file.close()
+            self.world_file = None
+        if self.residency.store is not None:
+            self.residency.store.close()
 
-    def is_clearing_chunk(self, chunk):
-        return all(tile[0] == "CLEAR" for row in chunk for tile in row)
+    def is_clearing_chunk(self, chunk: Chunk):
+        return chunk.is_uniform(TILE_CLEAR)
 
     # ====================
     # Métodos de consulta
     # ====================
     def is_wall(self, x, y):
-        return self.get_tile(x, y)[0] == "TREE"
+        return self.get_tile_code(x, y) == TILE_TREE
 
     def is_clearing(self, x, y):
         chunk_x, chunk_y = self.get_chunk_key(x, y)
         return (chunk_x, chunk_y) in self.clear_chunks
 
     def get_tree_variant(self, x, y):
-        key = (x, y)
-        if key not in self.tree_variant_map:
-            self.tree_variant_map[key] = random.randint(0, self.num_tree_variants - 1)
-        return self.tree_variant_map[key]
+        size = self.chunk_size
+        chunk = self.chunks.get((x // size, y // size))
+        if chunk is None:
+            chunk = self.ensure_chunk(x // size, y // size)
+        return chunk.variants[(y % size) * size + (x % size)]
 
     def is_blocked(self, x, y):
         return self.is_wall(x, y) or self.get_chest(x, y) is not None or self.get_portal(x, y)[0] is not None
@@ -8,9 +8,10 @@ class Portal:
     El jugador puede activarlo entregando gemas de Obsidiana.
     """
     OBSIDIAN_POWER = 50  # poder asociado a la Obsidiana
+    COST_RANGE = (50, 100)  # obsidianas necesarias para activarlo (extremos incluidos)
 
-    def __init__(self):
-        required = random.randint(50, 100)
+    def __init__(self, rng: random.Random = None):
+        required = (rng or random).randint(*self.COST_RANGE)
         self._activated = False
         self._activation_cost: Dict[int, int] = {self.OBSIDIAN_POWER: required}
 
@@ -27,12 +28,12 @@ class Portal:
                 return False
         return True
 
+    def mark_activated(self):
+        self._activated = True
+
     def activate(self, inventory: IInventory) -> bool:
-        if not self.can_activate(inventory):
+        # Inventory.apply valida, descuenta y elimina los nodos que quedan a cero
+        if not inventory.apply(costs=self._activation_cost):
             return False
-        for poder, cantidad in self._activation_cost.items():
-            node = inventory.search(poder)
-            if node:
-                node.setCantidad(node.getCantidad() - cantidad)
         self._activated = True
         return True
@@ -0,0 +1,60 @@
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+class ChunkDelta:
+    """Cambios de un chunk respecto a su generación: gemas recogidas, cofres abiertos, portal activado."""
+    __slots__ = ("collected_gems", "opened_chests", "portal_activated")
+
+    def __init__(self):
+        self.collected_gems: Set[Tuple[int, int]] = set()
+        self.opened_chests: Set[Tuple[int, int]] = set()
+        self.portal_activated = False
+
+    def is_empty(self) -> bool:
+        return not (self.collected_gems or self.opened_chests or self.portal_activated)
+
+
+class WorldDeltaLog:
+    """
+    Registro de los cambios del jugador sobre un mundo con semilla.
+    Como cualquier chunk puede regenerarse desde (seed, chunk_x, chunk_y),
+    esto es lo único que hace falta guardar para reconstruir el mundo.
+    Las posiciones son locales al chunk.
+    """
+
+    def __init__(self):
+        self._chunks: Dict[Tuple[int, int], ChunkDelta] = {}
+
+    def _delta(self, chunk_x: int, chunk_y: int) -> ChunkDelta:
+        key = (chunk_x, chunk_y)
+        delta = self._chunks.get(key)
+        if delta is None:
+            delta = self._chunks[key] = ChunkDelta()
+        return delta
+
+    # -------------------------
+    # Registro
+    # -------------------------
+    def record_gem_collected(self, chunk_x: int, chunk_y: int, local_x: int, local_y: int) -> None:
+        self._delta(chunk_x, chunk_y).collected_gems.add((local_x, local_y))
+
+    def record_chest_opened(self, chunk_x: int, chunk_y: int, local_x: int, local_y: int) -> None:
+        self._delta(chunk_x, chunk_y).opened_chests.add((local_x, local_y))
+
+    def record_portal_activated(self, chunk_x: int, chunk_y: int) -> None:
+        self._delta(chunk_x, chunk_y).portal_activated = True
+
+    def restore(self, chunk_x: int, chunk_y: int, delta: ChunkDelta) -> None:
+        """Reinstala el delta de un chunk leído de una partida guardada."""
+        self._chunks[(chunk_x, chunk_y)] = delta
+
+    # -------------------------
+    # Consulta
+    # -------------------------
+    def get(self, chunk_x: int, chunk_y: int) -> Optional[ChunkDelta]:
+        return self._chunks.get((chunk_x, chunk_y))
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], ChunkDelta]]:
+        return iter(self._chunks.items())
+
+    def __len__(self) -> int:
+        return len(self._chunks)
@@ -0,0 +1,354 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from core.world_delta import ChunkDelta
+
+# ====================
+# Formato (little-endian)
+# ====================
+# Cabecera y diario (`path`, p. ej. save_world.bin): se lee entero y se cierra,
+# así que se puede sustituir aunque haya una partida cargada (también en Windows).
+#   cabecera    magic "GRWLD" | versión u8 | chunk_size u16 | semilla u64 | generación u32
+#   marcos      tipo u8 | chunk_x i32 | chunk_y i32 | longitud u32 | crc32 u32 | datos
+#               FRAME_CHUNK: registro del chunk (sustituye al de la instantánea)
+#               FRAME_PLAYER: jugador x i64 | jugador y i64 (cierra cada guardado)
+# Instantánea (`path`.<generación>): solo cambia al compactar, y siempre con
+# una generación nueva; la anterior puede seguir mapeada por el lector.
+#   cabecera    magic "GRWSN" | versión u8 | chunk_size u16 | semilla u64
+#               | jugador x i64 | jugador y i64 | chunks u32 | offset del directorio u64
+#   registros   delta de cada chunk: portal activado u8 | gemas u16 | cofres u16
+#               seguido de (local_x u16, local_y u16) por gema recogida y por cofre abierto
+#   directorio  chunk_x i32 | chunk_y i32 | offset u64 | longitud u32 | crc32 u32
+#               por chunk, ordenado por (chunk_x, chunk_y)
+WORLD_MAGIC = b"GRWLD"
+SNAPSHOT_MAGIC = b"GRWSN"
+FORMAT_VERSION = 4
+
+FRAME_CHUNK = 1
+FRAME_PLAYER = 2
+
+# El diario se compacta cuando ocupa más que la instantánea y que este mínimo
+COMPACT_MIN_BYTES = 256 * 1024
+
+_WORLD_HEADER = struct.Struct("<5sBHQI")
+_FRAME = struct.Struct("<BiiII")
+_PLAYER = struct.Struct("<qq")
+_HEADER = struct.Struct("<5sBHQqqIQ")
+_ENTRY = struct.Struct("<iiQII")
+_DELTA = struct.Struct("<BHH")
+_POSITION = struct.Struct("<HH")
+
+ChunkKey = Tuple[int, int]
+
+
+def snapshot_path(path: str, generation: int) -> str:
+    return f"{path}.{generation}"
+
+
+class WorldFile:
+    """
+    Partida guardada con todo el mundo explorado, abierta de forma perezosa:
+    - Al abrir se leen la cabecera, el diario y el directorio de la instantánea;
+      la instantánea queda mapeada en memoria (mmap) y cada registro se decodifica
+      la primera vez que Map.ensure_chunk pide ese chunk.
+    - Los registros del diario sustituyen a los de la instantánea. Un marco
+      cortado o con crc incorrecto marca el final válido del diario, y el
+      guardado a medias que lo contiene se descarta entero.
+    - Cada registro es solo el delta del chunk (datos planos con struct, nunca
+      objetos serializados): el chunk se regenera desde la semilla del mundo.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            journal = f.read()
+        if len(journal) < _WORLD_HEADER.size:
+            raise ValueError("Archivo de mundo truncado")
+        magic, version, chunk_size, seed, generation = _WORLD_HEADER.unpack_from(journal)
+        if magic != WORLD_MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Formato de mundo desconocido")
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.generation = generation
+        self._journal = journal
+
+        self._file = open(snapshot_path(path, generation), "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Instantánea de mundo vacía")
+        try:
+            self._read_index()
+            self._read_journal()
+        except Exception:
+            self.close()
+            raise
+        self.consumed = set()
+
+    def _read_index(self) -> None:
+        data = self._data
+        if len(data) < _HEADER.size:
+            raise ValueError("Instantánea de mundo truncada")
+        magic, version, chunk_size, seed, player_x, player_y, count, directory = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Formato de mundo desconocido")
+        if (chunk_size, seed) != (self.chunk_size, self.seed):
+            raise ValueError("La instantánea no corresponde a este mundo")
+        if directory + count * _ENTRY.size != len(data):
+            raise ValueError("Directorio de chunks corrupto")
+
+        self.snapshot_size = len(data)
+        self.player_position = (player_x, player_y)
+        # clave -> (buffer, offset, longitud, crc32), en la instantánea o en el diario
+        self.index: Dict[ChunkKey, Tuple[object, int, int, int]] = {}
+        for chunk_x, chunk_y, offset, length, crc in _ENTRY.iter_unpack(data[directory:]):
+            self.index[(chunk_x, chunk_y)] = (data, offset, length, crc)
+
+    def _read_journal(self) -> None:
+        journal = self._journal
+        offset = self.journal_end = _WORLD_HEADER.size
+        # Los registros de un guardado solo cuentan si llegó su marco de jugador
+        records = {}
+        while offset + _FRAME.size <= len(journal):
+            kind, chunk_x, chunk_y, length, crc = _FRAME.unpack_from(journal, offset)
+            start = offset + _FRAME.size
+            end = start + length
+            if end > len(journal) or zlib.crc32(journal[start:end]) != crc:
+                break
+            if kind == FRAME_CHUNK:
+                records[(chunk_x, chunk_y)] = (journal, start, length, crc)
+            elif kind == FRAME_PLAYER and length == _PLAYER.size:
+                self.index.update(records)
+                records = {}
+                self.player_position = _PLAYER.unpack_from(journal, start)
+                self.journal_end = end
+            else:
+                break
+            offset = end
+
+    # ====================
+    # Lectura
+    # ====================
+    def contains(self, chunk_x: int, chunk_y: int) -> bool:
+        """True si el chunk está guardado y todavía no se ha leído."""
+        key = (chunk_x, chunk_y)
+        return key in self.index and key not in self.consumed
+
+    def pending_keys(self) -> Iterator[ChunkKey]:
+        return (key for key in self.index if key not in self.consumed)
+
+    def raw(self, chunk_x: int, chunk_y: int) -> Tuple[bytes, int]:
+        """Registro del chunk y su crc32, sin decodificar."""
+        data, offset, length, crc = self.index[(chunk_x, chunk_y)]
+        return data[offset:offset + length], crc
+
+    def read(self, chunk_x: int, chunk_y: int) -> ChunkDelta:
+        """Decodifica el delta del chunk y lo marca como leído."""
+        record, crc = self.raw(chunk_x, chunk_y)
+        if zlib.crc32(record) != crc:
+            raise ValueError(f"Registro del chunk ({chunk_x}, {chunk_y}) corrupto")
+        delta = self.decode(record)
+        self.consumed.add((chunk_x, chunk_y))
+        return delta
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ====================
+    # Registros
+    # ====================
+    @staticmethod
+    def encode(delta: Optional[ChunkDelta]) -> bytes:
+        """Registro de un chunk a partir de su delta (None = chunk sin cambios)."""
+        if delta is None:
+            return _DELTA.pack(0, 0, 0)
+        gems, chests = sorted(delta.collected_gems), sorted(delta.opened_chests)
+        return _DELTA.pack(delta.portal_activated, len(gems), len(chests)) + \
+            b"".join(_POSITION.pack(x, y) for x, y in gems + chests)
+
+    @staticmethod
+    def decode(record: bytes) -> ChunkDelta:
+        if len(record) < _DELTA.size:
+            raise ValueError("Registro de chunk truncado")
+        portal, gem_count, chest_count = _DELTA.unpack_from(record)
+        if len(record) != _DELTA.size + (gem_count + chest_count) * _POSITION.size:
+            raise ValueError("Registro de chunk con longitud incorrecta")
+        positions = list(_POSITION.iter_unpack(record[_DELTA.size:]))
+        delta = ChunkDelta()
+        delta.portal_activated = bool(portal)
+        delta.collected_gems.update(positions[:gem_count])
+        delta.opened_chests.update(positions[gem_count:])
+        return delta
+
+    # ====================
+    # Escritura completa
+    # ====================
+    @staticmethod
+    def write(path: str, chunk_size: int, seed: int, player_position: Tuple[int, int],
+              records: Iterable[Tuple[ChunkKey, bytes, Optional[int]]]) -> int:
+        """
+        Escribe el mundo como instantánea de la generación siguiente, apunta a ella
+        la cabecera (con el diario vacío) y borra las instantáneas viejas que no
+        estén en uso. `records` da (clave, registro, crc32 o None para calcularlo).
+        Devuelve la generación escrita.
+        """
+        generation = WorldFile.disk_generation(path) + 1
+        WorldFile._write_snapshot(path, generation, chunk_size, seed, player_position, records)
+        WorldFile._write_header(path, chunk_size, seed, generation)
+        WorldFile.remove_stale(path, generation)
+        return generation
+
+    @staticmethod
+    def _write_snapshot(path: str, generation: int, chunk_size: int, seed: int,
+                        player_position: Tuple[int, int],
+                        records: Iterable[Tuple[ChunkKey, bytes, Optional[int]]]) -> None:
+        target = snapshot_path(path, generation)
+        tmp_path = target + ".tmp"
+        entries = []
+        with open(tmp_path, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            offset = _HEADER.size
+            for key, record, crc in records:
+                f.write(record)
+                entries.append((key, offset, len(record), zlib.crc32(record) if crc is None else crc))
+                offset += len(record)
+
+            entries.sort()
+            f.write(b"".join(_ENTRY.pack(chunk_x, chunk_y, start, length, crc)
+                             for (chunk_x, chunk_y), start, length, crc in entries))
+            f.seek(0)
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, chunk_size, seed,
+                                 player_position[0], player_position[1], len(entries), offset))
+            f.flush()
+            os.fsync(f.fileno())
+        # Generación nueva: ningún lector puede tener abierto este nombre
+        os.replace(tmp_path, target)
+
+    @staticmethod
+    def _write_header(path: str, chunk_size: int, seed: int, generation: int) -> None:
+        """Cabecera con el diario vacío (temporal + fsync + rename): si el proceso muere antes, vale la anterior."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_WORLD_HEADER.pack(WORLD_MAGIC, FORMAT_VERSION, chunk_size, seed, generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def disk_generation(path: str) -> int:
+        """Generación a la que apunta la cabecera en disco (0 si no hay una válida)."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_WORLD_HEADER.size)
+        except FileNotFoundError:
+            return 0
+        if len(header) < _WORLD_HEADER.size:
+            return 0
+        magic, version, _, _, generation = _WORLD_HEADER.unpack(header)
+        return generation if magic == WORLD_MAGIC and version == FORMAT_VERSION else 0
+
+    @staticmethod
+    def remove_stale(path: str, generation: int) -> None:
+        """Borra las instantáneas de otras generaciones; las que sigan abiertas se quedan para la próxima."""
+        directory, name = os.path.split(path)
+        prefix = name + "."
+        for entry in os.listdir(directory or "."):
+            suffix = entry[len(prefix):]
+            if entry.startswith(prefix) and suffix.isdigit() and int(suffix) != generation:
+                try:
+                    os.remove(os.path.join(directory, entry))
+                except OSError:
+                    # Windows no deja borrar un archivo mapeado (la partida cargada)
+                    pass
+
+
+class WorldWriter:
+    """
+    Guardado incremental del mundo (lo usa el hilo del autoguardado):
+    - write() añade al diario solo los registros de los chunks que cambiaron y
+      la posición del jugador, con fsync: cuesta O(cambios), no O(mundo).
+    - Cuando el diario ocupa más que la instantánea (y que `compact_min_bytes`),
+      compact() funde ambos en una instantánea de generación nueva y vacía el diario.
+    - No guarda registros en memoria: lo ya escrito solo está en disco.
+    - Con `fresh` (partida nueva) el primer guardado sustituye al mundo anterior;
+      si no, se continúa el diario del mundo que cargó la partida.
+    """
+
+    def __init__(self, path: str, chunk_size: int, seed: int, fresh: bool = True,
+                 compact_min_bytes: int = COMPACT_MIN_BYTES):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.fresh = fresh
+        self.compact_min_bytes = compact_min_bytes
+        self.generation: Optional[int] = None
+        self.journal_end = 0
+        self.snapshot_size = 0
+        self.compactions = 0
+
+    def write(self, records: Dict[ChunkKey, bytes], player_position: Tuple[int, int]) -> None:
+        if self.generation is None:
+            if self.fresh:
+                self._rewrite([(key, record, None) for key, record in records.items()], player_position)
+                self.fresh = False
+                return
+            self._resume()
+        self._append(records, player_position)
+        if self.journal_end - _WORLD_HEADER.size > max(self.compact_min_bytes, self.snapshot_size):
+            self.compact()
+
+    def compact(self) -> None:
+        """Reescribe instantánea + diario como una instantánea nueva (O(mundo), de vez en cuando)."""
+        world = WorldFile(self.path)
+        try:
+            generation = world.generation + 1
+            WorldFile._write_snapshot(self.path, generation, self.chunk_size, self.seed, world.player_position,
+                                      ((key,) + world.raw(*key) for key in world.index))
+        finally:
+            world.close()
+        WorldFile._write_header(self.path, self.chunk_size, self.seed, generation)
+        WorldFile.remove_stale(self.path, generation)
+        self._started(generation)
+        self.compactions += 1
+
+    def _rewrite(self, records, player_position: Tuple[int, int]) -> None:
+        self._started(WorldFile.write(self.path, self.chunk_size, self.seed, player_position, records))
+
+    def _started(self, generation: int) -> None:
+        """La cabecera apunta a la instantánea `generation` y el diario está vacío."""
+        self.generation = generation
+        self.journal_end = _WORLD_HEADER.size
+        self.snapshot_size = os.path.getsize(snapshot_path(self.path, generation))
+
+    def _resume(self) -> None:
+        world = WorldFile(self.path)
+        try:
+            if (world.chunk_size, world.seed) != (self.chunk_size, self.seed):
+                raise ValueError("El archivo de mundo es de otra partida")
+            self.generation = world.generation
+            self.journal_end = world.journal_end
+            self.snapshot_size = world.snapshot_size
+        finally:
+            world.close()
+
+    def _append(self, records: Dict[ChunkKey, bytes], player_position: Tuple[int, int]) -> None:
+        frames = bytearray()
+        for (chunk_x, chunk_y), record in records.items():
+            frames += _FRAME.pack(FRAME_CHUNK, chunk_x, chunk_y, len(record), zlib.crc32(record)) + record
+        player = _PLAYER.pack(*player_position)
+        frames += _FRAME.pack(FRAME_PLAYER, 0, 0, len(player), zlib.crc32(player)) + player
+        with open(self.path, "r+b") as f:
+            # Lo que hubiera tras el último marco válido (escritura cortada) se pisa
+            f.seek(self.journal_end)
+            f.write(frames)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_end += len(frames)
@@ -2,5 +2,6 @@ from factories.gem_loot_factory import GemLootFactory
 from factories.chest_factory import ChestFactory
 from factories.chunk_factory import ChunkFactory
 from factories.maze_carver import MazeCarver
+from factories.array_maze_carver import ArrayMazeCarver
 
-__all__ = ["GemLootFactory", "ChestFactory", "ChunkFactory", "MazeCarver"]
\ No newline at end of file
+__all__ = ["GemLootFactory", "ChestFactory", "ChunkFactory", "MazeCarver", "ArrayMazeCarver"]
\ No newline at end of file
@@ -0,0 +1,215 @@
+# src/factories/array_maze_carver.py
+import itertools
+import random
+from typing import List, Sequence, Tuple
+from core.chunk import Chunk
+from resources.tile_data import TILE_TREE, TILE_GRASS, TILE_CLEAR
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa MazeCarver
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Las 24 permutaciones de las 4 direcciones: un índice aleatorio equivale a random.shuffle
+_DIRECTION_PERMUTATIONS = tuple(itertools.permutations(((1, 0), (0, 1), (-1, 0), (0, -1))))
+_EXTRA_PATH_ATTEMPTS = 200
+_EXTRA_PATH_ROUNDS = 4
+
+
+def numpy_rng(rng: random.Random = None):
+    """Crea un Generator de NumPy sembrado desde el random.Random del chunk (o el global)."""
+    return np.random.default_rng((rng or random).getrandbits(64))
+
+
+class ArrayMazeCarver:
+    """
+    Motor de carving basado en arrays de NumPy, equivalente estadísticamente a MazeCarver:
+    - El DFS recorre solo la rejilla de celdas (posiciones de paso 2) con permutaciones
+      y anchos sorteados en bloque, y guarda las aristas talladas.
+    - Las aristas de todos los chunks se pintan en una única asignación vectorizada.
+    - add_extra_paths cuenta vecinos con sumas desplazadas (convolución en cruz)
+      sobre el lote completo en unas pocas rondas.
+    - Los claros sortean el número y posición de sus árboles en bloque.
+    """
+
+    def __init__(self, chunk_size: int, path_width_range: Tuple[int, int] = (1, 2)):
+        if np is None:
+            raise ImportError("ArrayMazeCarver necesita NumPy")
+        self.chunk_size = chunk_size
+        self.path_width_range = path_width_range
+
+    # -------------------------
+    # API por chunk
+    # -------------------------
+    def generate_maze_chunk(self, start_pos: Tuple[int, int] = None, rng: random.Random = None) -> Chunk:
+        return self.generate_maze_chunks([rng], start_pos)[0]
+
+    def generate_clearing_chunk(self, rng: random.Random = None) -> Chunk:
+        return self.generate_clearing_chunks([rng])[0]
+
+    # -------------------------
+    # API por lotes
+    # -------------------------
+    def generate_maze_chunks(self, rngs: Sequence[random.Random], start_pos: Tuple[int, int] = None) -> List[Chunk]:
+        """Genera un chunk laberinto por cada rng del lote."""
+        grids = self.carve_maze_batch([numpy_rng(rng) for rng in rngs], start_pos)
+        return self._to_chunks(grids)
+
+    def generate_clearing_chunks(self, rngs: Sequence[random.Random]) -> List[Chunk]:
+        """
+        Genera un chunk claro por cada rng del lote. Los árboles se sortean con el
+        rng del chunk igual que ChunkFactory.generate_clearing_chunk, así que un
+        claro es el mismo generado suelto o en lote.
+        """
+        size = self.chunk_size
+        grids = np.full((len(rngs), size, size), TILE_CLEAR, dtype=np.uint8)
+        max_trees = max(0, size // 8)
+        trees = []
+        for b, rng in enumerate(rngs):
+            rng = rng or random
+            for _ in range(rng.randint(0, max_trees)):
+                x, y = rng.randint(2, size - 3), rng.randint(2, size - 3)
+                trees.append((b, y, x))
+        if trees:
+            b, ys, xs = np.array(trees, dtype=np.int64).T
+            grids[b, ys, xs] = TILE_TREE
+        return self._to_chunks(grids)
+
+    def carve_maze_batch(self, gens: Sequence, start_pos: Tuple[int, int] = None):
+        """Talla un lote de laberintos y devuelve un array (n, size, size) de códigos de tile."""
+        size = self.chunk_size
+        n = len(gens)
+        if not start_pos:
+            start_pos = (size // 2, size // 2)
+        grids = np.full((n, size, size), TILE_TREE, dtype=np.uint8)
+        target_path_cells = (size * size) // 2
+        path_cells = np.empty(n, dtype=np.int64)
+
+        edges = []
+        for b, gen in enumerate(gens):
+            chunk_edges, path_cells[b] = self._dfs_edges(gen, start_pos, target_path_cells)
+            edges.extend((b,) + edge for edge in chunk_edges)
+
+        self._paint_edges(grids, np.array(edges, dtype=np.int64).reshape(-1, 6))
+        self._add_extra_paths(grids, gens, path_cells, target_path_cells)
+        return grids
+
+    # -------------------------
+    # DFS sobre la rejilla de celdas
+    # -------------------------
+    def _dfs_edges(self, gen, start_pos: Tuple[int, int], target_path_cells: int):
+        """
+        Devuelve las aristas (x, y, paso_x, paso_y, ancho) del DFS y las celdas talladas.
+        La primera arista es el centro (paso 0).
+        """
+        size = self.chunk_size
+        start_x, start_y = start_pos
+        low, high = self.path_width_range
+        # Las celdas alcanzables tienen la misma paridad que el inicio
+        off_x, off_y = start_x % 2, start_y % 2
+        cols, rows = (size - off_x + 1) // 2, (size - off_y + 1) // 2
+        max_steps = cols * rows
+
+        # Sorteos en bloque: una permutación por iteración (avance o retroceso) y un ancho por arista
+        perms = gen.integers(0, len(_DIRECTION_PERMUTATIONS), size=2 * max_steps).tolist()
+        widths = gen.integers(low, high + 1, size=max_steps + 1).tolist()
+
+        edges = [(start_x, start_y, 0, 0, max(1, widths[0]))]
+        visited = bytearray(cols * rows)
+        cx, cy = (start_x - off_x) // 2, (start_y - off_y) // 2
+        visited[cy * cols + cx] = 1
+        stack = [(cx, cy)]
+        path_cells = 1
+        iteration = 0
+
+        while stack and path_cells < target_path_cells:
+            cx, cy = stack[-1]
+            for dx, dy in _DIRECTION_PERMUTATIONS[perms[iteration]]:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < cols and 0 <= ny < rows and not visited[ny * cols + nx]:
+                    visited[ny * cols + nx] = 1
+                    edges.append((off_x + 2 * cx, off_y + 2 * cy, dx, dy, widths[len(edges)]))
+                    path_cells += 2
+                    stack.append((nx, ny))
+                    break
+            else:
+                stack.pop()
+            iteration += 1
+        return edges, path_cells
+
+    def _paint_edges(self, grids, edges):
+        """
+        Pinta de GRASS todas las aristas de golpe.
+        Cada arista cubre 3 celdas a lo largo (origen, pared, destino) y width // 2
+        celdas a cada lado, como MazeCarver.carve_between. Los centros (paso 0)
+        son un cuadrado por chunk y se pintan con un slice, como carve_center.
+        """
+        is_center = (edges[:, 3] == 0) & (edges[:, 4] == 0)
+        for b, x, y, _, _, width in edges[is_center].tolist():
+            half = width // 2
+            grids[b, max(0, y - half):y + half + 1, max(0, x - half):x + half + 1] = TILE_GRASS
+
+        moves = edges[~is_center]
+        if len(moves) == 0:
+            return
+        size = self.chunk_size
+        b, x, y, step_x, step_y, width = (moves[:, i, None, None] for i in range(6))
+        half = width // 2
+        max_half = int(half.max())
+        along = np.arange(3)[None, :, None]
+        across = np.arange(-max_half, max_half + 1)[None, None, :]
+
+        # Horizontal: x a lo largo, y a lo ancho; vertical al revés
+        xs = x + np.where(step_x != 0, step_x * along, across)
+        ys = y + np.where(step_y != 0, step_y * along, across)
+        shape = np.broadcast_shapes(xs.shape, ys.shape)
+        xs, ys = np.broadcast_to(xs, shape), np.broadcast_to(ys, shape)
+        bs = np.broadcast_to(b, shape)
+        valid = (np.abs(across) <= half) & (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+        grids[bs[valid], ys[valid], xs[valid]] = TILE_GRASS
+
+    # -------------------------
+    # Caminos extra
+    # -------------------------
+    def _add_extra_paths(self, grids, gens, path_cells, target_path_cells: int):
+        size = self.chunk_size
+        pending = np.flatnonzero(path_cells < target_path_cells)
+        if len(pending) == 0:
+            return
+
+        # Todos los intentos sorteados en bloque, igual que los 200 randint de MazeCarver
+        attempts = np.stack([gens[b].integers(1, size - 1, size=(2, _EXTRA_PATH_ATTEMPTS)) for b in pending])
+        per_round = -(-_EXTRA_PATH_ATTEMPTS // _EXTRA_PATH_ROUNDS)
+
+        for start in range(0, _EXTRA_PATH_ATTEMPTS, per_round):
+            sub = grids[pending]
+            grass = (sub == TILE_GRASS).astype(np.uint8)
+            neighbors = np.zeros_like(grass)
+            neighbors[:, 1:, :] += grass[:, :-1, :]
+            neighbors[:, :-1, :] += grass[:, 1:, :]
+            neighbors[:, :, 1:] += grass[:, :, :-1]
+            neighbors[:, :, :-1] += grass[:, :, 1:]
+            eligible = (sub == TILE_TREE) & (neighbors >= 2)
+
+            xs = attempts[:, 0, start:start + per_round]
+            ys = attempts[:, 1, start:start + per_round]
+            rows = np.arange(len(pending))[:, None]
+            hits = eligible[rows, ys, xs]
+            for i, b in enumerate(pending):
+                budget = target_path_cells - int(path_cells[b])
+                if budget <= 0:
+                    continue
+                cells = ys[i][hits[i]] * size + xs[i][hits[i]]
+                _, first = np.unique(cells, return_index=True)
+                chosen = cells[np.sort(first)][:budget]
+                grids[b].reshape(-1)[chosen] = TILE_GRASS
+                path_cells[b] += len(chosen)
+
+    # -------------------------
+    # Conversión
+    # -------------------------
+    def _to_chunks(self, grids) -> List[Chunk]:
+        size = self.chunk_size
+        return [Chunk(size, tiles=grid.tobytes()) for grid in grids]
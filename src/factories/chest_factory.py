@@ -1,39 +1,56 @@
 # src/factories/chest_factory.py
 import random
+from typing import List
 from core.chest import Chest
 from core.interfaces.i_chest import IChest
+from resources.gem_registry import GEM_REGISTRY
+from .array_maze_carver import NUMPY_AVAILABLE, np, numpy_rng
 from .gem_loot_factory import GemLootFactory
 
 class ChestFactory:
     """
     Fábrica de cofres:
-    - Usa GemLootFactory para definir contenido.
+    - Usa GemLootFactory para definir contenido según una tabla de loot.
     - Decide tamaño del cofre (small/large) según probabilidad.
     - Genera un costo de apertura (`open_cost`) basado en una gema del contenido.
     - Cofres grandes tienen costo mayor que pequeños.
     - Algunos cofres pueden ser mimics según probabilidad.
     - Los mimics tienen un costo adicional (`mimic_cost`) más alto.
+    - create_chests(n) genera muchos cofres sorteando todo en arrays de NumPy
+      (misma distribución que create_chest, distinta secuencia para una semilla).
     """
+    # Probabilidades de cofre grande y de mimic; None toma las de la tabla de loot
+    LARGE_CHEST_PROB = None
+    MIMIC_PROB = None
 
-    def __init__(self, drop_prob: float = 0.5, large_chest_prob: float = 0.05, mimic_prob: float = 0.9):
-        self.loot_factory = GemLootFactory(drop_prob)
-        self.large_chest_prob = large_chest_prob
-        self.mimic_prob = mimic_prob
+    def __init__(self, loot_table: str = "chest", large_chest_prob: float = None, mimic_prob: float = None):
+        self.loot_factory = GemLootFactory(loot_table)
+        self.large_chest_prob = self.LARGE_CHEST_PROB if large_chest_prob is None else large_chest_prob
+        self.mimic_prob = self.MIMIC_PROB if mimic_prob is None else mimic_prob
 
-    def create_chest(self, is_mimic: bool | None = None) -> IChest:
+    def _odds(self):
+        """(probabilidad de cofre grande, probabilidad de mimic) vigentes."""
+        table = self.loot_factory.table
+        large = table.large_prob if self.large_chest_prob is None else self.large_chest_prob
+        mimic = table.mimic_prob if self.mimic_prob is None else self.mimic_prob
+        return large, mimic
+
+    def create_chest(self, is_mimic: bool | None = None, rng: random.Random = None) -> IChest:
+        rng = rng or random
+        large_prob, mimic_prob = self._odds()
         if is_mimic is None:
-            is_mimic = random.random() < self.mimic_prob
+            is_mimic = rng.random() < mimic_prob
 
-        contents = self.loot_factory.generate_loot()
-        is_large = random.random() < self.large_chest_prob
+        contents = self.loot_factory.generate_loot(rng)
+        is_large = rng.random() < large_prob
 
         # -------------------
         # open_cost (visible)
         # -------------------
         open_cost = {}
         if contents:
-            poder, _, cantidad = random.choice(contents)
-            factor = random.uniform(0.8, 1.5) if is_large else random.uniform(0.5, 1.0)
+            poder, _, cantidad = rng.choice(contents)
+            factor = rng.uniform(0.8, 1.5) if is_large else rng.uniform(0.5, 1.0)
             open_cost[poder] = max(1, int(cantidad * factor))
         else:
             # Cofre vacío, asignar costo mínimo
@@ -45,8 +62,8 @@ class ChestFactory:
         mimic_cost = {}
         if is_mimic:
             if contents:
-                poder, _, cantidad = random.choice(contents)
-                factor = random.uniform(1.5, 2.5)
+                poder, _, cantidad = rng.choice(contents)
+                factor = rng.uniform(1.5, 2.5)
                 mimic_cost[poder] = max(1, int(cantidad * factor))
             else:
                 # Cofre vacío, asignar costo mínimo
@@ -56,3 +73,66 @@ class ChestFactory:
         chest: IChest = Chest(contents, open_cost, mimic_cost, is_mimic)
         chest._is_large = is_large
         return chest
+
+    def create_chests(self, n: int, is_mimic: bool | None = None, rng: random.Random = None) -> List[IChest]:
+        """
+        Genera `n` cofres de una vez. Con NumPy sortea en bloque el loot, los
+        tamaños, los mimics, la gema de cada costo y sus factores, y solo el
+        montaje de los Chest queda en Python; sin NumPy llama a create_chest.
+        """
+        if not NUMPY_AVAILABLE:
+            return [self.create_chest(is_mimic, rng) for _ in range(n)]
+        if n <= 0:
+            return []
+
+        gen = numpy_rng(rng)
+        large_prob, mimic_prob = self._odds()
+        powers, drops, cantidades = self.loot_factory.generate_loot_arrays(n, gen)
+        if is_mimic is None:
+            mimics = gen.random(n) < mimic_prob
+        else:
+            mimics = np.full(n, is_mimic)
+        larges = gen.random(n) < large_prob
+
+        # -------------------
+        # Costos: gema al azar del contenido × factor uniforme
+        # -------------------
+        rows = np.arange(n)
+        open_gem = self._pick_dropped(drops, gen)
+        low = np.where(larges, 0.8, 0.5)
+        high = np.where(larges, 1.5, 1.0)
+        open_factor = low + (high - low) * gen.random(n)
+        open_qty = np.maximum(1, (cantidades[rows, open_gem] * open_factor).astype(np.int64))
+
+        mimic_gem = self._pick_dropped(drops, gen)
+        mimic_factor = 1.5 + gen.random(n)
+        mimic_qty = np.maximum(1, (cantidades[rows, mimic_gem] * mimic_factor).astype(np.int64))
+
+        # -------------------
+        # Montaje de los cofres
+        # -------------------
+        # Contenidos de todos los cofres como una sola lista plana de tuplas,
+        # cortada después por cofre (np.nonzero recorre la matriz por filas)
+        chest_index, gem_index = np.nonzero(drops)
+        names = [GEM_REGISTRY.name(poder) for poder in powers.tolist()]
+        flat = list(zip(powers[gem_index].tolist(), [names[i] for i in gem_index.tolist()],
+                        cantidades[chest_index, gem_index].tolist()))
+        ends = np.cumsum(drops.sum(axis=1)).tolist()
+        starts = [0] + ends[:-1]
+
+        chests: List[IChest] = []
+        for start, end, mimic, large, o_gem, o_qty, m_gem, m_qty in zip(
+                starts, ends, mimics.tolist(), larges.tolist(), powers[open_gem].tolist(), open_qty.tolist(),
+                powers[mimic_gem].tolist(), mimic_qty.tolist()):
+            chest: IChest = Chest(flat[start:end], {o_gem: o_qty}, {m_gem: m_qty} if mimic else {}, mimic)
+            chest._is_large = large
+            chests.append(chest)
+        return chests
+
+    @staticmethod
+    def _pick_dropped(drops: "np.ndarray", gen) -> "np.ndarray":
+        """Índice de una gema al azar entre las que caen en cada fila."""
+        counts = drops.sum(axis=1)
+        k = (gen.random(len(drops)) * counts).astype(np.int64)
+        # La k-ésima gema caída es la primera columna cuyo acumulado supera k
+        return (np.cumsum(drops, axis=1) > k[:, None]).argmax(axis=1)
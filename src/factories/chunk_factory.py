@@ -1,41 +1,59 @@
 # src/factories/chunk_factory.py
 import random
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+from core.chunk import Chunk
+from resources.tile_data import TILE_TREE, TILE_CLEAR
 from .maze_carver import MazeCarver
+from .array_maze_carver import ArrayMazeCarver, NUMPY_AVAILABLE
 
 class ChunkFactory:
     """
     Fábrica de chunks para el mapa.
+    Si NumPy está disponible usa ArrayMazeCarver (vectorizado) para los laberintos
+    y los lotes de claros; si no, MazeCarver. Un claro suelto siempre se genera en Python.
+    Ojo: con la misma semilla ambos motores producen laberintos distintos
+    (estadísticamente equivalentes), así que las repeticiones exactas
+    requieren el mismo motor. Los claros son idénticos con los dos.
     """
 
-    def __init__(self, chunk_size: int = 11, path_width_range: Tuple[int, int] = (1, 2)):
+    def __init__(self, chunk_size: int = 11, path_width_range: Tuple[int, int] = (1, 2), use_numpy: bool = None):
         self.chunk_size = chunk_size if chunk_size % 2 == 1 else chunk_size + 1
         self.path_width_range = path_width_range
         self.maze_carver = MazeCarver(self.chunk_size, path_width_range)
+        if use_numpy is None:
+            use_numpy = NUMPY_AVAILABLE
+        self.array_carver = ArrayMazeCarver(self.chunk_size, path_width_range) if use_numpy else None
 
     # -------------------------
-    # Constructores de tiles
+    # Generación de chunks
     # -------------------------
-    def make_tree(self) -> Tuple[str, int]:
-        return ("TREE", 0)
-
-    def make_grass(self) -> Tuple[str]:
-        return ("GRASS",)
+    def generate_maze_chunk(self, start_pos: Tuple[int, int] = None, rng: random.Random = None) -> Chunk:
+        if self.array_carver:
+            return self.array_carver.generate_maze_chunk(start_pos, rng)
+        chunk = Chunk(self.chunk_size, TILE_TREE)
+        return self.maze_carver.carve_maze(chunk, start_pos, rng)
 
-    def make_clear(self) -> Tuple[str]:
-        return ("CLEAR",)
+    def generate_clearing_chunk(self, rng: random.Random = None) -> Chunk:
+        # Siempre en Python: un claro solo pone 0-2 árboles y preparar NumPy cuesta más
+        rng = rng or random
+        chunk = Chunk(self.chunk_size, TILE_CLEAR)
+        num_trees = rng.randint(0, max(0, self.chunk_size // 8))
+        for _ in range(num_trees):
+            x, y = rng.randint(2, self.chunk_size - 3), rng.randint(2, self.chunk_size - 3)
+            chunk.set(x, y, TILE_TREE)
+        return chunk
 
     # -------------------------
-    # Generación de chunks
+    # Generación por lotes
     # -------------------------
-    def generate_maze_chunk(self, start_pos: Tuple[int, int] = None) -> List[List[Tuple]]:
-        chunk = [[self.make_tree() for _ in range(self.chunk_size)] for _ in range(self.chunk_size)]
-        return self.maze_carver.carve_maze(chunk, start_pos)
+    def generate_maze_chunks(self, rngs: Sequence[random.Random]) -> List[Chunk]:
+        """Genera un laberinto por cada rng; con NumPy se tallan todos a la vez."""
+        if self.array_carver:
+            return self.array_carver.generate_maze_chunks(rngs)
+        return [self.generate_maze_chunk(rng=rng) for rng in rngs]
 
-    def generate_clearing_chunk(self) -> List[List[Tuple]]:
-        chunk = [[self.make_clear() for _ in range(self.chunk_size)] for _ in range(self.chunk_size)]
-        num_trees = random.randint(0, max(0, self.chunk_size // 8))
-        for _ in range(num_trees):
-            x, y = random.randint(2, self.chunk_size - 3), random.randint(2, self.chunk_size - 3)
-            chunk[y][x] = self.make_tree()
-        return chunk
\ No newline at end of file
+    def generate_clearing_chunks(self, rngs: Sequence[random.Random]) -> List[Chunk]:
+        """Genera un claro por cada rng; con NumPy se pintan todos en un solo array."""
+        if self.array_carver:
+            return self.array_carver.generate_clearing_chunks(rngs)
+        return [self.generate_clearing_chunk(rng) for rng in rngs]
@@ -1,35 +1,36 @@
 # src/factories/gem_loot_factory.py
 import random
 from typing import List, Tuple
-from resources.gem_data import GEM_NAMES
+from resources.loot_tables import LOOT_TABLES, LootTable
 
 class GemLootFactory:
     """
     Fábrica que genera loot en forma de gemas.
-    Cada gema tiene chance de caer, con cantidad aleatoria.
-    La probabilidad depende del poder de la gema: más poder = más rara.
+    Las probabilidades salen de una tabla de loot (resources/loot_tables.json):
+    cuántas gemas se sortean, cuál sale en cada sorteo y en qué cantidad.
+    La tabla se consulta en cada cofre, así que una recarga en caliente
+    de LOOT_TABLES se aplica a los cofres siguientes.
+    generate_loot_arrays sortea el loot de muchos cofres a la vez con NumPy.
     """
 
-    def __init__(self, base_drop_prob: float = 0.5):
-        self.base_drop_prob = base_drop_prob
+    def __init__(self, table: str = "chest"):
+        self.table_name = table
 
-    def generate_loot(self) -> List[Tuple[int, str, int]]:
+    @property
+    def table(self) -> LootTable:
+        return LOOT_TABLES.get(self.table_name)
+
+    def generate_loot(self, rng: random.Random = None) -> List[Tuple[int, str, int]]:
         """
         Retorna lista de tuplas: (poder, nombre, cantidad).
         Garantiza al menos una gema.
         """
-        loot: List[Tuple[int, str, int]] = []
-        for poder, name in GEM_NAMES.items():
-            prob = self.base_drop_prob / (poder / 5)
-            if random.random() < prob:
-                max_cantidad = max(1, 6 - (poder // 10))
-                cantidad = random.randint(1, max_cantidad)
-                loot.append((poder, name, cantidad))
-
-        # Garantizar al menos una gema
-        if not loot:
-            poder, name = random.choice(list(GEM_NAMES.items()))
-            cantidad = 1
-            loot.append((poder, name, cantidad))
+        return self.table.sample_loot(rng)
 
-        return loot
+    def generate_loot_arrays(self, n: int, gen) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Loot de `n` cofres de una vez con el Generator de NumPy `gen`, con la
+        misma distribución que generate_loot. Devuelve (poderes, cae, cantidades):
+        poderes (G,) y dos matrices (n, G) con qué gemas caen y cuántas.
+        """
+        return self.table.sample_loot_arrays(n, gen)
@@ -1,6 +1,8 @@
 # src/factories/maze_carver.py
 import random
-from typing import List, Tuple
+from typing import Tuple
+from core.chunk import Chunk
+from resources.tile_data import TILE_TREE, TILE_GRASS
 
 class MazeCarver:
     """
@@ -14,12 +16,13 @@ class MazeCarver:
     # -------------------------
     # Carving principal
     # -------------------------
-    def carve_maze(self, chunk: List[List[Tuple[str, ...]]], start_pos: Tuple[int, int] = None) -> List[List[Tuple[str, ...]]]:
+    def carve_maze(self, chunk: Chunk, start_pos: Tuple[int, int] = None, rng: random.Random = None) -> Chunk:
+        rng = rng or random
         if not start_pos:
             start_pos = (self.chunk_size // 2, self.chunk_size // 2)
 
         start_x, start_y = start_pos
-        self.carve_center(chunk, start_x, start_y, width=max(1, random.randint(*self.path_width_range)))
+        self.carve_center(chunk, start_x, start_y, width=max(1, rng.randint(*self.path_width_range)))
 
         stack = [(start_x, start_y)]
         directions = [(2, 0), (0, 2), (-2, 0), (0, -2)]
@@ -28,12 +31,12 @@ class MazeCarver:
 
         while stack and path_cells < target_path_cells:
             current_x, current_y = stack[-1]
-            random.shuffle(directions)
+            rng.shuffle(directions)
             found = False
             for dx, dy in directions:
                 nx, ny = current_x + dx, current_y + dy
-                if 0 <= nx < self.chunk_size and 0 <= ny < self.chunk_size and chunk[ny][nx][0] == "TREE":
-                    width = random.randint(*self.path_width_range)
+                if 0 <= nx < self.chunk_size and 0 <= ny < self.chunk_size and chunk.get(nx, ny) == TILE_TREE:
+                    width = rng.randint(*self.path_width_range)
                     self.carve_between(chunk, current_x, current_y, nx, ny, width)
                     path_cells += 2
                     stack.append((nx, ny))
@@ -42,21 +45,21 @@ class MazeCarver:
             if not found:
                 stack.pop()
 
-        self.add_extra_paths(chunk, path_cells, target_path_cells)
+        self.add_extra_paths(chunk, path_cells, target_path_cells, rng)
         return chunk
 
     # -------------------------
     # Métodos de carving
     # -------------------------
-    def carve_center(self, chunk: List[List[Tuple[str, ...]]], x: int, y: int, width: int = 1):
+    def carve_center(self, chunk: Chunk, x: int, y: int, width: int = 1):
         half = width // 2
         for dy in range(-half, half + 1):
             for dx in range(-half, half + 1):
                 nx, ny = x + dx, y + dy
                 if 0 <= nx < self.chunk_size and 0 <= ny < self.chunk_size:
-                    chunk[ny][nx] = ("GRASS",)
+                    chunk.set(nx, ny, TILE_GRASS)
 
-    def carve_between(self, chunk: List[List[Tuple[str, ...]]], x1: int, y1: int, x2: int, y2: int, width: int = 1):
+    def carve_between(self, chunk: Chunk, x1: int, y1: int, x2: int, y2: int, width: int = 1):
         dx, dy = x2 - x1, y2 - y1
         half = width // 2
         wx, wy = x1 + dx // 2, y1 + dy // 2
@@ -65,24 +68,25 @@ class MazeCarver:
                 yy = y1 + off
                 for xx in (x1, wx, x2):
                     if 0 <= xx < self.chunk_size and 0 <= yy < self.chunk_size:
-                        chunk[yy][xx] = ("GRASS",)
+                        chunk.set(xx, yy, TILE_GRASS)
         else:
             for off in range(-half, half + 1):
                 xx = x1 + off
                 for yy in (y1, wy, y2):
                     if 0 <= xx < self.chunk_size and 0 <= yy < self.chunk_size:
-                        chunk[yy][xx] = ("GRASS",)
+                        chunk.set(xx, yy, TILE_GRASS)
 
-    def add_extra_paths(self, chunk: List[List[Tuple[str, ...]]], current_path_cells: int, target_path_cells: int):
+    def add_extra_paths(self, chunk: Chunk, current_path_cells: int, target_path_cells: int, rng: random.Random = None):
+        rng = rng or random
         directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
         attempts = 0
         while current_path_cells < target_path_cells and attempts < 200:
-            x = random.randint(1, self.chunk_size - 2)
-            y = random.randint(1, self.chunk_size - 2)
-            if chunk[y][x][0] == "TREE":
+            x = rng.randint(1, self.chunk_size - 2)
+            y = rng.randint(1, self.chunk_size - 2)
+            if chunk.get(x, y) == TILE_TREE:
                 adjacent_paths = sum(
                     1 for dx, dy in directions
-                    if 0 <= x + dx < self.chunk_size and 0 <= y + dy < self.chunk_size and chunk[y + dy][x + dx][0] == "GRASS"
+                    if 0 <= x + dx < self.chunk_size and 0 <= y + dy < self.chunk_size and chunk.get(x + dx, y + dy) == TILE_GRASS
                 )
                 if adjacent_paths >= 2:
                     self.carve_center(chunk, x, y, 1)
@@ -1,4 +1,7 @@
 from generators.chunk_generator import ChunkGenerator
+from generators.placement import bernoulli_positions, pick_position
+from generators.world_seed import chunk_rng, chunk_variants, new_world_seed
 
 
-__all__ = ["ChunkGenerator"]
\ No newline at end of file
+__all__ = ["ChunkGenerator", "bernoulli_positions", "pick_position",
+           "chunk_rng", "chunk_variants", "new_world_seed"]
@@ -1,5 +1,6 @@
 import random
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+from core.chunk import Chunk
 from factories.chunk_factory import ChunkFactory
 
 class ChunkGenerator:
@@ -8,22 +9,43 @@ class ChunkGenerator:
     Solo decide tipo y delega a ChunkFactory.
     """
 
-    def __init__(self, chunk_size: int = 11, path_width_range: Tuple[int, int] = (1, 2)):
+    def __init__(self, chunk_size: int = 11, path_width_range: Tuple[int, int] = (1, 2), use_numpy: bool = None):
         self.chunk_size = chunk_size if chunk_size % 2 == 1 else chunk_size + 1
         self.path_width_range = path_width_range
-        self.chunk_factory = ChunkFactory(chunk_size, path_width_range)
+        self.chunk_factory = ChunkFactory(chunk_size, path_width_range, use_numpy)
 
-    def generate_chunk(self, chunk_type: str = None) -> List[List[Tuple]]:
+    def generate_chunk(self, chunk_type: str = None, rng: random.Random = None) -> Chunk:
         """
         Genera un chunk completo.
         chunk_type puede ser "maze", "clearing" o None para random.
+        rng es el generador aleatorio del chunk (por defecto el módulo random global).
         """
+        rng = rng or random
         if chunk_type is None:
-            chunk_type = "clearing" if random.random() < 0.3 else "maze"  # 30% claros, 70% maze
+            chunk_type = "clearing" if rng.random() < 0.3 else "maze"  # 30% claros, 70% maze
 
         if chunk_type == "clearing":
-            return self.chunk_factory.generate_clearing_chunk()
+            return self.chunk_factory.generate_clearing_chunk(rng)
         elif chunk_type == "maze":
-            return self.chunk_factory.generate_maze_chunk()
+            return self.chunk_factory.generate_maze_chunk(rng=rng)
         else:
-            raise ValueError(f"Tipo de chunk desconocido: {chunk_type}")
\ No newline at end of file
+            raise ValueError(f"Tipo de chunk desconocido: {chunk_type}")
+
+    def generate_chunks(self, rngs: Sequence[random.Random]) -> List[Chunk]:
+        """
+        Genera un chunk por cada rng, en lote: decide el tipo de cada uno
+        y delega los laberintos y claros a ChunkFactory agrupados.
+        Cada chunk es idéntico al que daría generate_chunk(rng=rng).
+        """
+        chunks: List[Chunk] = [None] * len(rngs)
+        groups = {"clearing": [], "maze": []}
+        for i, rng in enumerate(rngs):
+            groups["clearing" if rng.random() < 0.3 else "maze"].append(i)
+
+        clearings = self.chunk_factory.generate_clearing_chunks([rngs[i] for i in groups["clearing"]])
+        mazes = self.chunk_factory.generate_maze_chunks([rngs[i] for i in groups["maze"]])
+        for i, chunk in zip(groups["clearing"], clearings):
+            chunks[i] = chunk
+        for i, chunk in zip(groups["maze"], mazes):
+            chunks[i] = chunk
+        return chunks
@@ -0,0 +1,135 @@
+import math
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Tuple
+from core.frame_profiler import PROFILER
+
+class ChunkPrefetcher:
+    """
+    Pre-genera chunks en hilos de fondo antes de que el jugador llegue a ellos:
+    - Predice, según la dirección y velocidad del movimiento, qué chunks pedir.
+    - Los hilos solo ejecutan Map.build_chunk (no tocan el estado del mapa), también
+      para chunks desalojados o guardados: el delta se aplica al instalarlos.
+    - Los chunks terminados se instalan en el hilo principal (poll / take).
+    - Si un chunk se necesita antes de estar listo, take() espera al hilo
+      si ya empezó, o lo cancela para que el mapa lo genere de forma síncrona.
+    """
+
+    def __init__(self, game_map, workers: int = 1, lookahead_seconds: float = 3.0, max_lookahead: int = 3):
+        self.game_map = game_map
+        self.lookahead_seconds = lookahead_seconds
+        self.max_lookahead = max_lookahead
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk-prefetch")
+        self.pending: Dict[Tuple[int, int], Future] = {}
+        self.last_request = None
+
+        # Contadores
+        self.requested = 0     # chunks encargados a los hilos
+        self.installed = 0     # chunks instalados desde poll()
+        self.taken_ready = 0   # chunks pedidos por el mapa que ya estaban listos
+        self.waited = 0        # chunks pedidos por el mapa mientras se generaban (espera)
+        self.fallbacks = 0     # chunks que el mapa tuvo que generar de forma síncrona
+
+    # ====================
+    # Predicción
+    # ====================
+    def update(self, x: int, y: int, vel_x: float, vel_y: float) -> None:
+        """
+        Encarga los chunks por delante del jugador en (x, y) moviéndose a (vel_x, vel_y) tiles/s
+        e instala los que ya estén terminados.
+        """
+        self.poll()
+        chunk_x, chunk_y = self.game_map.get_chunk_key(x, y)
+        step_x = (vel_x > 0) - (vel_x < 0)
+        step_y = (vel_y > 0) - (vel_y < 0)
+        request = (chunk_x, chunk_y, step_x, step_y)
+        if request == self.last_request:
+            return
+        self.last_request = request
+
+        if step_x == 0 and step_y == 0:
+            # Sin movimiento: anillo a distancia 2 alrededor del jugador
+            for dx in range(-2, 3):
+                for dy in range(-2, 3):
+                    if max(abs(dx), abs(dy)) == 2:
+                        self.request(chunk_x + dx, chunk_y + dy)
+            return
+
+        # Cuántos chunks por delante según la velocidad
+        speed = math.hypot(vel_x, vel_y)
+        tiles_ahead = speed * self.lookahead_seconds
+        distance = min(self.max_lookahead, 2 + int(tiles_ahead // self.game_map.chunk_size))
+
+        # Bloque 3x3 alrededor de cada paso en la dirección de movimiento (el más cercano primero)
+        for d in range(2, distance + 1):
+            center_x, center_y = chunk_x + step_x * d, chunk_y + step_y * d
+            for dx in (0, -1, 1):
+                for dy in (0, -1, 1):
+                    self.request(center_x + dx, center_y + dy)
+
+    def request(self, chunk_x: int, chunk_y: int) -> None:
+        key = (chunk_x, chunk_y)
+        game_map = self.game_map
+        # También los desalojados y los guardados: volver a una zona conocida no regenera en el frame
+        if key in self.pending or not game_map.needs_build(chunk_x, chunk_y):
+            return
+        self.pending[key] = self.executor.submit(game_map.build_chunk, chunk_x, chunk_y)
+        self.requested += 1
+
+    # ====================
+    # Entrega al hilo principal
+    # ====================
+    def poll(self) -> int:
+        """Instala en el mapa los chunks terminados. Devuelve cuántos se instalaron."""
+        done = [key for key, future in self.pending.items() if future.done()]
+        installed = 0
+        for key in done:
+            future = self.pending.pop(key)
+            if future.cancelled() or future.exception() is not None:
+                continue
+            self.game_map.adopt_chunk(key[0], key[1], future.result())
+            installed += 1
+        self.installed += installed
+        if installed:
+            PROFILER.count("prefetch_installed", installed)
+        return len(done)
+
+    def take(self, chunk_x: int, chunk_y: int):
+        """
+        Fallback síncrono para Map.ensure_chunk: devuelve el payload del chunk si está
+        terminado o en curso (esperándolo), o None si el mapa debe generarlo él mismo.
+        """
+        future = self.pending.pop((chunk_x, chunk_y), None)
+        if future is None:
+            return None
+        if future.done():
+            self.taken_ready += 1
+        elif future.cancel():
+            # Aún en cola: generar aquí es más rápido que esperar a los que van delante
+            self.fallbacks += 1
+            return None
+        else:
+            self.waited += 1
+        if future.exception() is not None:
+            self.fallbacks += 1
+            return None
+        PROFILER.count("prefetch_taken")
+        return future.result()
+
+    # ====================
+    # Ciclo de vida
+    # ====================
+    def shutdown(self) -> None:
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.pending),
+            "requested": self.requested,
+            "installed": self.installed,
+            "taken_ready": self.taken_ready,
+            "waited": self.waited,
+            "fallbacks": self.fallbacks,
+        }
@@ -0,0 +1,64 @@
+import math
+import random
+from typing import List, Optional, Tuple
+from core.chunk import Chunk
+
+# Con menos de esta fracción de celdas elegibles, pick_position deja de
+# sortear índices al azar y selecciona directamente la r-ésima elegible.
+_REJECTION_MIN_DENSITY = 0.25
+
+
+def bernoulli_positions(chunk: Chunk, code: int, probability: float,
+                        rng: random.Random = None) -> List[Tuple[int, int]]:
+    """
+    Posiciones locales (x, y) elegidas con probabilidad independiente `probability`
+    entre las celdas con el código dado, en orden de filas.
+
+    En lugar de un random() por celda se sortea el salto hasta el siguiente acierto
+    (distribución geométrica) sobre todo el chunk y se descartan los aciertos que
+    caen en celdas no elegibles: cada celda elegible sigue teniendo probabilidad
+    `probability`, pero el coste depende del número de aciertos y no del área.
+    """
+    rng = rng or random
+    tiles, size = chunk.tiles, chunk.size
+    if probability <= 0:
+        return []
+    if probability >= 1:
+        return list(chunk.positions(code))
+
+    log_q = math.log1p(-probability)
+    area = len(tiles)
+    positions = []
+    index = -1
+    while True:
+        # Número de fallos antes del siguiente acierto: floor(log(U) / log(1 - p))
+        index += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if index >= area:
+            return positions
+        if tiles[index] == code:
+            positions.append((index % size, index // size))
+
+
+def pick_position(chunk: Chunk, code: int, rng: random.Random = None) -> Optional[Tuple[int, int]]:
+    """
+    Elige una posición uniforme entre las celdas con el código dado, o None si no hay.
+    - Celdas elegibles abundantes (claros): índices al azar hasta caer en una elegible.
+    - Escasas: se sortea r y se salta a la r-ésima con bytearray.find.
+    """
+    rng = rng or random
+    tiles, size = chunk.tiles, chunk.size
+    count = tiles.count(code)
+    if count == 0:
+        return None
+
+    area = len(tiles)
+    if count >= area * _REJECTION_MIN_DENSITY:
+        while True:
+            index = rng.randrange(area)
+            if tiles[index] == code:
+                return index % size, index // size
+
+    index = tiles.find(code)
+    for _ in range(rng.randrange(count)):
+        index = tiles.find(code, index + 1)
+    return index % size, index // size
@@ -0,0 +1,31 @@
+import random
+
+# Streams independientes por chunk: cambiar cómo se colocan las gemas
+# no altera el terreno ni los cofres del mismo chunk.
+STREAM_TILES = "tiles"
+STREAM_GEMS = "gems"
+STREAM_CHESTS = "chests"
+STREAM_PORTAL = "portal"
+STREAM_VARIANTS = "variants"
+
+
+def new_world_seed() -> int:
+    """Genera una semilla de mundo aleatoria."""
+    return random.getrandbits(63)
+
+
+def chunk_rng(seed: int, chunk_x: int, chunk_y: int, stream: str = STREAM_TILES) -> random.Random:
+    """
+    Devuelve un random.Random propio del chunk (seed, chunk_x, chunk_y) y del stream dado.
+    La semilla en texto se hashea con SHA-512, por lo que es estable entre ejecuciones y procesos.
+    """
+    return random.Random(f"{seed}:{chunk_x}:{chunk_y}:{stream}")
+
+
+def chunk_variants(seed: int, chunk_x: int, chunk_y: int, area: int, num_variants: int) -> bytes:
+    """
+    Sortea una variante visual por celda del chunk, en bloque:
+    bytes aleatorios reducidos módulo num_variants con una tabla de traducción.
+    """
+    table = bytes(i % num_variants for i in range(256))
+    return chunk_rng(seed, chunk_x, chunk_y, STREAM_VARIANTS).randbytes(area).translate(table)
@@ -2,6 +2,7 @@ import pygame
 from controllers.screens import MenuScreen, GameScreen, GameOverScreen, WinScreen
 from controllers import GameManager, HUDController, MimicDecisionController
 from audio_manager import AudioManager
+from core.frame_profiler import PROFILER
 import os
 
 # --------------------------
@@ -12,6 +13,9 @@ CHUNK_SIZE = 21
 WIDTH, HEIGHT = 1000, 700
 COLOR_TEXT = (255, 255, 255)
 FPS = 120
+# GEM_RUSH_PROFILE=1 mide cada fase del frame desde el arranque (F3 lo activa en partida)
+PROFILER.enabled = os.environ.get("GEM_RUSH_PROFILE") == "1"
+PROFILER.budget_ms = 1000 / FPS
 audio_manager = AudioManager()
 pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -49,6 +53,7 @@ def change_screen(screen_name, game_over_message=None):
         hud.clear_messages()
         current_screen = GameScreen(screen, game_manager, hud, mimic_controller, change_screen)
     elif screen_name == "quit":
+        game_manager.close()
         pygame.quit()
         exit()
         
@@ -61,32 +66,39 @@ change_screen("menu")
 running = True
 while running:
     dt = clock.tick(FPS) / 1000.0  # delta time en segundos
+    # El frame se mide desde aquí: la espera de clock.tick no cuenta
+    PROFILER.begin_frame()
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        else:
-            # Enviar eventos a la pantalla actual
-            if hasattr(current_screen, "is_paused") and current_screen.is_paused:
-                current_screen.pause_screen.handle_event(event)
+    with PROFILER.timer("events"):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
             else:
-                current_screen.handle_event(event)
+                # Enviar eventos a la pantalla actual
+                if hasattr(current_screen, "is_paused") and current_screen.is_paused:
+                    current_screen.pause_screen.handle_event(event)
+                else:
+                    current_screen.handle_event(event)
 
     # Actualizar
-    if hasattr(current_screen, "is_paused") and current_screen.is_paused:
-        current_screen.pause_screen.update(dt)
-    else:
-        current_screen.update(dt)
+    with PROFILER.timer("update"):
+        if hasattr(current_screen, "is_paused") and current_screen.is_paused:
+            current_screen.pause_screen.update(dt)
+        else:
+            current_screen.update(dt)
 
-        # Comprobar Game Over
-        if hasattr(current_screen, "game") and not current_screen.game.player.get_state():
-            change_screen("game_over")
+            # Comprobar Game Over
+            if hasattr(current_screen, "game") and not current_screen.game.player.get_state():
+                change_screen("game_over")
 
     # Renderizar
-    if hasattr(current_screen, "is_paused") and current_screen.is_paused:
-        # Renderiza el juego de fondo y encima la pausa
-        current_screen.render()
-    else:
-        current_screen.render()
+    with PROFILER.timer("render"):
+        if hasattr(current_screen, "is_paused") and current_screen.is_paused:
+            # Renderiza el juego de fondo y encima la pausa
+            current_screen.render()
+        else:
+            current_screen.render()
+    PROFILER.end_frame()
 
+game_manager.close()
 pygame.quit()
@@ -1,3 +1,8 @@
-from resources.gem_data import GEM_NAMES
+from resources.gem_data import GEM_NAMES, GEM_COLORS
+from resources.gem_registry import GemType, GemRegistry, GEM_REGISTRY
+from resources.loot_tables import AliasTable, LootTable, LootTableRegistry, LOOT_TABLES
+from resources.tile_data import TILE_TREE, TILE_GRASS, TILE_CLEAR, TILE_NAMES, TILE_CODES
 
-__all__ = ["GEM_NAMES"]
\ No newline at end of file
+__all__ = ["GEM_NAMES", "GEM_COLORS", "GemType", "GemRegistry", "GEM_REGISTRY",
+           "AliasTable", "LootTable", "LootTableRegistry", "LOOT_TABLES",
+           "TILE_TREE", "TILE_GRASS", "TILE_CLEAR", "TILE_NAMES", "TILE_CODES"]
@@ -8,3 +8,13 @@ GEM_NAMES = {
     30: "Blood Ruby of the Ancients",  # Fuerza y sacrificio
     50: "Obsidian of the Void"         # Gema clave para el portal
 }
+
+# Color con el que se dibuja cada gema en el mapa (RGB)
+GEM_COLORS = {
+    5: (0, 255, 255),
+    10: (0, 255, 0),
+    15: (255, 255, 0),
+    20: (255, 165, 0),
+    30: (255, 0, 0),
+    50: (255, 255, 255)
+}
@@ -0,0 +1,59 @@
+from typing import Dict, List, Tuple
+from resources.gem_data import GEM_NAMES, GEM_COLORS
+
+DEFAULT_GEM_COLOR = (255, 255, 255)
+
+
+class GemType:
+    """Metadatos compartidos de un tipo de gema (uno por poder, no uno por nodo)."""
+    __slots__ = ("power", "name", "color")
+
+    def __init__(self, power: int, name: str, color: Tuple[int, int, int] = DEFAULT_GEM_COLOR):
+        self.power = power
+        self.name = name
+        self.color = color
+
+    def __repr__(self):
+        return f"GemType({self.power}, {self.name!r})"
+
+
+class GemRegistry:
+    """
+    Registro único de tipos de gema, indexado por poder.
+    Un poder desconocido (p. ej. de un guardado corrupto) devuelve un tipo
+    provisional con nombre genérico que no se registra: consultar nunca falla
+    ni modifica el registro, y solo register() añade tipos.
+    """
+
+    def __init__(self, names: Dict[int, str] = None, colors: Dict[int, Tuple[int, int, int]] = None):
+        self.types: Dict[int, GemType] = {}
+        self.defined: List[int] = []
+        colors = colors or {}
+        for power, name in (names or {}).items():
+            self.register(power, name, colors.get(power, DEFAULT_GEM_COLOR))
+            self.defined.append(power)
+
+    def register(self, power: int, name: str, color: Tuple[int, int, int] = DEFAULT_GEM_COLOR) -> GemType:
+        gem_type = GemType(power, name, color)
+        self.types[power] = gem_type
+        return gem_type
+
+    def get(self, power: int) -> GemType:
+        gem_type = self.types.get(power)
+        if gem_type is None:
+            return GemType(power, f"Gema {power}")
+        return gem_type
+
+    def name(self, power: int) -> str:
+        return self.get(power).name
+
+    def color(self, power: int) -> Tuple[int, int, int]:
+        return self.get(power).color
+
+    def powers(self) -> List[int]:
+        """Poderes de los tipos definidos en los datos del juego (sin los añadidos con register())."""
+        return list(self.defined)
+
+
+# Instancia compartida por el mapa, el inventario y las vistas
+GEM_REGISTRY = GemRegistry(GEM_NAMES, GEM_COLORS)
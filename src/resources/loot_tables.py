@@ -0,0 +1,195 @@
+import json
+import os
+import random
+from typing import Any, Dict, Hashable, List, Mapping, Tuple
+from resources.gem_registry import GEM_REGISTRY
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo usa sample_loot_arrays
+    np = None
+
+LOOT_TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loot_tables.json")
+
+
+class AliasTable:
+    """
+    Distribución discreta {valor: peso} compilada con el método alias de Walker
+    (construcción de Vose): cada muestra cuesta un random() y una comparación,
+    sin importar cuántos valores haya.
+    """
+    __slots__ = ("values", "prob", "alias", "n", "_arrays")
+
+    def __init__(self, weights: Mapping[Hashable, float]):
+        items = [(value, float(weight)) for value, weight in weights.items() if weight > 0]
+        if not items:
+            raise ValueError("La distribución no tiene pesos positivos")
+        n = len(items)
+        total = sum(weight for _, weight in items)
+        scaled = [weight * n / total for _, weight in items]
+
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Lo que queda en cualquiera de las listas tiene probabilidad 1 (salvo redondeo)
+
+        self.values = [value for value, _ in items]
+        self.prob = prob
+        self.alias = alias
+        self.n = n
+        self._arrays = None
+
+    def sample(self, rng: random.Random = None):
+        u = (rng or random).random() * self.n
+        i = int(u)
+        return self.values[i] if u - i < self.prob[i] else self.values[self.alias[i]]
+
+    def arrays(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(prob, alias) como arrays de NumPy, calculados una vez."""
+        if self._arrays is None:
+            self._arrays = (np.array(self.prob), np.array(self.alias, dtype=np.int64))
+        return self._arrays
+
+    def sample_indices(self, gen, size: int) -> "np.ndarray":
+        """`size` muestras de una vez con el Generator `gen`, como índices en `values`."""
+        prob, alias = self.arrays()
+        u = gen.random(size) * self.n
+        i = np.minimum(u.astype(np.int64), self.n - 1)
+        return np.where(u - i < prob[i], i, alias[i])
+
+
+def _quantity_weights(spec) -> Dict[int, float]:
+    """[min, max] es uniforme entre ambos (incluidos); un dict da pesos por cantidad."""
+    if isinstance(spec, dict):
+        return {int(cantidad): weight for cantidad, weight in spec.items()}
+    low, high = spec
+    return {cantidad: 1.0 for cantidad in range(low, high + 1)}
+
+
+class LootTable:
+    """
+    Tabla de loot de cofre compilada:
+    - stacks: cuántas veces se sortea una gema (mínimo 1: nunca hay cofres vacíos).
+    - gems: qué gema sale en cada sorteo; si se repite, se suman las cantidades.
+    - quantity: cantidad por gema, [min, max] uniforme o {cantidad: peso}.
+    - large_prob / mimic_prob: probabilidad de cofre grande y de mimic.
+    Todo son tablas alias, así que un cofre cuesta O(sorteos) y no O(tipos de gema).
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.large_prob = float(spec.get("large_prob", 0.0))
+        self.mimic_prob = float(spec.get("mimic_prob", 0.0))
+        self.stacks = AliasTable({int(k): weight for k, weight in spec["stacks"].items()})
+        if min(self.stacks.values) < 1:
+            raise ValueError(f"Tabla de loot '{name}': stacks debe ser al menos 1")
+        gems = {int(poder): weight for poder, weight in spec["gems"].items()}
+        self.gems = AliasTable(dict(sorted(gems.items())))
+        quantity = spec.get("quantity", {})
+        self.quantity = {poder: AliasTable(_quantity_weights(quantity.get(str(poder), [1, 1])))
+                         for poder in self.gems.values}
+        self._quantity_arrays = None
+
+    def sample_loot(self, rng: random.Random = None) -> List[Tuple[int, str, int]]:
+        """Contenido de un cofre: lista de (poder, nombre, cantidad) por poder creciente."""
+        rng = rng or random
+        loot: Dict[int, int] = {}
+        for _ in range(self.stacks.sample(rng)):
+            poder = self.gems.sample(rng)
+            loot[poder] = loot.get(poder, 0) + self.quantity[poder].sample(rng)
+        return [(poder, GEM_REGISTRY.name(poder), cantidad) for poder, cantidad in sorted(loot.items())]
+
+    def sample_loot_arrays(self, n: int, gen) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Loot de `n` cofres de una vez. Devuelve (poderes, cae, cantidades):
+        poderes (G,) crecientes y dos matrices (n, G) con qué gemas caen y cuántas.
+        """
+        gem_powers = np.array(self.gems.values, dtype=np.int64)
+        stack_values = np.array(self.stacks.values, dtype=np.int64)
+        q_values, q_prob, q_alias, q_n = self._quantity_tables()
+
+        stacks = stack_values[self.stacks.sample_indices(gen, n)]
+        chest = np.repeat(np.arange(n), stacks)
+        gem = self.gems.sample_indices(gen, len(chest))
+
+        # Alias de la cantidad con la tabla de la gema de cada sorteo (tablas rellenadas a lo ancho)
+        u = gen.random(len(chest)) * q_n[gem]
+        j = np.minimum(u.astype(np.int64), q_n[gem] - 1)
+        j = np.where(u - j < q_prob[gem, j], j, q_alias[gem, j])
+        qty = q_values[gem, j]
+
+        g = len(gem_powers)
+        cantidades = np.bincount(chest * g + gem, weights=qty, minlength=n * g).astype(np.int64).reshape(n, g)
+        return gem_powers, cantidades > 0, cantidades
+
+    def _quantity_tables(self):
+        if self._quantity_arrays is None:
+            tables = [self.quantity[poder] for poder in self.gems.values]
+            width = max(table.n for table in tables)
+            values = np.zeros((len(tables), width), dtype=np.int64)
+            prob = np.ones((len(tables), width))
+            alias = np.zeros((len(tables), width), dtype=np.int64)
+            for row, table in enumerate(tables):
+                values[row, :table.n] = table.values
+                prob[row, :table.n] = table.prob
+                alias[row, :table.n] = table.alias
+            self._quantity_arrays = (values, prob, alias, np.array([table.n for table in tables]))
+        return self._quantity_arrays
+
+
+class LootTableRegistry:
+    """
+    Tablas de loot leídas de un JSON en resources/ y compiladas una sola vez:
+    get() es una consulta a un dict. reload() vuelve a leer el archivo si
+    cambió en disco (recarga en caliente para sesiones de balance) y asignar
+    `path` cambia de archivo y lo carga.
+    """
+
+    def __init__(self, path: str = LOOT_TABLES_PATH):
+        self._path = path
+        self.tables: Dict[str, LootTable] = {}
+        self._mtime = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @path.setter
+    def path(self, path: str):
+        if path != self._path:
+            self._path = path
+            self.load()
+
+    def load(self) -> None:
+        mtime = os.path.getmtime(self._path)
+        with open(self._path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Se compila todo antes de sustituir: un archivo con errores deja las tablas anteriores
+        self.tables = {name: LootTable(name, spec) for name, spec in data.items()}
+        self._mtime = mtime
+
+    def reload(self) -> bool:
+        """Recarga si el archivo cambió desde la última lectura. True si recargó."""
+        if self._mtime is not None and os.path.getmtime(self._path) == self._mtime:
+            return False
+        self.load()
+        return True
+
+    def get(self, name: str) -> LootTable:
+        if self._mtime is None:
+            self.load()
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise KeyError(f"Tabla de loot desconocida: {name}") from None
+
+
+# Instancia compartida por las fábricas de cofres
+LOOT_TABLES = LootTableRegistry()
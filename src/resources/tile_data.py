@@ -0,0 +1,15 @@
+# Códigos enteros de los tipos de tile (un byte por celda dentro de cada Chunk)
+TILE_TREE = 0
+TILE_GRASS = 1
+TILE_CLEAR = 2
+
+TILE_NAMES = {
+    TILE_TREE: "TREE",
+    TILE_GRASS: "GRASS",
+    TILE_CLEAR: "CLEAR"
+}
+
+TILE_CODES = {name: code for code, name in TILE_NAMES.items()}
+
+# Representación en tupla compatible con IMap.get_tile (indexada por código)
+TILE_TUPLES = (("TREE", 0), ("GRASS",), ("CLEAR",))
@@ -0,0 +1,3 @@
+from simulation.balance import BalanceRun, aggregate, apply_params, default_params, play
+
+__all__ = ["BalanceRun", "aggregate", "apply_params", "default_params", "play"]
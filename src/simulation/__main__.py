@@ -0,0 +1,9 @@
+import os
+import sys
+
+# El resumen sale por stdout en JSON: sin el saludo de pygame
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from simulation.balance import main
+
+sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Motor Monte Carlo para equilibrar la economía de gemas.
+
+Juega miles de partidas sin pantalla (GameSimulation sobre las clases reales del
+juego) repartidas en lotes por un pool de procesos, y agrega tasa de victoria,
+pasos hasta el portal, muertes por causa y la distribución del valor final
+del inventario. Cada lote terminado se escribe en su propio archivo, así que
+una ejecución interrumpida se reanuda lanzando el mismo comando.
+
+Uso (desde src/):
+    python -m simulation --runs 2000 --workers 4 --out ../data/balance/base
+    python -m simulation --runs 2000 --set mimic_prob=0.5 --set portal_cost_range=20,40 \\
+        --out ../data/balance/cheap_portal
+"""
+import argparse
+import ast
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se agrega en Python puro
+    np = None
+
+# ====================
+# Parámetros de balance
+# ====================
+# nombre -> (módulo, objeto, atributo que lo define); None en los de cofre toma la tabla de loot
+PARAMETERS = {
+    "gem_probability": ("core.managers.gem_manager", "GemManager", "GEM_PROBABILITY"),
+    "chest_probability": ("core.managers.chest_manager", "ChestManager", "CHEST_PROBABILITY"),
+    "loot_tables": ("resources.loot_tables", "LOOT_TABLES", "path"),
+    "large_chest_prob": ("factories.chest_factory", "ChestFactory", "LARGE_CHEST_PROB"),
+    "mimic_prob": ("factories.chest_factory", "ChestFactory", "MIMIC_PROB"),
+    "portal_cost_range": ("core.portal", "Portal", "COST_RANGE"),
+    "mimic_fight_death": ("controllers.chest_controller", "ChestController", "MIMIC_FIGHT_DEATH_CHANCE"),
+    "thief_fight_death": ("controllers.thief_event_controller", "ThiefEventController", "FIGHT_DEATH_CHANCE"),
+    "thief_factor": ("controllers.game_simulation", "GameSimulation", "THIEF_FACTOR"),
+    "thief_max_chance": ("controllers.game_simulation", "GameSimulation", "THIEF_MAX_CHANCE"),
+    "trap_factor": ("controllers.game_simulation", "GameSimulation", "TRAP_FACTOR"),
+    "trap_max_chance": ("controllers.game_simulation", "GameSimulation", "TRAP_MAX_CHANCE"),
+}
+
+OUTCOMES = ("timeout", "win", "death")
+DEATH_CAUSES = ("none", "thief", "mimic")
+# Un registro por partida: enteros para poder apilarlos en un array
+RECORD_FIELDS = ("seed", "outcome", "cause", "steps", "value", "gems", "chests", "mimics", "thieves", "traps")
+
+
+def _target(name: str):
+    import importlib
+    module, cls, attribute = PARAMETERS[name]
+    return getattr(importlib.import_module(module), cls), attribute
+
+
+def default_params() -> Dict[str, object]:
+    """Valores actuales de todos los parámetros de balance."""
+    params = {}
+    for name in PARAMETERS:
+        cls, attribute = _target(name)
+        params[name] = getattr(cls, attribute)
+    return params
+
+
+def apply_params(params: Dict[str, object]) -> Dict[str, object]:
+    """Fija los parámetros en sus objetos y devuelve los valores anteriores (para restaurarlos)."""
+    previous = {}
+    for name, value in params.items():
+        if name not in PARAMETERS:
+            raise KeyError(f"Parámetro de balance desconocido: {name}")
+        cls, attribute = _target(name)
+        previous[name] = getattr(cls, attribute)
+        setattr(cls, attribute, tuple(value) if isinstance(value, list) else value)
+    return previous
+
+
+# ====================
+# Una partida
+# ====================
+def play(seed: int, max_steps: int = 5000, policy: str = "seeker", fight_probability: float = 0.0,
+         starting_gems: Dict[int, int] = None) -> Tuple[int, ...]:
+    """
+    Juega una partida sin pantalla con los parámetros ya aplicados y devuelve
+    su registro (ver RECORD_FIELDS). Todo el azar sale de `seed`.
+    """
+    from controllers.game_simulation import GameSimulation, RandomWalkPolicy, SeekerPolicy
+
+    # Los controladores usan el random global (cofres, ladrón, mimic)
+    random.seed(seed)
+    policy_class = {"random": RandomWalkPolicy, "seeker": SeekerPolicy}[policy]
+    sim = GameSimulation.create(seed=seed, policy=policy_class(random.Random(seed * 2 + 1), fight_probability),
+                                rng=random.Random(seed * 2))
+    inventory = sim.game.player_inventory
+    for poder, cantidad in (starting_gems or {}).items():
+        inventory.insert(int(poder), cantidad)
+
+    counts = {"gem": 0, "chest": 0, "mimic": 0, "thief": 0, "trap": 0}
+    try:
+        while sim.outcome is None and sim.steps < max_steps:
+            for event in sim.step(*sim.policy.next_action(sim)):
+                kind = event["type"]
+                if kind == "chest":
+                    if event.get("mimic"):
+                        counts["mimic"] += 1
+                    if event.get("success"):
+                        counts["chest"] += 1
+                elif kind in counts:
+                    counts[kind] += 1
+    finally:
+        sim.game.close()
+
+    return (seed, OUTCOMES.index(sim.outcome or "timeout"), DEATH_CAUSES.index(sim.death_cause or "none"),
+            sim.steps, inventory.total_value(), counts["gem"], counts["chest"], counts["mimic"],
+            counts["thief"], counts["trap"])
+
+
+def run_batch(seeds: Sequence[int], params: Dict[str, object], options: Dict[str, object]) -> List[Tuple[int, ...]]:
+    """Juega un lote de partidas (punto de entrada de los procesos del pool)."""
+    previous = apply_params(params)
+    try:
+        return [play(seed, **options) for seed in seeds]
+    finally:
+        apply_params(previous)
+
+
+# ====================
+# Ejecución por lotes reanudable
+# ====================
+class BalanceRun:
+    """
+    Una configuración de balance jugada `runs` veces en lotes de `batch_size`.
+    - `directory` guarda manifest.json (configuración) y batch_NNNNN.json por lote.
+    - Al reanudar solo se juegan los lotes que faltan; si la configuración del
+      directorio no coincide con la pedida se lanza ValueError.
+    """
+
+    def __init__(self, directory: str, params: Dict[str, object] = None, runs: int = 1000,
+                 batch_size: int = 50, base_seed: int = 0, max_steps: int = 5000, policy: str = "seeker",
+                 fight_probability: float = 0.0, starting_gems: Dict[int, int] = None):
+        self.directory = directory
+        self.params = dict(default_params(), **(params or {}))
+        self.runs = runs
+        self.batch_size = batch_size
+        self.base_seed = base_seed
+        self.options = {
+            "max_steps": max_steps,
+            "policy": policy,
+            "fight_probability": fight_probability,
+            "starting_gems": {str(poder): cantidad for poder, cantidad in (starting_gems or {}).items()},
+        }
+        os.makedirs(directory, exist_ok=True)
+        self._check_manifest()
+
+    def _manifest(self) -> dict:
+        return {
+            "params": {name: list(value) if isinstance(value, tuple) else value
+                       for name, value in sorted(self.params.items())},
+            "runs": self.runs,
+            "batch_size": self.batch_size,
+            "base_seed": self.base_seed,
+            "options": self.options,
+        }
+
+    def _check_manifest(self) -> None:
+        path = os.path.join(self.directory, "manifest.json")
+        manifest = self._manifest()
+        if os.path.exists(path):
+            with open(path) as f:
+                if json.load(f) != manifest:
+                    raise ValueError(f"{self.directory} contiene otra configuración de balance")
+            return
+        self._write_json(path, manifest)
+
+    @staticmethod
+    def _write_json(path: str, data) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _batch_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"batch_{index:05d}.json")
+
+    def batches(self) -> List[List[int]]:
+        seeds = range(self.base_seed, self.base_seed + self.runs)
+        return [list(seeds[i:i + self.batch_size]) for i in range(0, self.runs, self.batch_size)]
+
+    def pending(self) -> List[int]:
+        return [index for index in range(len(self.batches())) if not os.path.exists(self._batch_path(index))]
+
+    def run(self, workers: int = None, progress=None) -> dict:
+        """
+        Juega los lotes pendientes y devuelve el agregado de todos los registros.
+        `workers` = 0 juega en este proceso; None usa un proceso por CPU.
+        `progress(hechos, total)` se llama al terminar cada lote.
+        """
+        batches = self.batches()
+        pending = self.pending()
+        done = len(batches) - len(pending)
+        if workers == 0:
+            for index in pending:
+                self._write_json(self._batch_path(index), run_batch(batches[index], self.params, self.options))
+                done += 1
+                if progress:
+                    progress(done, len(batches))
+        elif pending:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_batch, batches[index], self.params, self.options): index
+                           for index in pending}
+                for future in as_completed(futures):
+                    self._write_json(self._batch_path(futures[future]), future.result())
+                    done += 1
+                    if progress:
+                        progress(done, len(batches))
+        return aggregate(self.records())
+
+    def records(self) -> List[List[int]]:
+        records = []
+        for index in range(len(self.batches())):
+            path = self._batch_path(index)
+            if os.path.exists(path):
+                with open(path) as f:
+                    records.extend(json.load(f))
+        return records
+
+
+# ====================
+# Agregación
+# ====================
+VALUE_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+def aggregate(records: Sequence[Sequence[int]], bins: int = 10) -> dict:
+    """
+    Resume los registros: partidas, tasa de victoria, pasos hasta el portal,
+    muertes por causa, eventos medios por partida y distribución del valor final.
+    Con NumPy se calcula sobre un único array (n, campos).
+    """
+    if not records:
+        return {"runs": 0}
+    if np is None:
+        return _aggregate_python(records, bins)
+
+    data = np.asarray(records, dtype=np.int64)
+    column = {name: data[:, i] for i, name in enumerate(RECORD_FIELDS)}
+    wins = column["outcome"] == OUTCOMES.index("win")
+    win_steps = column["steps"][wins]
+    causes = np.bincount(column["cause"], minlength=len(DEATH_CAUSES))
+    outcomes = np.bincount(column["outcome"], minlength=len(OUTCOMES))
+    counts, edges = np.histogram(column["value"], bins=bins)
+    return {
+        "runs": len(data),
+        "outcomes": {name: int(outcomes[i]) for i, name in enumerate(OUTCOMES)},
+        "win_rate": float(wins.mean()),
+        "steps_to_portal": {
+            "mean": float(win_steps.mean()) if len(win_steps) else None,
+            "p50": float(np.percentile(win_steps, 50)) if len(win_steps) else None,
+            "p90": float(np.percentile(win_steps, 90)) if len(win_steps) else None,
+        },
+        "deaths": {name: int(causes[i]) for i, name in enumerate(DEATH_CAUSES) if name != "none"},
+        "per_run": {name: float(column[name].mean()) for name in ("gems", "chests", "mimics", "thieves", "traps")},
+        "value": dict(
+            {"mean": float(column["value"].mean())},
+            **{f"p{q}": float(v) for q, v in zip(VALUE_PERCENTILES, np.percentile(column["value"], VALUE_PERCENTILES))}),
+        "value_histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+    }
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Percentil con interpolación lineal (mismo criterio que numpy.percentile)."""
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def _aggregate_python(records: Sequence[Sequence[int]], bins: int) -> dict:
+    index = {name: i for i, name in enumerate(RECORD_FIELDS)}
+    runs = len(records)
+    win = OUTCOMES.index("win")
+    win_steps = sorted(r[index["steps"]] for r in records if r[index["outcome"]] == win)
+    values = sorted(r[index["value"]] for r in records)
+
+    low, high = values[0], values[-1]
+    width = (high - low) / bins or 1
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    edges = [low + width * i for i in range(bins + 1)] if high > low else [low - 0.5 + i / bins for i in range(bins + 1)]
+
+    return {
+        "runs": runs,
+        "outcomes": {name: sum(1 for r in records if r[index["outcome"]] == i) for i, name in enumerate(OUTCOMES)},
+        "win_rate": len(win_steps) / runs,
+        "steps_to_portal": {
+            "mean": sum(win_steps) / len(win_steps) if win_steps else None,
+            "p50": _percentile(win_steps, 50) if win_steps else None,
+            "p90": _percentile(win_steps, 90) if win_steps else None,
+        },
+        "deaths": {name: sum(1 for r in records if r[index["cause"]] == i)
+                   for i, name in enumerate(DEATH_CAUSES) if name != "none"},
+        "per_run": {name: sum(r[index[name]] for r in records) / runs
+                    for name in ("gems", "chests", "mimics", "thieves", "traps")},
+        "value": dict({"mean": sum(values) / runs},
+                      **{f"p{q}": float(_percentile(values, q)) for q in VALUE_PERCENTILES}),
+        "value_histogram": {"edges": edges, "counts": counts},
+    }
+
+
+# ====================
+# Línea de comandos
+# ====================
+def _parse_assignment(text: str) -> Tuple[str, object]:
+    name, _, value = text.partition("=")
+    return name.strip(), ast.literal_eval(value.strip())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="directorio de resultados (se reanuda si ya existe)")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None, help="procesos (0 = en este proceso)")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de la primera partida")
+    parser.add_argument("--max-steps", type=int, default=5000)
+    parser.add_argument("--policy", choices=("seeker", "random"), default="seeker")
+    parser.add_argument("--fight", type=float, default=0.0, help="probabilidad de pelear con ladrón y mimic")
+    parser.add_argument("--set", action="append", default=[], metavar="NOMBRE=VALOR",
+                        help="parámetro de balance: " + ", ".join(PARAMETERS))
+    args = parser.parse_args(argv)
+
+    balance = BalanceRun(args.out, dict(_parse_assignment(text) for text in args.set), runs=args.runs,
+                         batch_size=args.batch_size, base_seed=args.seed, max_steps=args.max_steps,
+                         policy=args.policy, fight_probability=args.fight)
+    summary = balance.run(args.workers, progress=lambda done, total: print(f"lotes {done}/{total}", file=sys.stderr))
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
 from views.inventory_formatter import InventoryFormatter
+from views.profiler_overlay import ProfilerOverlay
+from views.terrain_renderer import TerrainRenderer
+from views.viewport import Viewport
 
-__all__ = ["InventoryFormatter"]
\ No newline at end of file
+__all__ = ["InventoryFormatter", "ProfilerOverlay", "TerrainRenderer", "Viewport"]
\ No newline at end of file
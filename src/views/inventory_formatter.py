@@ -1,4 +1,4 @@
-from resources.gem_data import GEM_NAMES
+from resources.gem_registry import GEM_REGISTRY
 from core.inventory import Inventory
 
 class InventoryFormatter:
@@ -13,7 +13,7 @@ class InventoryFormatter:
         lines = []
         for node in elements:
             # Convertimos el poder en nombre de gema
-            nombre = GEM_NAMES.get(int(node.poder), f"Gema {node.poder}")
+            nombre = GEM_REGISTRY.name(int(node.poder))
             lines.append(f"{nombre} × {node.cantidad}")
 
         return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,68 @@
+# src/views/profiler_overlay.py
+from typing import List, Optional
+import pygame
+from core.frame_profiler import FrameProfiler
+
+class ProfilerOverlay:
+    """
+    Panel semitransparente con los tiempos de FrameProfiler:
+    - Una fila por fase (último, p50, p95, p99 y máximo en ms), las tasas de
+      acierto de las cachés observadas y los contadores sumados en la ventana.
+    - El texto se recompone cada `refresh_frames` frames; entre medias solo se
+      vuelve a pegar la misma Surface.
+    """
+    COLOR_BG = (0, 0, 0)
+    COLOR_TEXT = (220, 220, 220)
+    COLOR_SPIKE = (255, 90, 90)
+
+    def __init__(self, font: pygame.font.Font, refresh_frames: int = 30, margin: int = 8):
+        self.font = font
+        self.refresh_frames = refresh_frames
+        self.margin = margin
+        self.visible = False
+        self.surface: Optional[pygame.Surface] = None
+        self._frames_left = 0
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+        self._frames_left = 0
+
+    def draw(self, screen: pygame.Surface, profiler: FrameProfiler) -> List[pygame.Rect]:
+        if not self.visible or not profiler.enabled:
+            return []
+        self._frames_left -= 1
+        if self.surface is None or self._frames_left <= 0:
+            self.surface = self._compose(profiler)
+            self._frames_left = self.refresh_frames
+        x = screen.get_width() - self.surface.get_width() - self.margin
+        return [screen.blit(self.surface, (x, self.margin))]
+
+    def _compose(self, profiler: FrameProfiler) -> pygame.Surface:
+        summary = profiler.summary()
+        lines = [(f"{'fase':<14}{'últ':>7}{'p50':>7}{'p95':>7}{'p99':>7}{'máx':>7}", self.COLOR_TEXT)]
+        names = ["frame"] + sorted(name for name in summary if name != "frame")
+        for name in names:
+            stats = summary.get(name)
+            if stats is None:
+                continue
+            color = self.COLOR_SPIKE if stats["max"] > profiler.budget_ms else self.COLOR_TEXT
+            lines.append((f"{name:<14}" + "".join(f"{stats[key]:>7.2f}" for key in ("last", "p50", "p95", "p99", "max")),
+                          color))
+        lines.append((f"frames > {profiler.budget_ms:.1f} ms: {profiler.spikes}", self.COLOR_TEXT))
+        for name in profiler.watched():
+            rate = profiler.hit_rate(name)
+            lines.append((f"caché {name}: " + ("-" if rate is None else f"{rate:.1%}"), self.COLOR_TEXT))
+        for name, total in sorted(profiler.counter_totals().items()):
+            lines.append((f"{name}: {total}", self.COLOR_TEXT))
+
+        rendered = [self.font.render(text, True, color) for text, color in lines]
+        width = max(surface.get_width() for surface in rendered) + 2 * self.margin
+        height = sum(surface.get_height() for surface in rendered) + 2 * self.margin
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(190)
+        panel.fill(self.COLOR_BG)
+        y = self.margin
+        for surface in rendered:
+            panel.blit(surface, (self.margin, y))
+            y += surface.get_height()
+        return panel
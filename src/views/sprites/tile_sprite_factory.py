@@ -39,4 +39,5 @@ class TileSpriteFactory:
     def get_sprite(self, tile_type, variant=0):
         if tile_type == "TREE":
             return self.sprites["TREE"][variant]
-        return self.sprites.get(tile_type, self._load_grass())
+        # Tipo desconocido: la hierba ya cargada (no se vuelve a leer la textura)
+        return self.sprites.get(tile_type) or self.sprites["GRASS"]
@@ -0,0 +1,122 @@
+# src/views/terrain_renderer.py
+from collections import OrderedDict
+from typing import Tuple
+import pygame
+from core.frame_profiler import PROFILER
+from resources.tile_data import TILE_TREE, TILE_NAMES
+
+class TerrainRenderer:
+    """
+    Dibuja el mapa a partir de superficies pre-renderizadas por chunk:
+    - Los tiles estáticos de cada chunk se hornean una sola vez en una Surface.
+    - Las superficies se guardan en un LRU indexado por (chunk_x, chunk_y).
+    - Una entrada se invalida sola si el objeto Chunk del mapa cambia
+      (regenerado, recargado desde disco) o explícitamente con invalidate().
+    - Cofres, portales y gemas se dibujan encima en cada frame, pues cambian de estado.
+    """
+
+    def __init__(self, game_map, tile_size: int = 32, max_cached: int = 12):
+        self.game_map = game_map
+        self.tile_size = tile_size
+        self.max_cached = max_cached
+        self.cache: "OrderedDict[Tuple[int, int], Tuple[object, pygame.Surface]]" = OrderedDict()
+
+        # Contadores
+        self.hits = 0
+        self.bakes = 0
+
+    # ====================
+    # Caché
+    # ====================
+    def get_chunk_surface(self, chunk_x: int, chunk_y: int) -> pygame.Surface:
+        key = (chunk_x, chunk_y)
+        chunk = self.game_map.get_chunk(chunk_x, chunk_y)
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] is chunk:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        surface = self.bake_chunk(chunk)
+        self.cache[key] = (chunk, surface)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_cached:
+            self.cache.popitem(last=False)
+        return surface
+
+    def bake_chunk(self, chunk) -> pygame.Surface:
+        """Pinta todos los tiles de un chunk en una Surface opaca."""
+        tile = self.tile_size
+        sprites = self.game_map.tile_sprite_factory
+        surface = pygame.Surface((chunk.size * tile, chunk.size * tile)).convert()
+        surface.fill((0, 0, 0))
+
+        # Superficies resueltas una vez por horneado: en el bucle solo se indexa
+        by_code = {code: sprites.get_sprite(name) for code, name in TILE_NAMES.items() if code != TILE_TREE}
+        trees = sprites.sprites["TREE"]
+
+        blits = []
+        size, tiles, variants = chunk.size, chunk.tiles, chunk.variants
+        for index, code in enumerate(tiles):
+            sprite = trees[variants[index]] if code == TILE_TREE else by_code[code]
+            blits.append((sprite, ((index % size) * tile, (index // size) * tile)))
+        surface.blits(blits, doreturn=False)
+        self.bakes += 1
+        PROFILER.count("terrain_bakes")
+        return surface
+
+    def invalidate(self, chunk_x: int, chunk_y: int) -> None:
+        self.cache.pop((chunk_x, chunk_y), None)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    # ====================
+    # Dibujo
+    # ====================
+    def draw(self, screen: pygame.Surface, start_x: int, start_y: int, tiles_x: int, tiles_y: int,
+             area: Tuple[int, int, int, int] = None) -> None:
+        """
+        Dibuja el viewport cuya esquina superior izquierda es el tile (start_x, start_y).
+        `area` = (x, y, ancho, alto) en tiles del viewport limita el dibujo a esa zona.
+        """
+        game_map = self.game_map
+        size, tile = game_map.chunk_size, self.tile_size
+        area_x, area_y, area_w, area_h = area or (0, 0, tiles_x + 1, tiles_y + 1)
+        first_cx, first_cy = game_map.get_chunk_key(start_x + area_x, start_y + area_y)
+        last_cx, last_cy = game_map.get_chunk_key(start_x + area_x + area_w - 1, start_y + area_y + area_h - 1)
+
+        previous_clip = screen.get_clip()
+        if area is not None:
+            screen.set_clip(pygame.Rect(area_x * tile, area_y * tile, area_w * tile, area_h * tile).clip(previous_clip))
+
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                surface = self.get_chunk_surface(cx, cy)
+                screen.blit(surface, ((cx * size - start_x) * tile, (cy * size - start_y) * tile))
+
+        entities = game_map.query_region(start_x + area_x, start_y + area_y,
+                                         start_x + area_x + area_w - 1, start_y + area_y + area_h - 1)
+        self._draw_entities(screen, entities, start_x, start_y)
+        screen.set_clip(previous_clip)
+
+    def _draw_entities(self, screen: pygame.Surface, entities: dict, start_x: int, start_y: int) -> None:
+        game_map = self.game_map
+        tile = self.tile_size
+
+        # Cofres
+        for x, y, chest in entities["chests"]:
+            screen.blit(game_map.chest_sprite_factory.get_sprite(chest), ((x - start_x) * tile, (y - start_y) * tile))
+
+        # Portales
+        for x, y, portal in entities["portals"]:
+            screen.blit(game_map.portal_sprite_factory.get_sprite(portal), ((x - start_x) * tile, (y - start_y) * tile))
+
+        # Gemas
+        get_color = game_map.gem_manager.get_gem_color
+        for x, y, value in entities["gems"]:
+            center = ((x - start_x) * tile + tile // 2, (y - start_y) * tile + tile // 2)
+            pygame.draw.circle(screen, get_color(value), center, tile // 4)
+
+    def stats(self) -> dict:
+        return {"cached": len(self.cache), "hits": self.hits, "bakes": self.bakes}
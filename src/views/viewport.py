@@ -0,0 +1,142 @@
+# src/views/viewport.py
+from typing import Dict, List, Tuple
+import pygame
+from views.terrain_renderer import TerrainRenderer
+
+class Viewport:
+    """
+    Cámara del mapa que reutiliza el frame anterior:
+    - Guarda la capa del mundo (terreno + cofres, portales y gemas) en una Surface propia.
+    - Si la cámara avanza un tile, desplaza la capa con Surface.scroll y solo
+      dibuja la fila o columna que queda expuesta.
+    - Compara el estado de las entidades visibles con el frame anterior y redibuja
+      solo los tiles que cambiaron (gema recogida, cofre abierto, portal activado).
+    - update() devuelve los rectángulos de pantalla que cambiaron, para pasarlos
+      a pygame.display.update en lugar de hacer flip de toda la pantalla.
+    """
+
+    def __init__(self, terrain_renderer: TerrainRenderer, width: int, height: int, tile_size: int = 32):
+        self.renderer = terrain_renderer
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.tiles_x = width // tile_size
+        self.tiles_y = height // tile_size
+        self.surface = pygame.Surface((width, height)).convert()
+        self.origin = None
+        self.entities: Dict[Tuple[int, int], object] = {}
+        self.entities_region = None
+
+        # Contadores
+        self.full_redraws = 0
+        self.scrolls = 0
+        self.tile_redraws = 0
+
+    @property
+    def game_map(self):
+        return self.renderer.game_map
+
+    def invalidate(self) -> None:
+        """Fuerza un redibujado completo en el siguiente update()."""
+        self.origin = None
+
+    # ====================
+    # Actualización
+    # ====================
+    def update(self, start_x: int, start_y: int) -> List[pygame.Rect]:
+        """
+        Pone la capa del mundo al día para la cámara en (start_x, start_y)
+        y devuelve los rectángulos de pantalla modificados.
+        """
+        previous, self.origin = self.origin, (start_x, start_y)
+        if previous is None:
+            return self._redraw_all()
+
+        dx, dy = start_x - previous[0], start_y - previous[1]
+        if abs(dx) > 1 or abs(dy) > 1:
+            return self._redraw_all()
+
+        dirty = []
+        if dx or dy:
+            self._scroll(dx, dy)
+            dirty.append(self.surface.get_rect())
+
+        for x, y in self._changed_tiles():
+            area = (x - start_x, y - start_y, 1, 1)
+            if 0 <= area[0] <= self.tiles_x and 0 <= area[1] <= self.tiles_y:
+                self._draw_area(area)
+                self.tile_redraws += 1
+                if not (dx or dy):
+                    dirty.append(self._area_rect(area))
+        return dirty
+
+    def _redraw_all(self) -> List[pygame.Rect]:
+        start_x, start_y = self.origin
+        self.surface.fill((0, 0, 0))
+        self.renderer.draw(self.surface, start_x, start_y, self.tiles_x, self.tiles_y)
+        self.entities = self._snapshot_entities()
+        self.entities_region = self._region()
+        self.full_redraws += 1
+        return [self.surface.get_rect()]
+
+    def _scroll(self, dx: int, dy: int) -> None:
+        """Desplaza la capa un tile y dibuja las franjas expuestas."""
+        tile = self.tile_size
+        self.surface.scroll(-dx * tile, -dy * tile)
+        if dx:
+            # Columna expuesta a la derecha (dx > 0) o a la izquierda (dx < 0)
+            column = (self.width - tile) // tile if dx > 0 else 0
+            self._draw_area((column, 0, self.tiles_x + 1 - column if dx > 0 else 1, self.tiles_y + 1))
+        if dy:
+            row = (self.height - tile) // tile if dy > 0 else 0
+            self._draw_area((0, row, self.tiles_x + 1, self.tiles_y + 1 - row if dy > 0 else 1))
+        self.scrolls += 1
+
+    def _draw_area(self, area: Tuple[int, int, int, int]) -> None:
+        start_x, start_y = self.origin
+        self.surface.fill((0, 0, 0), self._area_rect(area))
+        self.renderer.draw(self.surface, start_x, start_y, self.tiles_x, self.tiles_y, area)
+
+    def _area_rect(self, area: Tuple[int, int, int, int]) -> pygame.Rect:
+        tile = self.tile_size
+        x, y, w, h = area
+        return pygame.Rect(x * tile, y * tile, w * tile, h * tile).clip(self.surface.get_rect())
+
+    # ====================
+    # Entidades
+    # ====================
+    def _region(self) -> Tuple[int, int, int, int]:
+        """Rectángulo de tiles globales visible, extremos incluidos."""
+        start_x, start_y = self.origin
+        return start_x, start_y, start_x + self.tiles_x, start_y + self.tiles_y
+
+    def _snapshot_entities(self) -> Dict[Tuple[int, int], object]:
+        """Estado de las gemas, cofres y portales visibles, por posición global."""
+        entities = self.game_map.query_region(*self._region())
+        states = {(x, y): value for x, y, value in entities["gems"]}
+        for x, y, chest in entities["chests"]:
+            states[(x, y)] = ("chest", chest.is_opened())
+        for x, y, portal in entities["portals"]:
+            states[(x, y)] = ("portal", portal.is_activated())
+        return states
+
+    def _changed_tiles(self) -> List[Tuple[int, int]]:
+        """Posiciones visibles en ambos frames cuyas entidades cambiaron."""
+        previous, self.entities = self.entities, self._snapshot_entities()
+        old_x0, old_y0, old_x1, old_y1 = self.entities_region
+        new_x0, new_y0, new_x1, new_y1 = self.entities_region = self._region()
+        if previous == self.entities:
+            return []
+        # Lo que entra en pantalla ya se dibujó al exponerse; lo que sale no importa
+        x0, y0, x1, y1 = max(old_x0, new_x0), max(old_y0, new_y0), min(old_x1, new_x1), min(old_y1, new_y1)
+        return [
+            (x, y) for x, y in previous.keys() | self.entities.keys()
+            if x0 <= x <= x1 and y0 <= y <= y1 and previous.get((x, y)) != self.entities.get((x, y))
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "full_redraws": self.full_redraws,
+            "scrolls": self.scrolls,
+            "tile_redraws": self.tile_redraws,
+        }
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from core.avl_inventory import AVLInventory
+
+
+def check_node(node):
+    """Comprueba orden, altura, balance y agregados del subárbol; devuelve sus poderes en orden."""
+    if node is None:
+        return []
+    left, right = check_node(node.left), check_node(node.right)
+    assert all(p < node.poder for p in left) and all(p > node.poder for p in right)
+    assert node.cantidad > 0
+    left_height = node.left.height if node.left else 0
+    right_height = node.right.height if node.right else 0
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+    children = [child for child in (node.left, node.right) if child]
+    assert node.size == 1 + sum(child.size for child in children)
+    assert node.total_count == node.cantidad + sum(child.total_count for child in children)
+    assert node.total_value == node.poder * node.cantidad + sum(child.total_value for child in children)
+    return left + [node.poder] + right
+
+
+def check_against(inventory, expected):
+    assert check_node(inventory.root) == sorted(expected)
+    assert [(n.poder, n.cantidad) for n in inventory.inorder()] == sorted(expected.items())
+    assert len(inventory) == len(expected)
+    assert inventory.total_count() == sum(expected.values())
+    assert inventory.total_value() == sum(p * c for p, c in expected.items())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operations_keep_invariants(seed):
+    rng = random.Random(seed)
+    inventory = AVLInventory()
+    expected = {}
+    for step in range(2000):
+        poder = rng.randint(1, 200)
+        if rng.random() < 0.6:
+            cantidad = rng.randint(1, 5)
+            inventory.insert(poder, cantidad)
+            expected[poder] = expected.get(poder, 0) + cantidad
+        elif poder in expected:
+            cantidad = rng.randint(1, expected[poder])
+            inventory.delete(poder, cantidad)
+            expected[poder] -= cantidad
+            if not expected[poder]:
+                del expected[poder]
+        if step % 100 == 0:
+            check_against(inventory, expected)
+    check_against(inventory, expected)
+
+
+def test_sorted_inserts_stay_logarithmic():
+    inventory = AVLInventory()
+    for poder in range(1, 1025):
+        inventory.insert(poder)
+    check_against(inventory, {poder: 1 for poder in range(1, 1025)})
+    assert inventory.root.height <= 15
+
+
+def test_load_sorted_builds_balanced_tree():
+    inventory = AVLInventory()
+    records = [(poder, poder % 4 + 1) for poder in range(1, 1001)]
+    inventory.load_sorted(records)
+    check_against(inventory, dict(records))
+    assert inventory.root.height <= 11
+
+
+def test_order_statistics():
+    rng = random.Random(7)
+    inventory = AVLInventory()
+    expected = {}
+    for poder in rng.sample(range(1, 500), 120):
+        cantidad = rng.randint(1, 9)
+        inventory.insert(poder, cantidad)
+        expected[poder] = cantidad
+    powers = sorted(expected)
+    for index, poder in enumerate(powers):
+        assert inventory.rank(poder) == index
+        assert inventory.select(index).poder == poder
+    assert inventory.select(len(powers)) is None
+    for low, high in ((1, 499), (100, 250), (300, 120), (42, 42)):
+        selected = [p for p in powers if low <= p <= high]
+        assert inventory.range_sum(low, high) == (sum(expected[p] for p in selected),
+                                                  sum(p * expected[p] for p in selected))
+
+
+def test_weighted_random_node_follows_quantity():
+    inventory = AVLInventory()
+    inventory.insert(1, 9)
+    inventory.insert(99, 1)
+    rng = random.Random(3)
+    picks = [inventory.random_node(rng, weighted=True).poder for _ in range(2000)]
+    assert 1700 < picks.count(1) < 1900
+    assert {inventory.random_node(rng).poder for _ in range(200)} == {1, 99}
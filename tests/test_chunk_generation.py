@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from factories.array_maze_carver import NUMPY_AVAILABLE
+from generators import ChunkGenerator
+
+ENGINES = [False] + ([True] if NUMPY_AVAILABLE else [])
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+def test_batched_chunks_match_single_chunks(use_numpy):
+    generator = ChunkGenerator(21, use_numpy=use_numpy)
+    batch = generator.generate_chunks([random.Random(seed) for seed in range(200)])
+    single = [generator.generate_chunk(rng=random.Random(seed)) for seed in range(200)]
+    assert [chunk.to_bytes() for chunk in batch] == [chunk.to_bytes() for chunk in single]
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy no instalado")
+def test_clearings_are_identical_with_both_engines():
+    rngs = lambda: [random.Random(seed) for seed in range(100)]
+    array = ChunkGenerator(21, use_numpy=True).chunk_factory.generate_clearing_chunks(rngs())
+    python = ChunkGenerator(21, use_numpy=False).chunk_factory.generate_clearing_chunks(rngs())
+    assert [chunk.to_bytes() for chunk in array] == [chunk.to_bytes() for chunk in python]
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from core.chunk_store import ChunkStore
+from core.map import Map
+from core.world_file import WorldFile
+
+CHUNK_SIZE = 21
+
+
+@pytest.fixture(params=["regenerate", "store"])
+def game_map(request, tmp_path):
+    store = ChunkStore(str(tmp_path)) if request.param == "store" else None
+    game_map = Map(CHUNK_SIZE, seed=42, residency_radius=1, chunk_store=store)
+    yield game_map
+    game_map.close()
+
+
+def open_some_chest(game_map):
+    """Abre el primer cofre de los chunks (i, 0) y devuelve (chunk, local, posición global)."""
+    for chunk_x in range(40):
+        game_map.ensure_chunk(chunk_x, 0)
+        for local_x, local_y, chest in game_map.chest_manager.iter_chunk(chunk_x, 0):
+            chest.mark_opened()
+            x, y = chunk_x * CHUNK_SIZE + local_x, local_y
+            game_map.mark_region_dirty(x, y, x, y)
+            return (chunk_x, 0), (local_x, local_y), (x, y)
+    pytest.skip("ningún cofre en los chunks probados")
+
+
+def test_evicted_chunk_keeps_opened_chest_in_world_record(game_map):
+    key, local, _ = open_some_chest(game_map)
+    game_map.set_focus(key[0] + 10, 0)
+    assert key not in game_map.chunks
+
+    record = game_map.take_dirty_records()[key]
+    assert local in WorldFile.decode(record).opened_chests
+
+
+def test_reloaded_chunk_keeps_opened_chest(game_map):
+    key, _, (x, y) = open_some_chest(game_map)
+    game_map.set_focus(key[0] + 10, 0)
+    game_map.set_focus(*key)
+    game_map.ensure_chunk(*key)
+    assert game_map.get_chest(x, y).is_opened()
+
+
+def test_missing_store_file_falls_back_to_delta_log(tmp_path):
+    game_map = Map(CHUNK_SIZE, seed=42, residency_radius=1, chunk_store=ChunkStore(str(tmp_path)))
+    try:
+        key, _, (x, y) = open_some_chest(game_map)
+        game_map.set_focus(key[0] + 10, 0)
+        os.remove(game_map.residency.store._path(*key))
+
+        game_map.ensure_chunk(*key)
+        # Regenerado desde la semilla, pero con el cofre abierto (sin duplicar el loot)
+        assert game_map.get_chest(x, y).is_opened()
+    finally:
+        game_map.close()
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from core.avl_inventory import AVLInventory
+from core.inventory import Inventory
+from test_avl_inventory import check_node
+
+INVENTORIES = [Inventory, AVLInventory]
+
+
+def contents(inventory):
+    return [(node.poder, node.cantidad) for node in inventory.inorder()]
+
+
+def filled(inventory_class):
+    inventory = inventory_class()
+    for poder, cantidad in ((5, 3), (10, 1), (20, 4), (50, 2)):
+        inventory.insert(poder, cantidad)
+    inventory.take_changes()
+    return inventory
+
+
+@pytest.mark.parametrize("inventory_class", INVENTORIES)
+def test_apply_nets_costs_and_gains(inventory_class):
+    inventory = filled(inventory_class)
+    assert inventory.apply(costs={5: 3, 20: 1, 50: 2}, gains={20: 2, 7: 1})
+    assert contents(inventory) == [(7, 1), (10, 1), (20, 5)]
+    assert inventory.take_changes() == {5: -3, 7: 1, 20: 1, 50: -2}
+
+
+@pytest.mark.parametrize("inventory_class", INVENTORIES)
+def test_apply_short_leaves_inventory_untouched(inventory_class):
+    inventory = filled(inventory_class)
+    before = contents(inventory)
+    # El coste se comprueba en bruto: la ganancia del mismo poder no lo cubre
+    assert not inventory.apply(costs={5: 1, 10: 2}, gains={10: 5, 99: 1})
+    assert not inventory.apply(costs={77: 1})
+    assert contents(inventory) == before
+    assert inventory.take_changes() == {}
+
+
+@pytest.mark.parametrize("inventory_class", INVENTORIES)
+def test_apply_rolls_back_when_a_step_fails(inventory_class, monkeypatch):
+    inventory = filled(inventory_class)
+    before = contents(inventory)
+    value = inventory.total_value()
+
+    # Los cambios en sitio ya se aplicaron cuando falla la primera inserción de un poder nuevo
+    original_insert = inventory.insert
+    calls = []
+
+    def failing_insert(poder, cantidad=1):
+        calls.append(poder)
+        if len(calls) == 2:
+            raise RuntimeError("fallo simulado")
+        original_insert(poder, cantidad)
+
+    monkeypatch.setattr(inventory, "insert", failing_insert)
+    with pytest.raises(RuntimeError):
+        inventory.apply(costs={5: 1, 50: 2, 10: 1}, gains={20: 3, 1: 1, 2: 1})
+    monkeypatch.undo()
+
+    assert contents(inventory) == before
+    assert inventory.total_value() == value
+    assert inventory.take_changes() == {}
+    if isinstance(inventory, AVLInventory):
+        check_node(inventory.root)
+
+
+@pytest.mark.parametrize("inventory_class", INVENTORIES)
+def test_random_apply_matches_dict(inventory_class):
+    rng = random.Random(11)
+    inventory = inventory_class()
+    expected = {}
+    for _ in range(1500):
+        costs = {p: rng.randint(1, 2) for p in rng.sample(range(1, 60), 2)}
+        gains = {rng.randint(1, 60): rng.randint(1, 4) for _ in range(2)}
+        ok = inventory.apply(costs=costs, gains=gains)
+        assert ok == all(expected.get(p, 0) >= c for p, c in costs.items())
+        if ok:
+            for p, c in costs.items():
+                expected[p] -= c
+            for p, c in gains.items():
+                expected[p] = expected.get(p, 0) + c
+            expected = {p: c for p, c in expected.items() if c}
+    assert contents(inventory) == sorted(expected.items())
+    if isinstance(inventory, AVLInventory):
+        check_node(inventory.root)
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from core.inventory_store import InventoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return InventoryStore(str(tmp_path / "inventory.bin"), str(tmp_path / "inventory.journal"))
+
+
+def reopen(store):
+    return InventoryStore(store.snapshot_path, store.journal_path)
+
+
+def test_snapshot_and_journal_round_trip(store):
+    store.compact([(5, 2), (10, 1)])
+    store.append({5: 1, 20: 3})
+    store.append({10: -1, 20: -1})
+    assert reopen(store).load() == {5: 3, 20: 2}
+
+
+def test_truncated_journal_tail_is_ignored_and_overwritten(store):
+    store.compact([(5, 2)])
+    store.append({5: 1})
+    valid_end = os.path.getsize(store.journal_path)
+    store.append({7: 4})
+    with open(store.journal_path, "r+b") as f:
+        f.truncate(os.path.getsize(store.journal_path) - 3)
+
+    loaded = reopen(store)
+    assert loaded.load() == {5: 3}
+    assert loaded.journal_end == valid_end
+    loaded.append({9: 1})
+    assert reopen(store).load() == {5: 3, 9: 1}
+
+
+def test_corrupt_journal_record_ends_the_journal(store):
+    store.compact([(5, 2)])
+    store.append({5: 1})
+    valid_end = os.path.getsize(store.journal_path)
+    store.append({7: 4})
+    store.append({8: 1})
+    with open(store.journal_path, "r+b") as f:
+        f.seek(valid_end)
+        f.write(b"\xff")
+
+    loaded = reopen(store)
+    # Lo que sigue al registro dañado tampoco se aplica
+    assert loaded.load() == {5: 3}
+    loaded.append({5: -3})
+    assert reopen(store).load() == {}
+
+
+def test_journal_of_another_generation_is_ignored(store):
+    store.compact([(5, 2)])
+    store.append({5: 1})
+    with open(store.journal_path, "rb") as f:
+        stale_journal = f.read()
+    store.compact([(5, 3)])
+    # Simula que el proceso murió tras escribir la instantánea y antes de vaciar el diario
+    with open(store.journal_path, "wb") as f:
+        f.write(stale_journal)
+    assert reopen(store).load() == {5: 3}
+
+
+def test_corrupt_snapshot_raises(store):
+    store.compact([(5, 2), (10, 1)])
+    with open(store.snapshot_path, "r+b") as f:
+        f.seek(-6, os.SEEK_END)
+        f.write(b"\xff")
+    with pytest.raises(ValueError):
+        reopen(store).load()
@@ -0,0 +1,131 @@
+import os
+
+import pytest
+
+from core.world_delta import ChunkDelta
+from core.world_file import WorldFile, WorldWriter, snapshot_path
+
+CHUNK_SIZE = 21
+SEED = 1234
+
+
+def delta(gems=(), chests=(), portal=False):
+    chunk_delta = ChunkDelta()
+    chunk_delta.collected_gems.update(gems)
+    chunk_delta.opened_chests.update(chests)
+    chunk_delta.portal_activated = portal
+    return chunk_delta
+
+
+def as_tuple(chunk_delta):
+    return sorted(chunk_delta.collected_gems), sorted(chunk_delta.opened_chests), chunk_delta.portal_activated
+
+
+def read_all(path):
+    world = WorldFile(path)
+    try:
+        return {key: as_tuple(world.read(*key)) for key in list(world.index)}, world.player_position, world.generation
+    finally:
+        world.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "save_world.bin")
+
+
+def test_encode_decode_round_trip():
+    original = delta(gems=[(0, 0), (20, 3)], chests=[(7, 7)], portal=True)
+    assert as_tuple(WorldFile.decode(WorldFile.encode(original))) == as_tuple(original)
+    assert as_tuple(WorldFile.decode(WorldFile.encode(None))) == ([], [], False)
+    with pytest.raises(ValueError):
+        WorldFile.decode(WorldFile.encode(original)[:-1])
+
+
+def test_full_write_round_trip(path):
+    records = {(0, 0): delta(gems=[(1, 2)]), (-3, 5): delta(chests=[(4, 4)], portal=True)}
+    generation = WorldFile.write(path, CHUNK_SIZE, SEED, (10, -7),
+                                 [(key, WorldFile.encode(d), None) for key, d in records.items()])
+    chunks, player, loaded_generation = read_all(path)
+    assert chunks == {key: as_tuple(d) for key, d in records.items()}
+    assert player == (10, -7)
+    assert loaded_generation == generation
+
+
+def test_journal_overrides_snapshot(path):
+    writer = WorldWriter(path, CHUNK_SIZE, SEED)
+    writer.write({(0, 0): WorldFile.encode(delta(gems=[(1, 1)]))}, (1, 1))
+    writer.write({(0, 0): WorldFile.encode(delta(gems=[(1, 1), (2, 2)])),
+                  (1, 0): WorldFile.encode(delta(chests=[(3, 3)]))}, (2, 2))
+
+    # Una partida continuada sigue el mismo diario
+    resumed = WorldWriter(path, CHUNK_SIZE, SEED, fresh=False)
+    resumed.write({(2, 0): WorldFile.encode(delta(portal=True))}, (3, 3))
+
+    chunks, player, generation = read_all(path)
+    assert chunks == {(0, 0): ([(1, 1), (2, 2)], [], False),
+                      (1, 0): ([], [(3, 3)], False),
+                      (2, 0): ([], [], True)}
+    assert player == (3, 3)
+    assert generation == writer.generation == resumed.generation
+
+
+@pytest.mark.parametrize("damage", ["truncate", "corrupt"])
+def test_damaged_journal_tail_is_ignored_and_overwritten(path, damage):
+    writer = WorldWriter(path, CHUNK_SIZE, SEED)
+    writer.write({(0, 0): WorldFile.encode(delta(gems=[(1, 1)]))}, (1, 1))
+    writer.write({(1, 0): WorldFile.encode(delta(gems=[(2, 2)]))}, (2, 2))
+    valid_end = os.path.getsize(path)
+    writer.write({(2, 0): WorldFile.encode(delta(gems=[(3, 3)]))}, (3, 3))
+    with open(path, "r+b") as f:
+        if damage == "truncate":
+            f.truncate(os.path.getsize(path) - 5)
+        else:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+
+    world = WorldFile(path)
+    assert world.journal_end == valid_end
+    world.close()
+    chunks, player, _ = read_all(path)
+    assert set(chunks) == {(0, 0), (1, 0)}
+    assert player == (2, 2)
+
+    WorldWriter(path, CHUNK_SIZE, SEED, fresh=False).write({(5, 5): WorldFile.encode(delta(portal=True))}, (4, 4))
+    chunks, player, _ = read_all(path)
+    assert set(chunks) == {(0, 0), (1, 0), (5, 5)}
+    assert player == (4, 4)
+
+
+def test_compaction_starts_a_new_generation(path):
+    writer = WorldWriter(path, CHUNK_SIZE, SEED, compact_min_bytes=0)
+    writer.write({(0, 0): WorldFile.encode(delta(gems=[(1, 1)]))}, (1, 1))
+    first_generation = writer.generation
+    reader = WorldFile(path)
+
+    for step in range(1, 6):
+        writer.write({(step, 0): WorldFile.encode(delta(gems=[(step, step)]))}, (step, step))
+
+    assert writer.compactions >= 1
+    assert writer.generation > first_generation
+    assert not os.path.exists(snapshot_path(path, first_generation))
+    # El lector abierto conserva su instantánea mapeada aunque ya no exista en disco
+    assert as_tuple(reader.read(0, 0)) == ([(1, 1)], [], False)
+    reader.close()
+
+    chunks, player, generation = read_all(path)
+    assert set(chunks) == {(step, 0) for step in range(6)}
+    assert player == (5, 5)
+    assert generation == writer.generation
+
+
+def test_fresh_writer_replaces_previous_world(path):
+    WorldWriter(path, CHUNK_SIZE, SEED).write({(0, 0): WorldFile.encode(delta(gems=[(1, 1)]))}, (1, 1))
+    WorldWriter(path, CHUNK_SIZE, SEED + 1).write({(9, 9): WorldFile.encode(delta(portal=True))}, (2, 2))
+    world = WorldFile(path)
+    assert world.seed == SEED + 1
+    assert set(world.index) == {(9, 9)}
+    world.close()
+
+    with pytest.raises(ValueError):
+        WorldWriter(path, CHUNK_SIZE, SEED, fresh=False).write({}, (0, 0))